@@ -1,350 +1,323 @@
 import streamlit as st
 import pandas as pd
-import pdfplumber
-import re
 import os
+import hashlib
 
-# --- 1. Base Helper Function ---
+from parsers.cache import ResultCache, make_key
+from parsers.duplicates import DuplicateIndex, overlaps
+from parsers.engine import transactions_frame
+from parsers.merchants import categorize
+from parsers.profiling import Trace, activate, stage
+from parsers.progressive import ParseJob
+from parsers.spending import SpendingIndex
 
-def clean_amount(amount_str):
-    """
-    Cleans an amount string and converts it to a float.
-    - Removes $, ₹, ,, and spaces
-    - Treats 'Cr' or '()' as negative (payments/credits)
-    - Treats 'Dr' as positive (debits/spend)
-    """
-    if amount_str is None:
-        return 0.0
-        
-    s = str(amount_str).strip()
-    
-    # Check for credit (negative)
-    is_credit = bool(re.search(r'(cr|\(.*\))', s, re.IGNORECASE))
-    
-    # Remove all non-numeric/non-decimal characters
-    s_cleaned = re.sub(r"[^0-9\.]", "", s)
-    
-    try:
-        amount = float(s_cleaned)
-        if is_credit:
-            return -amount # Make credits negative
-        return amount # Debits are positive
-    except ValueError:
-        return 0.0
+# --- 1. Base Helper Functions ---
+# The vectorized normalize_transactions lives in
+# parsers/base_parser.py. The parsers collect raw amount and date strings for
+# a page and normalize the whole batch in one pass, into paise and dates.
 
 # --- 2. Individual Parser Functions (All Corrected) ---
+# The bank parsers are declared as data in parsers/engine.py (strategy, line
+# patterns, exclusions, column mappings) and run by one engine. Each
+# STREAM_MAP entry yields one list of transactions per page, as soon as that
+# page is done; the PARSER_MAP entries collect the stream into a DataFrame.
+# Pages without any DD/MM/YYYY date or transaction header (terms, rewards,
+# marketing) are skipped before any text or table extraction runs; see
+# parsers/prefilter.py. When a bank has a learned template, only the page's
+# transaction region is extracted; see parsers/templates.py. Each page is
+# read with the cheapest strategy (text lines before tables) whose result
+# validates; see parsers/strategy.py.
+
+
+# --- 3. Main Streamlit App ---
 
-def parse_hdfc(pdf):
+# --- Parser Mapping ---
+# PARSER_MAP and STREAM_MAP (bank id -> parser) come from parsers/engine.py,
+# detect_bank from parsers/core.py (the streamlit-free core). Uploads are
+# parsed by a parsers.progressive.ParseJob, which runs detect_bank and
+# STREAM_MAP[bank] in a background thread, one page at a time.
+
+# How often the page redraws the rows and progress of a running parse
+POLL_SECONDS = 0.25
+
+@st.cache_resource
+def get_result_cache():
     """
-    Parses HDFC. (Working)
-    Uses standard table extraction.
+    One on-disk result cache shared by every session of the app.
     """
-    transactions = []
-    date_pattern = re.compile(r'^\d{2}/\d{2}/\d{4}$')
-    
-    for page in pdf.pages:
-        tables = page.extract_tables() 
-        for table in tables:
-            if not table: continue
-            for row in table:
-                if not row or len(row) < 3: continue
-                
-                date_str = str(row[0]).strip()
-                desc_str = str(row[1])
-                amount_str = str(row[2])
-                
-                if date_pattern.match(date_str) and desc_str and amount_str and "Transaction Description" not in desc_str:
-                    amount = clean_amount(amount_str)
-                    if amount != 0.0:
-                        transactions.append({
-                            "Date": date_str,
-                            "Description": desc_str.replace('\n', ' '),
-                            "Amount": amount
-                        })
-
-    if not transactions:
-        return pd.DataFrame(columns=["Date", "Description", "Amount"])
-
-    final_df = pd.DataFrame(transactions)
-    final_df = final_df[final_df['Amount'] != 0.0].reset_index(drop=True)
-    return final_df
-
-def parse_icici_coral(pdf):
+    return ResultCache()
+
+def mark_duplicates(statement, bank, df, card_id):
     """
-    Parses ICICI Coral. (Working)
-    This parser uses RegEx on the page's text.
+    Checks the statement against the duplicate index and says which earlier
+    statements it overlaps.
     """
-    transactions = []
-    # RegEx to find: Date, Ref, Description, (Junk), Amount
-    txn_pattern = re.compile(r'^(\d{2}/\d{2}/\d{4})\s+\S+\s+(.+?)\s+\d*\s*.*?\s+([\d,\.]+\s*CR|[\d,\.]+)$')
-
-    for page in pdf.pages:
-        text = page.extract_text()
-        if not text:
-            continue
-            
-        for line in text.split('\n'):
-            match = txn_pattern.search(line)
-            if match:
-                date_str = match.group(1)
-                desc_str = match.group(2).strip()
-                amount_str = match.group(3)
-                
-                if "Transaction Details" in desc_str:
-                    continue
-                    
-                amount = clean_amount(amount_str)
-                if amount != 0.0:
-                    transactions.append({
-                        "Date": date_str,
-                        "Description": desc_str,
-                        "Amount": amount
-                    })
-
-    if not transactions:
-        return pd.DataFrame(columns=["Date", "Description", "Amount"])
-
-    final_df = pd.DataFrame(transactions)
-    final_df = final_df[final_df['Amount'] != 0.0].reset_index(drop=True)
-    return final_df
-
-def parse_axis(pdf):
+    index = DuplicateIndex()
+    try:
+        df = index.check(bank, df, card_id, statement)
+    finally:
+        index.close()
+    for source, (exact, near) in overlaps(df).items():
+        st.warning(f"{exact + near} transactions ({exact} exact, {near} near) were already seen in `{source}`.")
+    return df
+
+def for_display(df):
     """
-    Parses Axis My Zone. (FIXED)
-    This parser uses RegEx on the page's text.
+    A parsed frame as shown in the UI: Amount in rupees instead of paise,
+    without the bank's raw category column or the duplicate match's key.
     """
-    transactions = []
-    # Pattern 1: Date, Description, Category, Amount
-    pat_with_cat = re.compile(r'^(\d{2}/\d{2}/\d{4})\s+(.+?)\s+[A-Za-z\s]+\s+([\d,\.]+\s*(?:Cr|Dr))$')
-    # Pattern 2: Date, Description, Amount (no category, for "INTERNET PAYMENT")
-    pat_no_cat = re.compile(r'^(\d{2}/\d{2}/\d{4})\s+(INTERNET PAYMENT.+?)\s+([\d,\.]+\s*(?:Cr|Dr))$')
-
-    for page in pdf.pages:
-        text = page.extract_text() # <-- REMOVED TOLERANCES
-        if not text: continue
+    df = df.drop(columns=["BankCategory", "DuplicateKey"], errors="ignore")
+    return df.assign(Amount=df["Amount"] / 100) if "Amount" in df else df
+
+def show_results(bank, df, statement=None, card_id=None):
+    if df.empty:
+        st.error(f"The parser for **{bank}** ran, but found 0 transactions. This file's layout may be unexpected.")
+    else:
+        st.subheader("Extracted Transactions")
+        df = categorize(df)
+        if statement is not None:
+            df = mark_duplicates(statement, bank, df, card_id)
+        invalid = int(df["Invalid"].sum())
+        if invalid:
+            st.warning(f"{invalid} transactions have an amount or date that could not be read. "
+                       "They are marked Invalid and left out of the totals.")
+        st.dataframe(for_display(df))
         
-        for line in text.split('\n'):
-            match_cat = pat_with_cat.search(line)
-            match_no_cat = pat_no_cat.search(line)
-            
-            date_str, desc_str, amount_str = None, None, None
-
-            if match_cat:
-                date_str = match_cat.group(1)
-                desc_str = match_cat.group(2).strip()
-                amount_str = match_cat.group(3)
-            elif match_no_cat:
-                date_str = match_no_cat.group(1)
-                desc_str = match_no_cat.group(2).strip()
-                amount_str = match_no_cat.group(3)
-            
-            if date_str:
-                amount = clean_amount(amount_str)
-                if amount != 0.0:
-                    transactions.append({
-                        "Date": date_str,
-                        "Description": desc_str,
-                        "Amount": amount
-                    })
-
-    if not transactions:
-        return pd.DataFrame(columns=["Date", "Description", "Amount"])
-
-    final_df = pd.DataFrame(transactions)
-    final_df = final_df[final_df['Amount'] != 0.0].reset_index(drop=True)
-    return final_df
-
-def parse_idfc(pdf):
+        st.subheader("Data Summary")
+        df = for_display(df[~df["Invalid"]])
+        total_spend = df[df['Amount'] > 0]['Amount'].sum()
+        total_payments = df[df['Amount'] < 0]['Amount'].sum()
+        st.metric("Total Spend (Debits)", f"₹{total_spend:,.2f}")
+        st.metric("Total Payments (Credits)", f"₹{total_payments:,.2f}")
+        debits = df[df['Amount'] > 0]
+        if not debits.empty:
+            st.bar_chart(debits.groupby("Category")["Amount"].sum().sort_values(ascending=False))
+
+def show_performance(trace):
     """
-    Parses IDFC First Bank. (Working)
-    This parser uses RegEx on the page's text.
+    Optional panel with the stage timings, counters and per-page times.
     """
-    transactions = []
-    # RegEx to find lines that are NOT EMI amortization
-    # Format: Date, Description, Amount
-    txn_pattern = re.compile(r'^(\d{2}/\d{2}/\d{4})\s+(.+?)\s+([\d,\.]+\s*CR|[\d,\.]+)$')
-    
-    for page in pdf.pages:
-        text = page.extract_text() # <-- REMOVED TOLERANCES
-        if not text:
-            continue
-        
-        for line in text.split('\n'):
-            # First, check if it's an excluded line
-            if "Amortization" in line or "IGST" in line or "Interest charges" in line:
-                continue
-            
-            # If not excluded, try to match as a transaction
-            match = txn_pattern.search(line)
-            if match:
-                date_str = match.group(1)
-                desc_str = match.group(2).strip()
-                amount_str = match.group(3)
-
-                amount = clean_amount(amount_str)
-                if amount != 0.0:
-                    transactions.append({
-                        "Date": date_str,
-                        "Description": desc_str,
-                        "Amount": amount
-                    })
-
-    if not transactions:
-        return pd.DataFrame(columns=["Date", "Description", "Amount"])
-
-    final_df = pd.DataFrame(transactions)
-    final_df = final_df[final_df['Amount'] != 0.0].reset_index(drop=True)
-    return final_df
-
-def parse_icici_amazon(pdf):
+    report = trace.to_dict()
+    with st.expander("Performance", expanded=True):
+        st.caption(f"Total: {report['total_seconds'] * 1000:,.1f} ms")
+        st.table(pd.DataFrame(
+            [{"Stage": name, "ms": round(seconds * 1000, 2)} for name, seconds in report["stages"].items()]
+        ))
+        st.table(pd.DataFrame(
+            [{"Counter": name, "Value": value} for name, value in report["counters"].items()]
+        ))
+        if report["pages"]:
+            st.bar_chart(pd.DataFrame(report["pages"]).set_index("page")["seconds"])
+        if trace.profile:
+            st.code(trace.profile)
+        st.download_button("Download trace (JSON)", trace.to_json(), file_name="trace.json")
+
+def progress_text(job):
+    if not job.total_pages:
+        return "Opening the statement..."
+    text = f"{job.pages_done} of {job.total_pages} pages"
+    eta = job.eta()
+    if eta is not None and not job.done.is_set():
+        text += f", about {eta:,.0f}s left"
+    return text
+
+def parse_progressively(data, key, trace=None, profile=False):
     """
-    Parses ICICI Amazon Pay. (Working)
-    Uses "text" table extraction.
+    Parses an upload in a background ParseJob, kept in session_state so it
+    survives reruns, and renders its rows, running totals and a progress bar
+    with an ETA as pages complete. Clicking "Cancel" reruns the script,
+    which sets the job's cancel event; the worker stops before its next
+    page. Returns the job once it is done.
     """
-    transactions = []
-    date_pattern = re.compile(r'(\d{2}/\d{2}/\d{4})')
-    date_pattern_strict = re.compile(r'^\d{2}/\d{2}/\d{4}$') 
-
-    for page in pdf.pages:
-        tables = page.extract_tables({
-            "vertical_strategy": "text",
-            "horizontal_strategy": "text",
-        })
-        for table in tables:
-            if not table: continue
-            for row in table:
-                if not row: continue
-
-                # Handle 5-column layout
-                if len(row) >= 5:
-                    date_str = str(row[0]).strip()
-                    desc_str = str(row[2])
-                    amount_str = str(row[4])
-                    
-                    if date_pattern_strict.match(date_str) and desc_str and "Transaction Details" not in desc_str:
-                        amount = clean_amount(amount_str)
-                        if amount != 0.0:
-                            transactions.append({
-                                "Date": date_str,
-                                "Description": desc_str.replace('\n', ' '),
-                                "Amount": amount
-                            })
-                
-                # Handle 3-column layout
-                elif len(row) >= 3:
-                    col1 = str(row[0])
-                    col2 = str(row[1])
-                    col3 = str(row[2])
-                    
-                    date_match = date_pattern.search(col1)
-                    
-                    if date_match and col2 and "Transaction Details" not in col2:
-                        date_str = date_match.group(1)
-                        amount = clean_amount(col3)
-                        
-                        if amount != 0.0:
-                            transactions.append({
-                                "Date": date_str,
-                                "Description": col2.replace('\n', ' '),
-                                "Amount": amount
-                            })
-
-    if not transactions:
-        return pd.DataFrame(columns=["Date", "Description", "Amount"])
-
-    final_df = pd.DataFrame(transactions)
-    final_df = final_df[final_df['Amount'] != 0.0].reset_index(drop=True)
-    return final_df
-
-
-# --- 3. Main Streamlit App ---
-
-# --- Parser Mapping ---
-PARSER_MAP = {
-    "HDFC": parse_hdfc,
-    "ICICI_CORAL": parse_icici_coral,
-    "ICICI_AMAZON": parse_icici_amazon,
-    "AXIS": parse_axis,
-    "IDFC": parse_idfc,
-}
-
-def detect_bank(pdf):
+    job = st.session_state.get("parse_job")
+    if job is None or job.key != key:
+        if job is not None:
+            job.cancel()
+        job = st.session_state["parse_job"] = ParseJob(data, key=key, trace=trace, profile=profile).start()
+
+    cancel = st.empty()
+    if not job.done.is_set() and cancel.button("Cancel", key=f"cancel-{key}"):
+        job.cancel()
+    progress = st.progress(0.0, text=progress_text(job))
+    live = st.empty()
+    shown = None
+    while True:
+        finished = job.wait(POLL_SECONDS)
+        if job.bank and job.rows != shown:
+            shown = job.rows
+            with live.container():
+                st.caption(f"Parsing **{job.bank}**...")
+                debits, credits = st.columns(2)
+                debits.metric("Total Spend (Debits)", f"₹{job.debits / 100:,.2f}")
+                credits.metric("Total Payments (Credits)", f"₹{job.credits / 100:,.2f}")
+                st.dataframe(for_display(pd.DataFrame(job.transactions())))
+        progress.progress(job.progress(), text=progress_text(job))
+        if finished:
+            break
+    cancel.empty()
+    progress.empty()
+    live.empty()
+    return job
+
+def process_upload(data, cache, statement=None, card_id=None, trace=None, profile=False):
     """
-    Robust bank detection (FIXED)
-    Extracts text from the first 2 pages to find keywords.
+    Cache lookup, then open -> detect -> parse -> render for one upload.
+    Returns (bank, df) when the statement was parsed, else None.
+    `statement` (the PDF's sha256) turns on the duplicate check.
+    On a cache miss the statement is parsed in the background and rendered
+    page by page; a cancelled parse shows its rows but isn't cached.
     """
-    full_text = ""
-    num_pages_to_check = min(len(pdf.pages), 2) # Check first 2 pages
-
-    for i in range(num_pages_to_check):
-        page = pdf.pages[i]
-        # Use default extraction (no tolerances) for compressed PDFs
-        text = page.extract_text() 
-        if text:
-            full_text += text.lower()
-    
-    # --- Axis Bank Check (NEW, more robust) ---
-    if ("axis bank" in full_text or "axisbank" in full_text) and \
-       ("my zone credit card" in full_text or "ambika shekhawat" in full_text or "axis edge" in full_text or "45145700" in full_text):
-        return "AXIS"
-
-    # --- ICICI Bank Check ---
-    if "icici bank" in full_text:
-        if "amazon pay" in full_text or "amazonpaycc@icicibank.com" in full_text:
-            return "ICICI_AMAZON"
-        if "coral" in full_text or "4375" in full_text: 
-            return "ICICI_CORAL"
-        return "ICICI_CORAL" # Default ICICI
-
-    # --- HDFC Bank Check ---
-    if "hdfc bank" in full_text:
-        return "HDFC"
-        
-    # --- IDFC Bank Check ---
-    if "idfc first" in full_text or "idfc first\n bank" in full_text:
-        return "IDFC"
-        
-    return None
+    with stage("cache_lookup"):
+        key = make_key(data)
+        cached = cache.get(key)
+
+    if cached is not None:
+        bank, df = cached
+        if bank:
+            st.success(f"Detected: **{bank}** (cached)")
+            with stage("render"):
+                show_results(bank, df, statement, card_id)
+            return bank, df
+        st.error("Could not determine bank from PDF. The file may be an unsupported or compressed PDF.")
+        return None
+
+    job = parse_progressively(data, key, trace, profile)
+    if job.error is not None:
+        if job.bank:
+            st.error(f"An error occurred while parsing the {job.bank} file: {job.error}")
+        else:
+            st.error(f"Error reading PDF: {job.error}")
+        return None
+    if job.bank is None:
+        cache.put(key, None, None, job.total_pages)
+        st.error("Could not determine bank from PDF. The file may be an unsupported or compressed PDF.")
+        return None
+
+    df = transactions_frame(job.batches)
+    st.success(f"Detected: **{job.bank}**")
+    if job.cancelled.is_set() and job.pages_done < job.total_pages:
+        st.warning(f"Parsing was cancelled after {job.pages_done} of {job.total_pages} pages. "
+                   "These are the transactions found so far.")
+        if st.button("Parse the whole statement"):
+            del st.session_state["parse_job"]
+            st.rerun()
+        with stage("render"):
+            show_results(job.bank, df, statement, card_id)
+        return None
+
+    cache.put(key, job.bank, df, job.total_pages)
+    with stage("render"):
+        show_results(job.bank, df, statement, card_id)
+    return job.bank, df
+
+def offer_indexing(key, bank, df, card_id=None, source=None):
+    """
+    Lets the user add a parsed statement to the spending index. `key` is
+    the sha256 of the PDF, as used by `python -m parsers.spending add`.
+    Transactions already indexed from an overlapping statement are skipped,
+    and the statement's fingerprints go into the duplicate index.
+    """
+    if df.empty:
+        return
+    index = SpendingIndex()
+    duplicates = DuplicateIndex()
+    try:
+        if index.has(key):
+            st.caption("This statement is already in the spending index.")
+            return
+        if st.button("Add to spending index"):
+            checked = duplicates.check(bank, df, card_id, key)
+            rows = index.add_statement(bank, checked, card_id, key=key, source=source)
+            duplicates.add_statement(bank, df, card_id, key=key, source=source)
+            skipped = len(df) - rows
+            st.success(f"Added {rows} transactions to the spending index"
+                       + (f" ({skipped} already indexed from earlier statements skipped)." if skipped else "."))
+    finally:
+        index.close()
+        duplicates.close()
+
+def show_dashboard():
+    """
+    Spending across every indexed statement, read from the index's rollups.
+    """
+    index = SpendingIndex()
+    try:
+        summary = index.summary()
+        if not summary["statements"]:
+            st.info("The spending index is empty. Parse a statement and add it, or run `python -m parsers.spending add`.")
+            return
+        st.caption(f"{summary['statements']} statements, {summary['txns']} transactions, "
+                   f"{summary['cards']} cards, {summary['first_month']} to {summary['last_month']}")
+
+        banks = index.banks()
+        bank = st.selectbox("Bank", ["All"] + banks)
+        bank = None if bank == "All" else bank
+        cards = index.cards(bank)
+        card_id = st.selectbox("Card", ["All"] + cards) if len(cards) > 1 else None
+        card_id = None if card_id == "All" else card_id
+        months = index.months()
+        if not months:
+            st.info("The indexed statements have no transactions to show.")
+            return
+        start, end = (st.select_slider("Months", months, value=(months[0], months[-1]))
+                      if len(months) > 1 else (months[0], months[0]))
+        filters = {"bank": bank, "card_id": card_id, "start": start, "end": end}
+
+        by_month = pd.DataFrame(index.spend_by_month(**filters))
+        st.metric("Total Spend (Debits)", f"₹{by_month['spend'].sum():,.2f}")
+        st.metric("Total Payments (Credits)", f"₹{by_month['credits'].sum():,.2f}")
+        st.subheader("Spend by Month")
+        st.bar_chart(by_month.set_index("month")["spend"])
+
+        left, right = st.columns(2)
+        with left:
+            st.subheader("Top Merchants")
+            top = st.number_input("How many", min_value=5, max_value=100, value=10, step=5)
+            st.dataframe(pd.DataFrame(index.top_merchants(top, **filters)))
+        with right:
+            st.subheader("Spend by Category")
+            st.dataframe(pd.DataFrame(index.spend_by_category(**filters)))
+
+        st.subheader("Date Range")
+        first, last = pd.Timestamp(f"{start}-01"), pd.Timestamp(f"{end}-01") + pd.offsets.MonthEnd(0)
+        picked = st.date_input("Between", value=(first.date(), last.date()))
+        if len(picked) == 2:
+            range_start, range_end = (day.isoformat() for day in picked)
+            totals = index.range_totals(range_start, range_end, bank, card_id)
+            st.write(f"₹{totals['spend']:,.2f} spent, ₹{totals['credits']:,.2f} credited, {totals['txns']} transactions")
+            st.dataframe(pd.DataFrame(index.transactions(range_start, range_end, bank, card_id, limit=1000)))
+    finally:
+        index.close()
 
 def main():
     st.set_page_config(layout="wide")
     st.title("💳 Credit Card Statement Parser")
 
+    if st.sidebar.radio("View", ["Parse a statement", "Spending dashboard"]) == "Spending dashboard":
+        show_dashboard()
+        return
+
+    cache = get_result_cache()
+    show_perf = st.sidebar.checkbox("Show performance panel")
+    profile = show_perf and st.sidebar.checkbox("Attach cProfile output")
+    card_id = st.sidebar.text_input("Card (optional, e.g. last 4 digits)")
     uploaded_file = st.file_uploader("Upload your PDF statement", type="pdf")
 
     if uploaded_file:
-        try:
-            with pdfplumber.open(uploaded_file) as pdf:
-                
-                bank = detect_bank(pdf) # Pass the whole pdf object
-                
-                if bank:
-                    st.success(f"Detected: **{bank}**")
-                    
-                    try:
-                        parser_function = PARSER_MAP[bank]
-                        df = parser_function(pdf)
-                        
-                        if df.empty:
-                            st.error(f"The parser for **{bank}** ran, but found 0 transactions. This file's layout may be unexpected.")
-                        else:
-                            st.subheader("Extracted Transactions")
-                            st.dataframe(df)
-                            
-                            st.subheader("Data Summary")
-                            total_spend = df[df['Amount'] > 0]['Amount'].sum()
-                            total_payments = df[df['Amount'] < 0]['Amount'].sum()
-                            st.metric("Total Spend (Debits)", f"₹{total_spend:,.2f}")
-                            st.metric("Total Payments (Credits)", f"₹{total_payments:,.2f}")
-                            
-                    except Exception as e:
-                        st.error(f"An error occurred while parsing the {bank} file: {e}")
-                        
-                else:
-                    st.error("Could not determine bank from PDF. The file may be an unsupported or compressed PDF.")
-
-        except Exception as e:
-            st.error(f"Error reading PDF: {e}")
+        trace = Trace(uploaded_file.name)
+        # The parse itself runs (and is profiled) in the job's worker thread
+        with activate(trace):
+            data = uploaded_file.getvalue()
+            statement = hashlib.sha256(data).hexdigest()
+            parsed = process_upload(data, cache, statement, card_id, trace, profile)
+        if parsed is not None:
+            offer_indexing(statement, *parsed, card_id, uploaded_file.name)
+        if show_perf:
+            job = st.session_state.get("parse_job")
+            show_performance(job.trace if job is not None and job.key == make_key(data) else trace)
+
+    stats = cache.stats()
+    st.sidebar.caption(f"Result cache: {stats['hits']} hits / {stats['misses']} misses")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Duplicate detection: hash index vs. pairwise frame comparison.
+
+Generates a history of monthly statements where each one repeats the tail
+of the previous cycle (the overlap a statement window or a re-download
+produces), with some repeated rows printed with a typo. Each new
+statement is checked for rows seen before, two ways:
+
+    pairwise    merge the new frame with every earlier frame on
+                date/amount/description, as a dedupe without an index would
+    hash index  parsers.duplicates: one fingerprint lookup per row
+
+and the time per statement is printed as the history grows. The index should
+stay flat while the pairwise check grows with the history. Exits 1 if the
+index misses a planted overlap or reports a row that was not planted.
+
+Usage:
+    python -m benchmarks.duplicates --statements 120 --txns 300 --overlap 0.2
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+from benchmarks.spending import MERCHANTS
+from parsers.duplicates import DuplicateIndex
+
+
+def history(count, txns, overlap, near, seed=0):
+    """
+    `count` statements (lists of dicts). Returns them with the number of
+    planted exact and near repeats of each.
+    """
+    rng = random.Random(seed)
+    statements, planted = [], []
+    previous = []
+    for cycle in range(count):
+        year, month = divmod(cycle, 12)
+        repeated = previous[len(previous) - int(len(previous) * overlap):] if previous else []
+        rows, exact, near_rows = [], 0, 0
+        for txn in repeated:
+            txn = dict(txn)
+            if rng.random() < near:
+                # A typo in the merchant name: no longer the same merchant
+                txn["Description"] = txn["Description"][0] + txn["Description"][2:]
+                near_rows += 1
+            else:
+                exact += 1
+            rows.append(txn)
+        for _ in range(txns - len(rows)):
+            rows.append({
+                "Date": datetime.date(2000 + year, month + 1, rng.randint(1, 28)),
+                "Description": f"{rng.choice(MERCHANTS)} {rng.randint(1000, 9999)}",
+                "Amount": round(rng.uniform(50, 5000) * 100),
+            })
+        statements.append(rows)
+        planted.append((exact, near_rows))
+        previous = rows
+    return statements, planted
+
+def pairwise(frame, earlier):
+    """
+    Rows of `frame` that also appear in any earlier frame.
+    """
+    seen = set()
+    for other in earlier:
+        merged = frame.reset_index().merge(other, on=["Date", "Description", "Amount"])
+        seen.update(merged["index"].tolist())
+    return len(seen)
+
+def main(argv=None):
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Duplicate detection: hash index vs. pairwise frame comparison.")
+    parser.add_argument("--statements", type=int, default=120, help="Statements in the history")
+    parser.add_argument("--txns", type=int, default=300, help="Transactions per statement")
+    parser.add_argument("--overlap", type=float, default=0.2, help="Share of the previous statement repeated")
+    parser.add_argument("--near", type=float, default=0.1, help="Share of repeats printed with a typo")
+    parser.add_argument("--every", type=int, default=20, help="Print a line every N statements")
+    args = parser.parse_args(argv)
+
+    statements, planted = history(args.statements, args.txns, args.overlap, args.near)
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        index = DuplicateIndex(os.path.join(tmp, "duplicates.sqlite"))
+        frames = []
+        print(f"{'history':>8}{'pairwise ms':>13}{'index ms':>10}{'exact':>7}{'near':>6}")
+        for number, (rows, (exact, near)) in enumerate(zip(statements, planted), 1):
+            frame = pd.DataFrame(rows)
+
+            start = time.perf_counter()
+            pairwise(frame, frames)
+            pairwise_ms = (time.perf_counter() - start) * 1000
+
+            start = time.perf_counter()
+            checked = index.check("HDFC", frame, key=str(number))
+            index.add_statement("HDFC", frame, key=str(number))
+            index_ms = (time.perf_counter() - start) * 1000
+
+            found = checked["Duplicate"].value_counts().to_dict()
+            if (found.get("exact", 0), found.get("near", 0)) != (exact, near):
+                print(f"statement {number}: planted {exact} exact / {near} near, found {found}", file=sys.stderr)
+                ok = False
+            frames.append(frame)
+            if number == 1 or number % args.every == 0:
+                print(f"{number - 1:>8}{pairwise_ms:>13.1f}{index_ms:>10.1f}"
+                      f"{found.get('exact', 0):>7}{found.get('near', 0):>6}")
+        index.close()
+    print(f"duplicates {'match' if ok else 'DO NOT match'} the planted overlaps")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Text lines from pdfminer directly vs. pdfplumber's extract_text().
+
+Generates a synthetic statement per bank (terms page included) and reads
+every page's text lines two ways:
+
+    pdfplumber  page.extract_text(), as the text strategies did
+    pdfminer    parsers.fastpath: glyph tuples from pdfminer's interpreter,
+                laid out into the same lines
+
+First every page is checked line for line (also for any PDFs given with
+--extra); the script exits 1 if a single line differs. Then it reports the
+best-of-`--repeat` time to read all pages and, under tracemalloc, the peak
+memory while reading them and what is still held afterwards (pdfplumber
+caches each page's layout and char dicts on the page; the fast path's
+tuples are kept too, as the page memo keeps them).
+
+Usage:
+    python -m benchmarks.fast_text --pages 20 --repeat 3
+    python -m benchmarks.fast_text --extra statements/*.pdf
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synth import BANKS, generate
+from parsers import fastpath
+
+
+def pdfplumber_lines(pdf):
+    return [page.extract_text() for page in pdf.pages]
+
+def pdfminer_lines(pdf):
+    # Keeps each page's tuples, as a MemoPage would
+    pages = [fastpath.chars(page) for page in pdf.pages]
+    return ["\n".join(fastpath.text_lines(chars)) for chars in pages], pages
+
+BACKENDS = {"pdfplumber": pdfplumber_lines, "pdfminer": pdfminer_lines}
+
+
+def compare(path):
+    """
+    (pages, lines, differences) for one PDF; each difference is
+    (page number, pdfplumber line, pdfminer line).
+    """
+    import pdfplumber
+
+    lines, differences = 0, []
+    with pdfplumber.open(path) as pdf:
+        for page in pdf.pages:
+            expected = page.extract_text().split("\n")
+            got = "\n".join(fastpath.text_lines(fastpath.chars(page))).split("\n")
+            lines += len(expected)
+            for number in range(max(len(expected), len(got))):
+                old = expected[number] if number < len(expected) else None
+                new = got[number] if number < len(got) else None
+                if old != new:
+                    differences.append((page.page_number, old, new))
+                    break
+        return len(pdf.pages), lines, differences
+
+def timed(path, backend, repeat):
+    """
+    Best-of-`repeat` seconds to read every page, each run on a freshly
+    opened PDF.
+    """
+    import pdfplumber
+
+    best = float("inf")
+    for _ in range(repeat):
+        with pdfplumber.open(path) as pdf:
+            start = time.perf_counter()
+            BACKENDS[backend](pdf)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+def traced(path, backend):
+    """
+    (peak MB, retained MB) allocated while reading every page, the PDF
+    still open at the end.
+    """
+    import pdfplumber
+
+    with pdfplumber.open(path) as pdf:
+        tracemalloc.start()
+        try:
+            result = BACKENDS[backend](pdf)
+            retained, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return peak / (1024 * 1024), retained / (1024 * 1024)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Text lines from pdfminer directly vs. pdfplumber's extract_text().")
+    parser.add_argument("--pages", type=int, default=20, help="Transaction pages per statement")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats (best is reported)")
+    parser.add_argument("--banks", nargs="+", default=BANKS, choices=BANKS)
+    parser.add_argument("--extra", nargs="*", default=[], help="More PDFs to check line for line")
+    args = parser.parse_args(argv)
+
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for bank in args.banks:
+            path = os.path.join(tmp, f"{bank.lower()}.pdf")
+            generate(bank, path, pages=args.pages)
+            paths.append((bank, path))
+
+        for label, path in paths + [(os.path.basename(path), path) for path in args.extra]:
+            pages, lines, differences = compare(path)
+            print(f"{label:<14}{pages:>5} pages {lines:>6} lines  {'same' if not differences else 'DIFFERENT'}")
+            for page_number, old, new in differences:
+                print(f"    page {page_number}\n        pdfplumber {old!r}\n        pdfminer   {new!r}", file=sys.stderr)
+                ok = False
+
+        print()
+        # Each pair of columns is pdfplumber, then pdfminer
+        print(f"{'bank':<14}{'seconds':>16}{'speedup':>9}{'peak MB':>14}{'held MB':>14}")
+        for bank, path in paths:
+            slow, fast = timed(path, "pdfplumber", args.repeat), timed(path, "pdfminer", args.repeat)
+            (slow_peak, slow_held), (fast_peak, fast_held) = traced(path, "pdfplumber"), traced(path, "pdfminer")
+            print(f"{bank:<14}{slow:>8.3f}{fast:>8.3f}{slow / fast:>8.1f}x"
+                  f"{slow_peak:>7.1f}{fast_peak:>7.1f}{slow_held:>7.1f}{fast_held:>7.1f}")
+    print(f"\nline streams {'match' if ok else 'DO NOT match'}")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
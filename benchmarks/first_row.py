@@ -0,0 +1,97 @@
+"""
+Time to first row and cancellation latency of background parsing.
+
+Generates statements of growing length and parses each with a
+parsers.progressive.ParseJob, as the app does for an upload, reporting
+
+- the time until the first transaction is available,
+- the time to parse the whole statement,
+- after cancelling right after the first row: how long the worker took to
+  stop and how many pages it finished.
+
+The first row should cost detection plus about one page of work whatever
+the length, so the script exits 1 if the longest statement's time to first
+row is more than --tolerance times the shortest one's, or if a cancelled
+job went on to parse more than one further page.
+
+Usage:
+    python -m benchmarks.first_row --pages 5 50 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.synth import BANKS, generate
+from parsers.progressive import ParseJob
+
+DEFAULT_TOLERANCE = 3.0
+
+
+def first_row(data, repeat):
+    """
+    (seconds to first row, seconds to finish), each the best of `repeat`
+    full parses.
+    """
+    best_first, best_total = float("inf"), float("inf")
+    for _ in range(repeat):
+        job = ParseJob(data).start()
+        job.wait()
+        if job.error is not None:
+            raise job.error
+        best_first, best_total = min(best_first, job.first_row_seconds), min(best_total, job.seconds)
+    return best_first, best_total
+
+def cancelled(data):
+    """
+    Cancels as soon as the first row is in. Returns (seconds from cancel to
+    the worker stopping, pages done when cancelled, pages done at the end).
+    """
+    job = ParseJob(data).start()
+    while job.first_row_seconds is None and not job.done.is_set():
+        time.sleep(0.001)
+    pages_at_cancel = job.pages_done
+    start = time.perf_counter()
+    job.cancel()
+    job.wait()
+    return time.perf_counter() - start, pages_at_cancel, job.pages_done
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time to first row and cancellation latency of background parsing.")
+    parser.add_argument("--bank", default="HDFC", choices=BANKS)
+    parser.add_argument("--pages", type=int, nargs="+", default=[5, 50, 200], help="Page counts to try")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed ratio of the longest to the shortest statement's time to first row")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repeats (best is reported)")
+    args = parser.parse_args(argv)
+
+    rows = []
+    ok = True
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'pages':>6}{'first row s':>13}{'full parse s':>14}{'cancel s':>10}{'pages at cancel':>17}{'pages at stop':>15}")
+        for number, pages in enumerate(sorted(args.pages)):
+            path = os.path.join(tmp, f"{pages}p.pdf")
+            generate(args.bank, path, pages=pages, terms_pages=0)
+            with open(path, "rb") as f:
+                data = f.read()
+            if number == 0:
+                # Warm-up: the first parse also pays for importing pdfplumber and pandas
+                first_row(data, 1)
+            first, total = first_row(data, args.repeat)
+            stop, at_cancel, at_stop = cancelled(data)
+            rows.append((pages, first))
+            print(f"{pages:>6}{first:>13.3f}{total:>14.3f}{stop:>10.3f}{at_cancel:>17}{at_stop:>15}")
+            if at_stop > at_cancel + 1:
+                print(f"cancelled job went on for {at_stop - at_cancel} pages", file=sys.stderr)
+                ok = False
+
+    shortest, longest = rows[0][1], rows[-1][1]
+    if longest > shortest * args.tolerance:
+        print(f"time to first row grew from {shortest:.3f}s to {longest:.3f}s "
+              f"(more than {args.tolerance}x)", file=sys.stderr)
+        ok = False
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
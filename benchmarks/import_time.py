@@ -0,0 +1,85 @@
+"""
+Cold-start import time of the parsing core vs. the Streamlit app.
+
+Imports each module in a fresh interpreter (so nothing is cached in
+sys.modules) and reports the best wall time over --repeat runs, the peak
+RSS of that interpreter and which heavy dependencies the import pulled in.
+Worker processes, the CLI tools and the service only need parsers.core, so
+its number is what every pool worker pays on startup.
+
+Usage:
+    python -m benchmarks.import_time --repeat 5
+    python -m benchmarks.import_time --max-core-ms 150
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+MODULES = ["parsers.core", "parsers.batch", "parsers.service", "app"]
+HEAVY = ["streamlit", "pandas", "numpy", "pdfplumber", "pdfminer"]
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({{
+    "seconds": seconds,
+    "peak_rss_mb": round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1),
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def time_import(module, repeat=5):
+    """
+    Best-of-`repeat` import time of `module`, each in a new interpreter.
+    """
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", PROBE.format(module=module, heavy=HEAVY)],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        runs.append(json.loads(out.strip().splitlines()[-1]))
+    best = min(runs, key=lambda run: run["seconds"])
+    return {
+        "module": module,
+        "ms": round(best["seconds"] * 1000, 1),
+        "peak_rss_mb": best["peak_rss_mb"],
+        "loaded": best["loaded"],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cold-start import time of the parsing core vs. the app.")
+    parser.add_argument("modules", nargs="*", default=MODULES, help="Modules to import (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per module (best is reported)")
+    parser.add_argument("--max-core-ms", type=float, default=None,
+                        help="Exit 1 if parsers.core takes longer than this to import")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = [time_import(module, args.repeat) for module in args.modules]
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'module':<18}{'import ms':>10}{'peak MB':>9}  heavy modules loaded")
+        for result in results:
+            print(f"{result['module']:<18}{result['ms']:>10.1f}{result['peak_rss_mb']:>9.1f}  "
+                  f"{', '.join(result['loaded']) or '-'}")
+
+    ok = True
+    for result in results:
+        if result["module"] == "parsers.core":
+            if "streamlit" in result["loaded"]:
+                print("parsers.core imported streamlit", file=sys.stderr)
+                ok = False
+            if args.max_core_ms is not None and result["ms"] > args.max_core_ms:
+                print(f"parsers.core took {result['ms']} ms (limit {args.max_core_ms} ms)", file=sys.stderr)
+                ok = False
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
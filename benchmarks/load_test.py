@@ -0,0 +1,146 @@
+"""
+Load test for the parsing service (parsers/service.py).
+
+Starts the service in a subprocess (or uses --url), then submits statements
+from a folder (default: freshly generated synthetic statements) with a fixed
+number of concurrent clients. Reports throughput, latency percentiles, how
+many submissions were refused with 429/503, and the service's own metrics.
+
+Usage:
+    python -m benchmarks.load_test --requests 50 --concurrency 8
+    python -m benchmarks.load_test --url http://127.0.0.1:8765 --corpus statements/ --mode async
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle
+
+from benchmarks.synth import generate_corpus
+from parsers.service import DEFAULT_HOST, percentile
+
+
+def request(url, data=None, timeout=300):
+    """
+    Returns (status code, parsed JSON body).
+    """
+    req = urllib.request.Request(url, data=data, method="POST" if data is not None else "GET")
+    if data is not None:
+        req.add_header("Content-Type", "application/pdf")
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read() or b"{}")
+
+def wait_until_up(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if request(f"{url}/health", timeout=2)[0] == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"service at {url} did not come up")
+
+def submit(url, name, data, mode, poll_interval=0.05):
+    """
+    Submits one statement and waits for its result. Returns a result dict
+    with the HTTP status, end-to-end seconds and row count.
+    """
+    start = time.perf_counter()
+    if mode == "sync":
+        status, body = request(f"{url}/parse?name={name}", data)
+    else:
+        status, body = request(f"{url}/parse?async=1&name={name}", data)
+        if status == 202:
+            while True:
+                status, body = request(f"{url}/jobs/{body['job_id']}")
+                if body.get("state") in ("done", "error"):
+                    break
+                time.sleep(poll_interval)
+    result = body.get("result") or {}
+    return {"status": status, "seconds": time.perf_counter() - start, "rows": result.get("rows"), "name": name}
+
+def run_load(url, files, total, concurrency, mode):
+    jobs = [name for name, _ in zip(cycle(sorted(files)), range(total))]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda name: submit(url, os.path.basename(name), files[name], mode), jobs))
+    elapsed = time.perf_counter() - start
+
+    ok = sorted(r["seconds"] for r in results if r["status"] == 200)
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "mode": mode,
+        "ok": len(ok),
+        "rejected_429": sum(1 for r in results if r["status"] == 429),
+        "unavailable_503": sum(1 for r in results if r["status"] == 503),
+        "errors": sum(1 for r in results if r["status"] not in (200, 429, 503)),
+        "seconds": round(elapsed, 3),
+        "statements_per_sec": round(len(ok) / elapsed, 2) if elapsed else 0.0,
+        "latency_seconds": {
+            "p50": percentile(ok, 0.50),
+            "p90": percentile(ok, 0.90),
+            "p99": percentile(ok, 0.99),
+        },
+        "service_metrics": request(f"{url}/metrics")[1],
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive the parsing service with concurrent uploads.")
+    parser.add_argument("--url", default=None, help="Use a running service instead of starting one")
+    parser.add_argument("--port", type=int, default=8766, help="Port for the service started here")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Workers for the service started here")
+    parser.add_argument("--queue-size", type=int, default=16, help="Queue size for the service started here")
+    parser.add_argument("--corpus", default=None, help="Folder of PDFs to upload (default: synthetic statements)")
+    parser.add_argument("--pages", type=int, default=3, help="Pages per synthetic statement")
+    parser.add_argument("--requests", type=int, default=40, help="Total uploads")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent clients")
+    parser.add_argument("--mode", choices=["sync", "async"], default="sync",
+                        help="Wait on the upload (sync) or poll /jobs/<id> (async)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        folder = args.corpus
+        if folder is None:
+            folder = tmp
+            generate_corpus(folder, pages=args.pages, terms_pages=1)
+        files = {}
+        for name in sorted(os.listdir(folder)):
+            if name.lower().endswith(".pdf"):
+                with open(os.path.join(folder, name), "rb") as f:
+                    files[name] = f.read()
+        if not files:
+            print(f"No PDF files found in {folder}", file=sys.stderr)
+            return 1
+
+        server = None
+        url = args.url
+        if url is None:
+            url = f"http://{DEFAULT_HOST}:{args.port}"
+            server = subprocess.Popen([
+                sys.executable, "-m", "parsers.service", "--port", str(args.port),
+                "--workers", str(args.workers), "--queue-size", str(args.queue_size),
+            ])
+        try:
+            wait_until_up(url)
+            report = run_load(url.rstrip("/"), files, args.requests, args.concurrency, args.mode)
+        finally:
+            if server is not None:
+                server.send_signal(signal.SIGINT)
+                server.wait()
+
+    print(json.dumps(report, indent=2))
+    return 0 if report["errors"] == 0 else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Peak RSS vs. page count, with and without low-memory mode.
+
+Generates one synthetic statement per page count, parses each in a fresh
+process (so peak RSS belongs to that statement alone) and reports the peak.
+In low-memory mode the peak should stay roughly flat as the page count grows;
+the script exits 1 if the largest statement's peak is more than --tolerance
+above the smallest one's, if the two modes return different frames, or if
+a low-memory parse goes over --budget-mb (which is also passed to the
+parser, so MemoryBudgetExceeded is reported the same way).
+
+Usage:
+    python -m benchmarks.memory --pages 10 50 200
+    python -m benchmarks.memory --bank HDFC --pages 20 100 --tolerance 0.2 --budget-mb 300
+
+tests/test_memory.py runs the same checks on small statements under pytest.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.run import peak_rss_mb
+from benchmarks.synth import BANKS, generate
+
+DEFAULT_TOLERANCE = 0.25
+
+
+def parse_peak(path, low_memory, budget_mb=None):
+    """
+    Parses one statement and returns (df, peak RSS MB). Runs in its own
+    process.
+    """
+    from parsers.core import parse_pdf
+
+    bank, df = parse_pdf(path, low_memory=low_memory, memory_budget_mb=budget_mb)
+    return df, peak_rss_mb()
+
+def measure(path, low_memory, budget_mb=None):
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+        return pool.submit(parse_peak, path, low_memory, budget_mb).result()
+
+def same_frames(default_df, low_df):
+    """
+    None if both modes parsed the same frame, else what differs.
+    """
+    import pandas as pd
+
+    try:
+        pd.testing.assert_frame_equal(default_df, low_df)
+    except AssertionError as e:
+        return str(e)
+    return None
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Peak RSS vs. page count, with and without low-memory mode.")
+    parser.add_argument("--bank", default="IDFC", choices=BANKS)
+    parser.add_argument("--pages", type=int, nargs="+", default=[10, 50, 200], help="Page counts to try")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed low-memory peak growth from the smallest to the largest statement (fraction)")
+    parser.add_argument("--budget-mb", type=float, default=None,
+                        help="RSS budget every low-memory parse must stay within")
+    args = parser.parse_args(argv)
+
+    from parsers.memory import MemoryBudgetExceeded
+
+    ok = True
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'pages':>6}{'txns':>7}{'default MB':>12}{'low-memory MB':>15}")
+        for pages in sorted(args.pages):
+            path = os.path.join(tmp, f"{pages}p.pdf")
+            generate(args.bank, path, pages=pages, terms_pages=0)
+            default_df, default_mb = measure(path, False)
+            try:
+                low_df, low_mb = measure(path, True, args.budget_mb)
+            except MemoryBudgetExceeded as e:
+                print(f"{pages} pages: {e}", file=sys.stderr)
+                return 1
+            rows.append((pages, default_mb, low_mb))
+            print(f"{pages:>6}{len(low_df):>7}{default_mb:>12.1f}{low_mb:>15.1f}")
+            difference = same_frames(default_df, low_df)
+            if difference is not None:
+                print(f"{pages} pages: low-memory mode returned different transactions\n{difference}", file=sys.stderr)
+                ok = False
+            if args.budget_mb and low_mb > args.budget_mb:
+                print(f"{pages} pages: low-memory peak {low_mb} MB is over the {args.budget_mb} MB budget", file=sys.stderr)
+                ok = False
+
+    smallest, largest = rows[0][2], rows[-1][2]
+    if largest > smallest * (1 + args.tolerance):
+        print(f"low-memory peak grew from {smallest} MB to {largest} MB "
+              f"(more than {args.tolerance:.0%})", file=sys.stderr)
+        ok = False
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
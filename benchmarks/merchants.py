@@ -0,0 +1,107 @@
+"""
+Merchant normalization throughput.
+
+Generates a column of raw descriptions the way statements print them (a
+merchant keyword with location and reference-number noise, plus unknown
+merchants) and times classifying it:
+
+    naive       every keyword tested against every description (`in` on the
+                cleaned text), no memo
+    trie regex  parsers.merchants' single-pass matcher, memo off
+    memoized    the same matcher with the memo, as used for a real column
+
+Reports rows per minute for each, and exits 1 if the three disagree.
+
+Usage:
+    python -m benchmarks.merchants --rows 1000000 --distinct 20000
+"""
+import argparse
+import random
+import sys
+import time
+
+from parsers.merchants import DEFAULT_CATEGORY, MERCHANTS, Normalizer, clean_text
+
+CITIES = ["BANGALORE", "MUMBAI", "GURGAON", "NEW DELHI", "PUNE", "CHENNAI", "HYDERABAD", "KOLKATA", ""]
+UNKNOWN = ["SHARMA GENERAL STORE", "CAFE COFFEE HOUSE", "SRI BALAJI MEDICALS", "KUMAR TEXTILES", "LOCAL VENDOR"]
+
+
+def descriptions(rows, distinct, seed=0):
+    """
+    `rows` descriptions drawn from a pool of `distinct` raw strings.
+    """
+    rng = random.Random(seed)
+    keywords = [keyword for _, words in MERCHANTS.values() for keyword in words]
+    pool = []
+    for _ in range(distinct):
+        head = rng.choice(keywords) if rng.random() < 0.85 else rng.choice(UNKNOWN)
+        tail = rng.choice(CITIES)
+        if rng.random() < 0.5:
+            tail = f"{tail} {rng.randint(100000, 999999)}".strip()
+        pool.append(f"{head} {tail}".strip())
+    return [rng.choice(pool) for _ in range(rows)]
+
+def naive_classifier():
+    """
+    The straightforward version: every cleaned keyword tried against the
+    description as a whole word, first in dictionary order wins after
+    sorting by length (so "AMAZON PAY" is tried before "AMAZON").
+    """
+    keywords = sorted(((f" {clean_text(k)} ", name, category) for name, (category, words) in MERCHANTS.items()
+                       for k in words), key=lambda entry: -len(entry[0]))
+
+    def classify(column):
+        results = []
+        for description in column:
+            text = f" {clean_text(description)} "
+            best = None
+            for keyword, name, category in keywords:
+                at = text.find(keyword)
+                if at != -1 and (best is None or at < best[0]):
+                    best = (at, name, category)
+            results.append((best[1], best[2]) if best else None)
+        return results
+    return classify
+
+def comparable(results):
+    """
+    Unknown merchants fall back to the description; compare only the known ones.
+    """
+    return [None if result is None or result[1] == DEFAULT_CATEGORY else result for result in results]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Merchant normalization throughput.")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Descriptions in the column")
+    parser.add_argument("--distinct", type=int, default=20_000, help="Distinct raw strings among them")
+    parser.add_argument("--naive-rows", type=int, default=50_000, help="Rows to time the naive matcher on")
+    args = parser.parse_args(argv)
+
+    column = descriptions(args.rows, args.distinct)
+    sample = column[:args.naive_rows]
+
+    runs = []
+    start = time.perf_counter()
+    naive = naive_classifier()(sample)
+    runs.append(("naive (no memo)", len(sample), time.perf_counter() - start))
+
+    unmemoized = Normalizer(memo_size=0)
+    start = time.perf_counter()
+    trie = [unmemoized._classify(description, None) for description in sample]
+    runs.append(("trie regex (no memo)", len(sample), time.perf_counter() - start))
+
+    normalizer = Normalizer()
+    start = time.perf_counter()
+    memoized = normalizer.classify(column)
+    runs.append(("trie regex + memo", len(column), time.perf_counter() - start))
+
+    print(f"{'matcher':<24}{'rows':>11}{'seconds':>10}{'rows/min':>16}")
+    for name, rows, seconds in runs:
+        print(f"{name:<24}{rows:>11,}{seconds:>10.3f}{rows / seconds * 60:>16,.0f}")
+    print(f"memo: {normalizer.hits:,} hits, {normalizer.misses:,} misses")
+
+    same = comparable(naive) == comparable(trie) == comparable(memoized[:len(sample)])
+    print(f"results {'agree' if same else 'DIFFER'}")
+    return 0 if same else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
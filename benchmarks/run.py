@@ -0,0 +1,170 @@
+"""
+Benchmark runner.
+
+Generates a synthetic statement per bank (see benchmarks/synth.py), then times
+detection and parsing for each one in a fresh process so peak RSS is
+per-bank. Results can be saved as a JSON baseline and later runs compared
+against it.
+
+Usage:
+    python -m benchmarks.run --pages 20 --save-baseline benchmarks/baseline.json
+    python -m benchmarks.run --pages 20 --baseline benchmarks/baseline.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from benchmarks.synth import BANKS, generate_corpus
+
+DEFAULT_TOLERANCE = 0.15
+
+
+def peak_rss_mb():
+    """
+    Peak resident set size of this process in MB.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return round(peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024, 1)
+
+def bench_statement(path, repeat=3):
+    """
+    Times detection and parsing of one statement. Runs in its own process.
+    Best-of-`repeat` timings are reported to cut down on noise.
+    """
+    from parsers.core import PARSER_MAP, detect_bank, open_pdf
+    from parsers.document import Document
+
+    detect_times, parse_times = [], []
+    bank, rows, pages = None, 0, 0
+    for _ in range(repeat):
+        with open_pdf(path) as pdf:
+            pdf = Document(pdf)
+            pages = len(pdf.pages)
+
+            start = time.perf_counter()
+            bank = detect_bank(pdf)
+            detect_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            df = PARSER_MAP[bank](pdf) if bank else None
+            parse_times.append(time.perf_counter() - start)
+            rows = 0 if df is None else len(df)
+
+    detect_s, parse_s = min(detect_times), min(parse_times)
+    total_s = detect_s + parse_s
+    return {
+        "detected": bank,
+        "pages": pages,
+        "transactions": rows,
+        "detect_ms": round(detect_s * 1000, 2),
+        "parse_ms": round(parse_s * 1000, 2),
+        "pages_per_sec": round(pages / total_s, 2) if total_s else 0.0,
+        "transactions_per_sec": round(rows / total_s, 1) if total_s else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+def run(corpus, repeat=3):
+    """
+    Benchmarks every statement in {bank: path}, one fresh process each.
+    """
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for bank, path in corpus.items():
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results[bank] = pool.submit(bench_statement, path, repeat).result()
+    return results
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Lists regressions vs. a baseline: throughput down or peak RSS up by more
+    than `tolerance`, or a different transaction count (a correctness change).
+    """
+    regressions = []
+    for bank, current in results.items():
+        before = baseline.get("results", {}).get(bank)
+        if not before:
+            continue
+        if current["transactions"] != before["transactions"]:
+            regressions.append(f"{bank}: transactions {before['transactions']} -> {current['transactions']}")
+        if current["pages_per_sec"] < before["pages_per_sec"] * (1 - tolerance):
+            regressions.append(f"{bank}: pages/sec {before['pages_per_sec']} -> {current['pages_per_sec']}")
+        if current["peak_rss_mb"] > before["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{bank}: peak RSS {before['peak_rss_mb']} MB -> {current['peak_rss_mb']} MB")
+    return regressions
+
+def print_table(results):
+    header = f"{'bank':<14}{'pages':>6}{'txns':>6}{'detect ms':>11}{'parse ms':>10}{'pages/s':>9}{'txns/s':>9}{'RSS MB':>8}"
+    print(header)
+    print("-" * len(header))
+    for bank, r in results.items():
+        print(f"{bank:<14}{r['pages']:>6}{r['transactions']:>6}{r['detect_ms']:>11}{r['parse_ms']:>10}"
+              f"{r['pages_per_sec']:>9}{r['transactions_per_sec']:>9}{r['peak_rss_mb']:>8}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark detection and parsing for every bank layout.")
+    parser.add_argument("--pages", type=int, default=10, help="Transaction pages per statement")
+    parser.add_argument("--txns", type=int, default=30, help="Transactions per page")
+    parser.add_argument("--terms-pages", type=int, default=2, help="Trailing terms-and-conditions pages")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per statement (best is reported)")
+    parser.add_argument("--banks", nargs="*", default=BANKS, choices=BANKS)
+    parser.add_argument("--corpus", default=None, help="Keep the generated PDFs in this folder")
+    parser.add_argument("--out", default=None, help="Write results JSON here")
+    parser.add_argument("--baseline", default=None, help="Compare against this baseline JSON")
+    parser.add_argument("--save-baseline", default=None, help="Save these results as a baseline JSON")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown / RSS growth before flagging (fraction)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus = generate_corpus(args.corpus or tmp, args.pages, args.txns, args.terms_pages, banks=args.banks)
+        results = run(corpus, args.repeat)
+
+    # A statement that parses to the wrong number of rows is a bug, not a benchmark
+    expected = args.pages * args.txns
+    wrong = [bank for bank, r in results.items() if r["detected"] != bank or r["transactions"] != expected]
+
+    report = {
+        "meta": {
+            "pages": args.pages,
+            "txns_per_page": args.txns,
+            "terms_pages": args.terms_pages,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    print_table(results)
+
+    for path in (args.out, args.save_baseline):
+        if path:
+            with open(path, "w") as f:
+                json.dump(report, f, indent=2)
+
+    status = 0
+    if wrong:
+        print(f"\nWrong detection or transaction count for: {', '.join(wrong)}")
+        status = 1
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions vs. baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            status = 1
+        else:
+            print("\nNo regressions vs. baseline.")
+    return status
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Spending index: incremental rollups vs. recomputing from raw rows.
+
+Builds an index of synthetic monthly statements (no PDFs: parsed frames are
+generated directly) and reports
+
+- the time to add one more statement, which only upserts its own totals,
+  against regrouping every raw row with pandas as a dashboard would without
+  the rollups;
+- the latency of each query (spend by month, merchant and category, top-N
+  merchants, a date-range total) on the full index.
+
+It exits 1 if the rollups disagree with the raw rows.
+
+Usage:
+    python -m benchmarks.spending --cards 6 --months 36 --txns 300
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import tempfile
+import time
+
+from parsers.spending import SpendingIndex
+
+MERCHANTS = [
+    "AMAZON PAY INDIA PRIVATE L BANGALORE", "SWIGGY BANGALORE", "ZOMATO LTD GURGAON", "UBER INDIA SYSTEMS",
+    "FLIPKART INTERNET", "BIGBASKET", "IRCTC", "NETFLIX", "APOLLO PHARMACY", "SHELL FUEL STATION",
+    "MAKEMYTRIP", "BOOKMYSHOW", "MYNTRA", "DMART", "RELIANCE TRENDS",
+]
+
+
+def statement(rng, month, txns):
+    """
+    One month's parsed statement as Date/Description/Amount dicts (Amount
+    in paise).
+    """
+    year, month = divmod(month, 12)
+    rows = []
+    for _ in range(txns):
+        amount = round(rng.uniform(50, 5000) * 100) * (-1 if rng.random() < 0.05 else 1)
+        rows.append({
+            "Date": datetime.date(2020 + year, month + 1, rng.randint(1, 28)),
+            "Description": f"{rng.choice(MERCHANTS)} {rng.randint(1000, 9999)}",
+            "Amount": amount,
+        })
+    return rows
+
+def timed(fn, repeat=5):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+def main(argv=None):
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Spending index: incremental rollups vs. full recompute.")
+    parser.add_argument("--cards", type=int, default=6)
+    parser.add_argument("--months", type=int, default=36)
+    parser.add_argument("--txns", type=int, default=300, help="Transactions per statement")
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repeats (best is reported)")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        index = SpendingIndex(os.path.join(tmp, "spending.sqlite"))
+        start = time.perf_counter()
+        for card in range(args.cards):
+            for month in range(args.months):
+                index.add_statement("HDFC", statement(rng, month, args.txns), card_id=f"card-{card}")
+        build = time.perf_counter() - start
+        summary = index.summary()
+        print(f"Indexed {summary['statements']} statements, {summary['txns']:,} transactions in {build:.2f}s")
+
+        extra = statement(rng, args.months, args.txns)
+        start = time.perf_counter()
+        index.add_statement("HDFC", extra, card_id="card-0")
+        incremental = time.perf_counter() - start
+
+        def recompute():
+            raw = pd.read_sql_query("SELECT month, merchant, category, amount_paise FROM transactions", index.db)
+            spend = raw["amount_paise"].where(raw["amount_paise"] > 0, 0)
+            frame = raw.assign(spend=spend)
+            return (frame.groupby("month")["spend"].sum(), frame.groupby("merchant")["spend"].sum(),
+                    frame.groupby("category")["spend"].sum())
+        full, (by_month, by_merchant, _) = timed(recompute, args.repeat)
+
+        print(f"\n{'add one statement (rollup upsert)':<40}{incremental * 1000:>10.2f} ms")
+        print(f"{'recompute rollups from raw rows':<40}{full * 1000:>10.2f} ms  (read + pandas groupby)")
+
+        months = index.months()
+        queries = {
+            "spend by month": lambda: index.spend_by_month(),
+            "spend by merchant": lambda: index.spend_by_merchant(),
+            "top 10 merchants": lambda: index.top_merchants(10),
+            "spend by category": lambda: index.spend_by_category(),
+            "one card, 12 months": lambda: index.spend_by_month(card_id="card-1", start=months[0], end=months[min(11, len(months) - 1)]),
+            "date-range total (3 months)": lambda: index.range_totals(f"{months[0]}-01", f"{months[min(2, len(months) - 1)]}-31"),
+            "date-range rows (1 week)": lambda: index.transactions(f"{months[-1]}-01", f"{months[-1]}-07"),
+        }
+        print()
+        for name, query in queries.items():
+            seconds, _ = timed(query, args.repeat)
+            print(f"{name:<40}{seconds * 1000:>10.2f} ms")
+
+        ok = (
+            {row["month"]: round(row["spend"] * 100) for row in index.spend_by_month()} == (by_month.astype(int)).to_dict()
+            and {row["merchant"]: round(row["spend"] * 100) for row in index.spend_by_merchant()}
+            == (by_merchant.astype(int)).to_dict()
+        )
+        print(f"\nrollups {'match' if ok else 'DO NOT match'} the raw rows")
+        index.close()
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
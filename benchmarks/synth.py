@@ -0,0 +1,214 @@
+"""
+Synthetic statements for benchmarking.
+
+Writes small, dependency-free PDFs that mimic the layout each parser expects:
+
+    HDFC          ruled table (Date | Transaction Description | Amount)
+    ICICI_CORAL   text lines: date, reference, details, reward points, amount [CR]
+    AXIS          text lines: date, details, category, amount Cr/Dr
+    IDFC          text lines: date, details, amount [CR], plus IGST lines to skip
+    ICICI_AMAZON  whitespace-aligned 5-column table read with the "text" strategy
+
+Every statement ends with terms-and-conditions pages, like real ones do.
+Output is deterministic for a given seed.
+
+Usage:
+    python -m benchmarks.synth out_dir --pages 20 --txns 30
+"""
+import argparse
+import os
+import random
+
+BANKS = ["HDFC", "ICICI_CORAL", "AXIS", "IDFC", "ICICI_AMAZON"]
+
+MERCHANTS = [
+    "SWIGGY BANGALORE", "AMAZON RETAIL IN", "UBER INDIA SYSTEMS", "ZOMATO LTD GURGAON",
+    "FLIPKART INTERNET", "BIGBASKET BANGALORE", "IRCTC NEW DELHI", "BOOKMYSHOW MUMBAI",
+]
+
+TERMS_LINES = [
+    "Important information and terms and conditions",
+    "Reward points are credited within 30 days of the statement date.",
+    "Please pay the minimum amount due to avoid late payment charges.",
+    "For any queries call our 24 hour customer care.",
+]
+
+PAGE_WIDTH, PAGE_HEIGHT = 595, 842
+
+
+# --- Minimal PDF writer (Helvetica text and lines only) ---
+
+def _escape(text):
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+def text_op(x, y, text, size=9):
+    return "BT /F1 %d Tf %.2f %.2f Td (%s) Tj ET" % (size, x, y, _escape(text))
+
+def line_op(x1, y1, x2, y2):
+    return "%.2f %.2f m %.2f %.2f l S" % (x1, y1, x2, y2)
+
+def write_pdf(path, pages, title="Credit Card Statement"):
+    """
+    Writes a PDF where each page is a list of content stream operators.
+    """
+    objects = []
+
+    def add(body):
+        objects.append(body)
+        return len(objects)
+
+    font_id = add(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+    pages_id = add(None)
+    kids = []
+    for ops in pages:
+        data = "\n".join(ops).encode("latin-1")
+        content_id = add(b"<< /Length %d >>\nstream\n" % len(data) + data + b"\nendstream")
+        kids.append(add((
+            "<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %d %d] "
+            "/Resources << /Font << /F1 %d 0 R >> >> /Contents %d 0 R >>"
+            % (pages_id, PAGE_WIDTH, PAGE_HEIGHT, font_id, content_id)
+        ).encode()))
+    objects[pages_id - 1] = ("<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        " ".join("%d 0 R" % kid for kid in kids), len(kids))).encode()
+    catalog_id = add(("<< /Type /Catalog /Pages %d 0 R >>" % pages_id).encode())
+    info_id = add(("<< /Title (%s) /Producer (benchmarks.synth) >>" % _escape(title)).encode())
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, catalog_id, info_id, xref)
+
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+# --- Bank layouts ---
+
+def _amount(rng):
+    return "{:,.2f}".format(rng.randint(100, 500000) / 100)
+
+def _date(rng):
+    return "%02d/%02d/2024" % (rng.randint(1, 28), rng.randint(1, 12))
+
+def _hdfc_page(rng, txns):
+    ops = [text_op(40, 800, "HDFC Bank Credit Card Statement", 12)]
+    rows = [("Date", "Transaction Description", "Amount (in Rs.)")]
+    for _ in range(txns):
+        credit = " Cr" if rng.random() < 0.1 else ""
+        rows.append((_date(rng), rng.choice(MERCHANTS), _amount(rng) + credit))
+    xs = [40, 120, 400, 520]
+    top = y = 760
+    for row in rows:
+        ops.append(line_op(xs[0], y, xs[-1], y))
+        for x, cell in zip(xs, row):
+            ops.append(text_op(x + 3, y - 12, cell))
+        y -= 18
+    ops.append(line_op(xs[0], y, xs[-1], y))
+    ops.extend(line_op(x, top, x, y) for x in xs)
+    return ops
+
+def _icici_coral_page(rng, txns):
+    ops = [text_op(40, 800, "ICICI Bank Coral Credit Card", 12)]
+    y = 770
+    for _ in range(txns):
+        credit = " CR" if rng.random() < 0.1 else ""
+        line = "%s %d %s %d %s%s" % (
+            _date(rng), rng.randint(10**9, 10**10), rng.choice(MERCHANTS), rng.randint(1, 99), _amount(rng), credit)
+        ops.append(text_op(40, y, line))
+        y -= 14
+    return ops
+
+def _axis_page(rng, txns):
+    ops = [text_op(40, 800, "Axis Bank My Zone Credit Card", 12)]
+    y = 770
+    for _ in range(txns):
+        if rng.random() < 0.1:
+            line = "%s INTERNET PAYMENT %d %s Cr" % (_date(rng), rng.randint(1000, 9999), _amount(rng))
+        else:
+            line = "%s %s SHOPPING %s Dr" % (_date(rng), rng.choice(MERCHANTS), _amount(rng))
+        ops.append(text_op(40, y, line))
+        y -= 14
+    return ops
+
+def _idfc_page(rng, txns):
+    ops = [text_op(40, 800, "IDFC FIRST Bank Credit Card Statement", 12)]
+    y = 770
+    for _ in range(txns):
+        credit = " CR" if rng.random() < 0.1 else ""
+        ops.append(text_op(40, y, "%s %s %s%s" % (_date(rng), rng.choice(MERCHANTS), _amount(rng), credit)))
+        y -= 14
+    ops.append(text_op(40, y, "%s IGST on fees 18.00" % _date(rng)))
+    return ops
+
+def _icici_amazon_page(rng, txns):
+    ops = [text_op(40, 800, "ICICI Bank Amazon Pay Credit Card", 12)]
+    y = 770
+    for _ in range(txns):
+        cells = [_date(rng), str(rng.randint(10**9, 10**10)), rng.choice(MERCHANTS).replace(" ", "_"),
+                 str(rng.randint(1, 99)), _amount(rng)]
+        for x, cell in zip([40, 110, 200, 420, 480], cells):
+            ops.append(text_op(x, y, cell))
+        y -= 14
+    return ops
+
+LAYOUTS = {
+    "HDFC": _hdfc_page,
+    "ICICI_CORAL": _icici_coral_page,
+    "AXIS": _axis_page,
+    "IDFC": _idfc_page,
+    "ICICI_AMAZON": _icici_amazon_page,
+}
+
+def _terms_page():
+    ops = []
+    y = 800
+    for i in range(40):
+        ops.append(text_op(40, y, TERMS_LINES[i % len(TERMS_LINES)]))
+        y -= 18
+    return ops
+
+def generate(bank, path, pages=5, txns_per_page=30, terms_pages=1, seed=0):
+    """
+    Writes one synthetic statement. Returns the number of transactions on it
+    (every generated row is one the parser should keep).
+    """
+    rng = random.Random(f"{bank}-{seed}")
+    content = [LAYOUTS[bank](rng, txns_per_page) for _ in range(pages)]
+    content += [_terms_page() for _ in range(terms_pages)]
+    write_pdf(path, content)
+    return pages * txns_per_page
+
+def generate_corpus(out_dir, pages=5, txns_per_page=30, terms_pages=1, seed=0, banks=BANKS):
+    """
+    Writes one statement per bank into out_dir. Returns {bank: path}.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    paths = {}
+    for bank in banks:
+        path = os.path.join(out_dir, f"{bank.lower()}_{pages}p.pdf")
+        generate(bank, path, pages, txns_per_page, terms_pages, seed)
+        paths[bank] = path
+    return paths
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write synthetic statements for every bank layout.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--pages", type=int, default=5, help="Transaction pages per statement")
+    parser.add_argument("--txns", type=int, default=30, help="Transactions per page")
+    parser.add_argument("--terms-pages", type=int, default=1, help="Trailing terms-and-conditions pages")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for bank, path in generate_corpus(args.out_dir, args.pages, args.txns, args.terms_pages, args.seed).items():
+        print(f"{bank:<14} {path}")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
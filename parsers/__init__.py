@@ -0,0 +1,3 @@
+# Bump this whenever a parser change can alter its output, so cached and
+# previously ingested results are recomputed.
+PARSER_VERSION = "6"
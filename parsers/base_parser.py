@@ -1,28 +1,81 @@
-import re
-import pandas as pd
-
-def clean_amount(amount_str):
-    """
-    Cleans an amount string and converts it to a float.
-    - Removes $, ₹, ,, and spaces
-    - Treats 'Cr' or '()' as negative (payments/credits)
-    - Treats 'Dr' as positive (debits/spend)
-    """
-    if amount_str is None:
-        return 0.0
-        
-    s = str(amount_str).strip()
-    
-    # Check for credit (negative)
-    is_credit = bool(re.search(r'(cr|\(.*\))', s, re.IGNORECASE))
-    
-    # Remove all non-numeric/non-decimal characters
-    s_cleaned = re.sub(r"[^0-9\.]", "", s)
-    
-    try:
-        amount = float(s_cleaned)
-        if is_credit:
-            return -amount # Make credits negative
-        return amount # Debits are positive
-    except ValueError:
-        return 0.0
\ No newline at end of file
+from parsers.profiling import count, stage
+
+# --- Vectorized normalization ---
+# Credits ('Cr' or '()') are negative, applied to a whole column in one pass.
+CREDIT_PATTERN = r'cr|\(.*\)'
+NON_NUMERIC_PATTERN = r'[^0-9\.]'
+DATE_FORMAT = "%d/%m/%Y"
+
+def normalize_amounts(values):
+    """
+    Parses a column of raw amount strings into int64 paise.
+    - Treats 'Cr' or '()' as negative (payments/credits), anything else as a debit
+    - Strips currency symbols, commas and spaces
+    Returns (paise, valid): unparseable or missing cells get paise 0 and
+    valid False instead of silently looking like a zero amount.
+    """
+    import numpy as np
+    import pandas as pd
+
+    raw = pd.Series(values, dtype="object")
+    missing = raw.isna().to_numpy()
+    text = raw.astype(str).str.strip()
+
+    is_credit = text.str.contains(CREDIT_PATTERN, case=False, regex=True).to_numpy(dtype=bool)
+    digits = text.str.replace(NON_NUMERIC_PATTERN, "", regex=True)
+    numbers = pd.to_numeric(digits, errors="coerce").to_numpy(dtype="float64")
+
+    valid = ~missing & ~np.isnan(numbers)
+    paise = np.rint(np.where(valid, numbers, 0.0) * 100).astype("int64")
+    paise[is_credit] *= -1
+    return paise, valid
+
+def normalize_dates(values, date_format=DATE_FORMAT):
+    """
+    Parses a column of DD/MM/YYYY strings into datetime64.
+    Returns (dates, valid); unparseable cells are NaT with valid False.
+    """
+    import pandas as pd
+
+    dates = pd.to_datetime(pd.Series(values, dtype="object"), format=date_format, errors="coerce")
+    return dates.to_numpy(), dates.notna().to_numpy()
+
+def normalize_transactions(transactions):
+    """
+    Normalizes a batch of raw transactions (Date and Amount still the
+    strings from the statement) in one vectorized pass. Date becomes a
+    datetime.date and Amount integer paise (debits positive, credits
+    negative). A row whose amount or date can't be parsed is kept with
+    Invalid True (an unparseable Amount is 0, an unparseable Date None) and
+    counted in rows_invalid; valid rows with a zero amount are dropped and
+    counted in rows_rejected, as the per-row parsers used to do.
+    """
+    if not transactions:
+        return []
+    with stage("normalize"):
+        paise, amount_ok = normalize_amounts([txn["Amount"] for txn in transactions])
+        dates, date_ok = normalize_dates([txn["Date"] for txn in transactions])
+        valid = amount_ok & date_ok
+        keep = ~valid | (paise != 0)
+
+        cleaned = []
+        # NaT becomes None
+        days = dates.astype("datetime64[D]").tolist()
+        for txn, amount, date, ok, kept in zip(transactions, paise.tolist(), days, valid.tolist(), keep.tolist()):
+            if kept:
+                cleaned.append(dict(txn, Date=date, Amount=amount, Invalid=not ok))
+    count("rows_rejected", int(keep.size - keep.sum()))
+    count("rows_invalid", int(valid.size - valid.sum()))
+    return cleaned
+
+def iso_day(value):
+    """
+    'YYYY-MM-DD' for a normalized Date (a date, datetime or Timestamp), or
+    None for a missing one (None, NaT). A string is taken to be one already
+    (e.g. a Date read back from the ingest manifest).
+    """
+    if value is None or value != value:
+        return None
+    if isinstance(value, str):
+        return value
+    return value.strftime("%Y-%m-%d")
@@ -0,0 +1,348 @@
+"""
+Headless batch parser.
+
+Usage:
+    python -m parsers.batch <folder> --output transactions.csv --workers 8
+
+Every PDF under the folder is parsed in a process pool. Transactions and a
+per-file status row are streamed to the output files as each file finishes.
+
+With --shard-pages N, statements longer than N pages are split into N-page
+shards that are parsed in the same pool and merged back in page order.
+
+With --cache-dir, results are read from / written to the shared result cache
+so statements that were already parsed are not parsed again.
+
+With --workers 1 (and no cache or sharding) files are parsed in this process
+and each page's transactions are written as soon as the page is done, so
+memory stays bounded by one page rather than one statement. If a statement
+fails partway, the rows it already wrote are rolled back (see
+parsers/sinks.py), so an errored file leaves no rows in the output.
+
+With --low-memory, each page's pdfplumber objects are released once it is
+parsed and files are memory-mapped instead of read (see parsers/memory.py);
+--memory-budget-mb fails a statement whose worker goes over that RSS.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from parsers.cache import DEFAULT_MAX_BYTES, ResultCache, make_key
+from parsers.core import PARSER_MAP, STREAM_MAP, detect_bank, open_pdf, transactions_frame
+from parsers.document import Document
+from parsers.memory import read_input
+from parsers.profiling import Trace, activate, stage
+from parsers.sharding import page_ranges, parse_shard
+from parsers.sinks import STATUS_COLUMNS, TRANSACTION_COLUMNS, open_sink, write_batches
+
+
+def find_pdfs(folder):
+    """
+    Returns every .pdf file under the folder, sorted so runs are repeatable.
+    A single file path is returned as-is.
+    """
+    if os.path.isfile(folder):
+        return [folder]
+    paths = []
+    for root, _, files in os.walk(folder):
+        for name in files:
+            if name.lower().endswith(".pdf"):
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+def process_file(path, shard_pages=None, cache_dir=None, cache_max_bytes=DEFAULT_MAX_BYTES,
+                 low_memory=None, memory_budget_mb=None):
+    """
+    Detects the bank and parses one statement. Runs inside a worker process.
+    Returns (status, transactions) where both are plain dicts/lists so they
+    pickle cheaply back to the parent.
+
+    If the statement has more than `shard_pages` pages it is not parsed here;
+    the status comes back as "split" and the parent schedules the shards.
+    """
+    start = time.perf_counter()
+    status = {"File": path, "Bank": None, "Status": "ok", "Pages": 0, "PagesSkipped": None, "Rows": 0, "Seconds": 0.0, "Cache": None, "Error": None}
+    transactions = []
+
+    trace = Trace(path)
+    with activate(trace):
+        try:
+            with read_input(path, low_memory) as data:
+                cache = None
+                if cache_dir:
+                    cache = ResultCache(cache_dir, cache_max_bytes)
+                    status["Key"] = make_key(data)
+                    cached = cache.lookup(status["Key"])
+                    if cached is not None:
+                        bank, df, meta = cached
+                        status["Bank"] = bank
+                        status["Cache"] = "hit"
+                        # Entries stored without page counts report 0 pages
+                        status["Pages"] = meta["pages"] or 0
+                        status["PagesSkipped"] = meta["pages_skipped"]
+                        if bank is None:
+                            status["Status"] = "unknown_bank"
+                        else:
+                            transactions = df.to_dict("records")
+                            _finish(status, transactions)
+                            if not transactions:
+                                status["Status"] = "no_transactions"
+                        status["Seconds"] = round(time.perf_counter() - start, 4)
+                        status["Trace"] = trace.to_dict()
+                        return status, transactions
+                    status["Cache"] = "miss"
+
+                with open_pdf(data) as pdf:
+                    pdf = Document(pdf, low_memory, memory_budget_mb)
+                    status["Pages"] = len(pdf.pages)
+                    with stage("detect_bank"):
+                        bank = detect_bank(pdf)
+                    status["Bank"] = bank
+
+                    if bank is None:
+                        status["Status"] = "unknown_bank"
+                        if cache:
+                            cache.put(status["Key"], None, None, status["Pages"])
+                    elif shard_pages and status["Pages"] > shard_pages:
+                        status["Status"] = "split"
+                    else:
+                        with stage("parse"):
+                            df = PARSER_MAP[bank](pdf)
+                        if cache:
+                            cache.put(status["Key"], bank, df, status["Pages"], pages_skipped(trace))
+                        for record in df.to_dict("records"):
+                            record["File"] = path
+                            record["Bank"] = bank
+                            transactions.append(record)
+                        status["Rows"] = len(transactions)
+                        if not transactions:
+                            status["Status"] = "no_transactions"
+        except Exception as e:
+            status["Status"] = "error"
+            status["Error"] = f"{type(e).__name__}: {e}"
+
+    status["Seconds"] = round(time.perf_counter() - start, 4)
+    status["PagesSkipped"] = pages_skipped(trace)
+    status["Trace"] = trace.to_dict()
+    return status, transactions
+
+def pages_skipped(trace):
+    """
+    How many pages the prefilter skipped in a trace, or None if it never ran.
+    """
+    if "pages_kept" in trace.counters or "pages_skipped" in trace.counters:
+        return trace.counters["pages_skipped"]
+    return None
+
+def shard_file(path, bank, start, stop, low_memory=None, memory_budget_mb=None):
+    """
+    parse_shard under a trace, for the batch runner. Runs inside a worker
+    process. Returns (transactions, pages skipped or None).
+    """
+    trace = Trace(path)
+    with activate(trace):
+        transactions = parse_shard(path, bank, start, stop, low_memory, memory_budget_mb)
+    return transactions, pages_skipped(trace)
+
+def stream_file(path, txn_sink, low_memory=None, memory_budget_mb=None):
+    """
+    Parses one statement in this process, streaming each page's
+    transactions straight into the sink. Returns the status dict.
+    """
+    start = time.perf_counter()
+    status = {"File": path, "Bank": None, "Status": "ok", "Pages": 0, "PagesSkipped": None, "Rows": 0, "Seconds": 0.0, "Cache": None, "Error": None}
+
+    trace = Trace(path)
+    with activate(trace):
+        try:
+            with open_pdf(path, low_memory) as pdf:
+                pdf = Document(pdf, low_memory, memory_budget_mb)
+                status["Pages"] = len(pdf.pages)
+                with stage("detect_bank"):
+                    bank = detect_bank(pdf)
+                status["Bank"] = bank
+
+                if bank is None:
+                    status["Status"] = "unknown_bank"
+                else:
+                    with stage("parse"):
+                        status["Rows"] = write_batches(STREAM_MAP[bank](pdf), txn_sink, File=path, Bank=bank)
+                    if not status["Rows"]:
+                        status["Status"] = "no_transactions"
+        except Exception as e:
+            status["Status"] = "error"
+            status["Error"] = f"{type(e).__name__}: {e}"
+
+    status["Seconds"] = round(time.perf_counter() - start, 4)
+    status["PagesSkipped"] = pages_skipped(trace)
+    status["Trace"] = trace.to_dict()
+    return status
+
+def status_path_for(output):
+    """
+    'out/transactions.csv' -> 'out/transactions_status.csv'
+    """
+    stem, ext = os.path.splitext(output)
+    return f"{stem}_status{ext}"
+
+def _finish(status, transactions):
+    """
+    Fills in the row count / final status once a file's transactions are known.
+    """
+    for record in transactions:
+        record["File"] = status["File"]
+        record["Bank"] = status["Bank"]
+    status["Rows"] = len(transactions)
+    if status["Status"] == "split":
+        status["Status"] = "ok" if transactions else "no_transactions"
+    return status, transactions
+
+def run_batch(paths, output, status_output=None, workers=None, shard_pages=None,
+              cache_dir=None, cache_max_bytes=DEFAULT_MAX_BYTES, trace_output=None,
+              low_memory=None, memory_budget_mb=None):
+    """
+    Parses every path in a process pool and streams results to the sinks.
+    With `trace_output`, each file's timing trace is appended to that
+    file as one JSON line. `low_memory` and `memory_budget_mb` are passed
+    to every worker (None: the environment settings). Returns a summary
+    dict with throughput numbers.
+    """
+    status_output = status_output or status_path_for(output)
+    txn_sink = open_sink(output, TRANSACTION_COLUMNS)
+    status_sink = open_sink(status_output, STATUS_COLUMNS)
+    trace_file = open(trace_output, "w", encoding="utf-8") if trace_output else None
+
+    summary = {"files": 0, "pages": 0, "pages_skipped": 0, "rows": 0, "failed": 0, "cache_hits": 0, "seconds": 0.0}
+    start = time.perf_counter()
+
+    def emit(status, transactions):
+        txn_sink.write(transactions)
+        status_sink.write([status])
+        if trace_file and status.get("Trace"):
+            trace = dict(status["Trace"], file=status["File"], bank=status["Bank"], status=status["Status"])
+            trace_file.write(json.dumps(trace) + "\n")
+            trace_file.flush()
+        summary["files"] += 1
+        summary["pages"] += status["Pages"]
+        summary["pages_skipped"] += status.get("PagesSkipped") or 0
+        summary["rows"] += status["Rows"]
+        if status["Status"] != "ok":
+            summary["failed"] += 1
+        if status["Cache"] == "hit":
+            summary["cache_hits"] += 1
+        print(f"[{summary['files']}/{len(paths)}] {status['Status']:<16} {status['File']}", file=sys.stderr)
+
+    try:
+        if workers == 1 and not shard_pages and not cache_dir:
+            for path in paths:
+                emit(stream_file(path, txn_sink, low_memory, memory_budget_mb), [])
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                # future -> ("file", None) or ("shard", (path, shard index))
+                pending = {pool.submit(process_file, path, shard_pages, cache_dir, cache_max_bytes, low_memory, memory_budget_mb): ("file", None)
+                           for path in paths}
+                # path -> {"status", "started", "results": [records per shard or None]}
+                split_files = {}
+
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        kind, key = pending.pop(future)
+
+                        if kind == "file":
+                            status, transactions = future.result()
+                            if status["Status"] != "split":
+                                emit(status, transactions)
+                                continue
+                            ranges = page_ranges(status["Pages"], shard_pages)
+                            split_files[status["File"]] = {
+                                "status": status,
+                                "started": time.perf_counter() - status["Seconds"],
+                                "results": [None] * len(ranges),
+                            }
+                            for index, (first, last) in enumerate(ranges):
+                                shard = pool.submit(shard_file, status["File"], status["Bank"], first, last,
+                                                    low_memory, memory_budget_mb)
+                                pending[shard] = ("shard", (status["File"], index))
+                            continue
+
+                        path, index = key
+                        entry = split_files[path]
+                        try:
+                            entry["results"][index], skipped = future.result()
+                        except Exception as e:
+                            entry["status"]["Status"] = "error"
+                            entry["status"]["Error"] = f"{type(e).__name__}: {e}"
+                            entry["results"][index], skipped = [], None
+                        if skipped is not None:
+                            entry["status"]["PagesSkipped"] = (entry["status"]["PagesSkipped"] or 0) + skipped
+
+                        if all(result is not None for result in entry["results"]):
+                            del split_files[path]
+                            status = entry["status"]
+                            status["Seconds"] = round(time.perf_counter() - entry["started"], 4)
+                            transactions = [record for records in entry["results"] for record in records]
+                            if cache_dir and status["Status"] == "split":
+                                df = transactions_frame([transactions])
+                                ResultCache(cache_dir, cache_max_bytes).put(status["Key"], status["Bank"], df,
+                                                                            status["Pages"], status["PagesSkipped"])
+                            emit(*_finish(status, transactions))
+    finally:
+        txn_sink.close()
+        status_sink.close()
+        if trace_file:
+            trace_file.close()
+
+    elapsed = time.perf_counter() - start
+    summary["seconds"] = round(elapsed, 3)
+    summary["files_per_sec"] = round(summary["files"] / elapsed, 2) if elapsed else 0.0
+    summary["pages_per_sec"] = round(summary["pages"] / elapsed, 2) if elapsed else 0.0
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Parse a folder of credit card statements without the UI.")
+    parser.add_argument("folder", help="Folder to scan (recursively) for PDF statements")
+    parser.add_argument("-o", "--output", default="transactions.csv",
+                        help="Transactions output file (.csv, .jsonl or .parquet)")
+    parser.add_argument("--status", default=None,
+                        help="Per-file status output (defaults to <output>_status.<ext>)")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="Number of worker processes (default: all cores)")
+    parser.add_argument("--shard-pages", type=int, default=None,
+                        help="Split statements longer than this many pages into page shards")
+    parser.add_argument("--cache-dir", default=None,
+                        help="Reuse/store results in this result cache directory")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Size cap for the result cache in MB")
+    parser.add_argument("--trace", default=None,
+                        help="Write a JSON timing trace per file (JSON lines) to this path")
+    parser.add_argument("--low-memory", action="store_true", default=None,
+                        help="Release each page once parsed and memory-map the input (PDF_PARSER_LOW_MEMORY=1)")
+    parser.add_argument("--memory-budget-mb", type=float, default=None,
+                        help="Fail a statement whose worker goes over this RSS (PDF_PARSER_MEMORY_BUDGET_MB)")
+    args = parser.parse_args(argv)
+
+    paths = find_pdfs(args.folder)
+    if not paths:
+        print(f"No PDF files found under {args.folder}", file=sys.stderr)
+        return 1
+
+    summary = run_batch(
+        paths, args.output, args.status, args.workers, args.shard_pages,
+        args.cache_dir, args.cache_max_mb * 1024 * 1024, args.trace,
+        args.low_memory, args.memory_budget_mb,
+    )
+    print(
+        f"Parsed {summary['files']} files ({summary['pages']} pages, {summary['pages_skipped']} skipped as "
+        f"non-transaction, {summary['rows']} transactions, "
+        f"{summary['failed']} not ok, {summary['cache_hits']} from cache) in {summary['seconds']}s: "
+        f"{summary['files_per_sec']} files/sec, {summary['pages_per_sec']} pages/sec",
+        file=sys.stderr,
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
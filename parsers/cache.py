@@ -0,0 +1,160 @@
+"""
+Content-addressed on-disk cache for parse results.
+
+Entries are keyed by a hash of the PDF bytes plus PARSER_VERSION, so a repeat
+upload of the same statement skips detection and parsing entirely. Each entry
+is a small JSON file (detected bank, row and page counts) and a Parquet file
+(transactions). Least recently used entries are evicted once the directory
+grows past its size cap. The same cache directory can be shared by the
+Streamlit app and the batch runner.
+
+The entries live in their own `results` directory, next to (not among) the
+templates, strategy statistics and indexes in ~/.cache/pdf-parser, and
+eviction only ever looks at files named by a cache key, so pointing
+PDF_PARSER_CACHE_DIR at a shared directory can't delete anything else.
+"""
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+from parsers import PARSER_VERSION
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "PDF_PARSER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "pdf-parser", "results")
+)
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+# Entry file names: a make_key digest and .json or .parquet
+ENTRY_NAME = re.compile(r"^([0-9a-f]{64})\.(json|parquet)$")
+
+
+def make_key(data, version=PARSER_VERSION):
+    """
+    Cache key for a statement: sha256 of the PDF bytes and the parser version.
+    """
+    digest = hashlib.sha256(data)
+    digest.update(b"\0parser-version:" + str(version).encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    LRU cache of (bank, transactions) on disk, capped at `max_bytes`.
+    `hits` and `misses` count lookups made through this instance.
+    """
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key, ext):
+        return os.path.join(self.directory, f"{key}{ext}")
+
+    def get(self, key):
+        """
+        Returns (bank, df) for a cached statement or None on a miss.
+        `df` is None when the bank could not be detected.
+        """
+        entry = self.lookup(key)
+        return None if entry is None else entry[:2]
+
+    def lookup(self, key):
+        """
+        Like get, but returns (bank, df, meta); `meta` also has the
+        statement's page counts ("pages", "pages_skipped") when they were
+        stored with it, else None for them.
+        """
+        meta_path = self._path(key, ".json")
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            df = None
+            if meta["bank"] is not None:
+                import pandas as pd
+
+                df = pd.read_parquet(self._path(key, ".parquet"))
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+
+        # Touch the entry so eviction sees it as recently used
+        for ext in (".json", ".parquet"):
+            try:
+                os.utime(self._path(key, ext))
+            except OSError:
+                pass
+        self.hits += 1
+        return meta["bank"], df, dict(meta, pages=meta.get("pages"), pages_skipped=meta.get("pages_skipped"))
+
+    def put(self, key, bank, df, pages=None, pages_skipped=None):
+        """
+        Stores a result, with the statement's page counts if given, then
+        evicts old entries if the cache is over its cap.
+        Files are written to a temp name and renamed, so concurrent readers
+        (other workers, other app sessions) never see half-written entries.
+        """
+        if bank is not None:
+            self._atomic_write(key, ".parquet", lambda path: df.to_parquet(path, index=False))
+
+        meta = {"bank": bank, "rows": 0 if df is None else len(df), "pages": pages,
+                "pages_skipped": pages_skipped, "parser_version": PARSER_VERSION}
+        def write_meta(path):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(meta, f)
+        self._atomic_write(key, ".json", write_meta)
+        self.evict()
+
+    def _atomic_write(self, key, ext, write):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        os.close(fd)
+        try:
+            write(tmp_path)
+            os.replace(tmp_path, self._path(key, ext))
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def evict(self):
+        """
+        Deletes least recently used entries until the cache fits in max_bytes.
+        Only files named like an entry count; anything else in the directory
+        is left alone.
+        """
+        entries = {}
+        for name in os.listdir(self.directory):
+            match = ENTRY_NAME.match(name)
+            if match is None:
+                continue
+            key = match.group(1)
+            try:
+                st = os.stat(os.path.join(self.directory, name))
+            except FileNotFoundError:
+                continue
+            size, last_used = entries.get(key, (0, 0.0))
+            entries[key] = (size + st.st_size, max(last_used, st.st_mtime))
+
+        total = sum(size for size, _ in entries.values())
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_bytes:
+                break
+            for ext in (".json", ".parquet"):
+                try:
+                    os.remove(self._path(key, ext))
+                except FileNotFoundError:
+                    pass
+            total -= size
+
+    def stats(self):
+        """
+        Hit/miss counters for this instance.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
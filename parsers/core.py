@@ -0,0 +1,113 @@
+"""
+Headless parsing core.
+
+Everything needed to detect and parse a statement without the Streamlit UI:
+`detect_bank`, `PARSER_MAP` / `STREAM_MAP` (from parsers/engine.py) and
+`parse_pdf` for the common open -> detect -> parse path. The batch runner,
+sharding, ingestion, the HTTP service and the benchmarks import from here,
+so worker processes never load streamlit.
+
+Nothing in the core talks to a UI. Results come back as return values, and
+diagnostics (fallbacks, empty statements) go to the `logging` module.
+pdfplumber, pandas, numpy and pdfminer are only imported by the functions
+that need them, so importing the core (e.g. for `--help`, or in a process
+that unpickles a task) stays cheap.
+"""
+import io
+import logging
+import os
+import pathlib
+
+from parsers.document import Document
+from parsers.engine import PARSER_MAP, STREAM_MAP, transactions_frame
+from parsers.fingerprint import CONFIDENCE_THRESHOLD, fingerprint_bank
+from parsers.memory import LOW_MEMORY, map_file
+from parsers.profiling import count, stage
+
+logger = logging.getLogger(__name__)
+
+
+def detect_bank(pdf):
+    """
+    Robust bank detection (FIXED)
+    First tries the cheap fingerprint (metadata and raw characters). Only
+    when that is ambiguous does it extract text from the first 2 pages to
+    find keywords.
+    """
+    with stage("fingerprint"):
+        bank, confidence = fingerprint_bank(pdf)
+    if confidence >= CONFIDENCE_THRESHOLD:
+        return bank
+    count("fingerprint_fallbacks")
+    logger.debug("Fingerprint inconclusive (%s, %.2f); extracting text", bank, confidence)
+
+    full_text = ""
+    num_pages_to_check = min(len(pdf.pages), 2) # Check first 2 pages
+
+    for i in range(num_pages_to_check):
+        page = pdf.pages[i]
+        # Use default extraction (no tolerances) for compressed PDFs
+        text = page.extract_text() 
+        if text:
+            full_text += text.lower()
+    
+    # --- Axis Bank Check (NEW, more robust) ---
+    if ("axis bank" in full_text or "axisbank" in full_text) and \
+       ("my zone credit card" in full_text or "ambika shekhawat" in full_text or "axis edge" in full_text or "45145700" in full_text):
+        return "AXIS"
+
+    # --- ICICI Bank Check ---
+    if "icici bank" in full_text:
+        if "amazon pay" in full_text or "amazonpaycc@icicibank.com" in full_text:
+            return "ICICI_AMAZON"
+        if "coral" in full_text or "4375" in full_text: 
+            return "ICICI_CORAL"
+        return "ICICI_CORAL" # Default ICICI
+
+    # --- HDFC Bank Check ---
+    if "hdfc bank" in full_text:
+        return "HDFC"
+        
+    # --- IDFC Bank Check ---
+    if "idfc first" in full_text or "idfc first\n bank" in full_text:
+        return "IDFC"
+        
+    return None
+
+def open_pdf(source, low_memory=None):
+    """
+    Opens a path, raw PDF bytes or a binary file object (or mmap) with
+    pdfplumber. In low-memory mode a path is memory-mapped rather than read
+    through a buffered file; the map is closed with the PDF.
+    """
+    import pdfplumber
+
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    elif (LOW_MEMORY if low_memory is None else low_memory) and isinstance(source, (str, os.PathLike)):
+        stream = map_file(source)
+        if stream is not None:
+            return pdfplumber.PDF(stream, path=pathlib.Path(source), stream_is_external=False)
+    return pdfplumber.open(source)
+
+def parse_pdf(source, bank=None, low_memory=None, memory_budget_mb=None, duplicates=None):
+    """
+    Opens, detects and parses one statement. Returns (bank, df); df is None
+    when the bank could not be detected. With `duplicates` (a
+    parsers.duplicates.DuplicateIndex) df also gets the Fingerprint,
+    Duplicate and DuplicateOf columns from checking it against that index.
+    """
+    with open_pdf(source, low_memory) as pdf:
+        pdf = Document(pdf, low_memory, memory_budget_mb)
+        if bank is None:
+            with stage("detect_bank"):
+                bank = detect_bank(pdf)
+        if bank is None:
+            logger.warning("Could not determine the bank of the statement")
+            return None, None
+        with stage("parse"):
+            df = PARSER_MAP[bank](pdf)
+    if duplicates is not None:
+        with stage("duplicates"):
+            df = duplicates.check(bank, df)
+    return bank, df
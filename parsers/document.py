@@ -0,0 +1,125 @@
+"""
+Memoized page extraction shared by detection and the parsers.
+
+`detect_bank` and the bank parsers both read the first pages of a statement.
+Wrapping the open pdfplumber PDF in a `Document` means each page's text,
+words and tables are computed at most once per set of extraction settings,
+however many times they are asked for.
+
+The wrapped objects look like pdfplumber's PDF/Page to the parsers, so no
+parser needs to know whether it got a Document or a plain PDF. Returned
+values are shared between callers and must be treated as read-only.
+
+In low-memory mode (parsers/memory.py) the parsers hand each page back with
+`Document.release(page)` once they are done with it, which drops its memo
+and pdfplumber's cached objects, and checks the memory budget.
+"""
+from parsers.memory import LOW_MEMORY, MEMORY_BUDGET_MB, check_budget
+from parsers.profiling import count, stage
+
+
+def _freeze(value):
+    """
+    Turns settings values (lists, dicts) into something hashable.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def settings_key(kind, settings):
+    """
+    Memo key for one kind of extraction ("text", "words", "tables", "chars",
+    "lines") with the given keyword/table settings.
+    """
+    return (kind, _freeze(settings or {}))
+
+
+class MemoPage:
+    """
+    A pdfplumber page whose text, words and tables are computed lazily and
+    remembered, as are the pdfminer glyph tuples and text lines of
+    parsers/fastpath.py. Everything else (chars, crop, width, ...) is passed
+    through.
+    """
+    def __init__(self, page, document=None):
+        self._page = page
+        self._document = document
+        self._memo = {}
+
+    def _cached(self, key, compute):
+        if key in self._memo:
+            if self._document is not None:
+                self._document.memo_hits += 1
+            count("memo_hits")
+            return self._memo[key]
+        if self._document is not None:
+            self._document.extractions += 1
+        with stage(f"extract_{key[0]}"):
+            result = compute()
+        self._memo[key] = result
+        return result
+
+    def extract_text(self, **kwargs):
+        return self._cached(settings_key("text", kwargs), lambda: self._page.extract_text(**kwargs))
+
+    def extract_words(self, **kwargs):
+        return self._cached(settings_key("words", kwargs), lambda: self._page.extract_words(**kwargs))
+
+    def extract_tables(self, table_settings=None):
+        return self._cached(settings_key("tables", table_settings), lambda: self._page.extract_tables(table_settings))
+
+    def text_chars(self):
+        from parsers.fastpath import chars
+
+        return self._cached(settings_key("chars", None), lambda: chars(self._page))
+
+    def text_lines(self, bbox=None):
+        from parsers.fastpath import text_lines
+
+        return self._cached(settings_key("lines", {"bbox": bbox}), lambda: text_lines(self.text_chars(), bbox))
+
+    def close(self):
+        """
+        Forgets the memo and pdfplumber's cached objects for this page.
+        Anything asked for afterwards is extracted again.
+        """
+        self._memo.clear()
+        close = getattr(self._page, "close", None)
+        if close is not None:
+            close()
+
+    def __getattr__(self, name):
+        return getattr(self._page, name)
+
+
+class Document:
+    """
+    Wraps an open pdfplumber PDF (or anything with `.pages`) so every page
+    is a MemoPage. `extractions` and `memo_hits` count real vs. reused work,
+    and `pages_done` the pages the parser has released (is done with).
+    `low_memory` and `memory_budget_mb` default to the environment settings.
+    """
+    def __init__(self, pdf, low_memory=None, memory_budget_mb=None):
+        self._pdf = pdf
+        self.extractions = 0
+        self.memo_hits = 0
+        self.pages_done = 0
+        self.low_memory = LOW_MEMORY if low_memory is None else low_memory
+        self.memory_budget_mb = MEMORY_BUDGET_MB if memory_budget_mb is None else memory_budget_mb
+        self.pages = [MemoPage(page, self) for page in pdf.pages]
+
+    def release(self, page):
+        """
+        Called by the parsers when they are done with a page: closes it in
+        low-memory mode, then checks the memory budget.
+        """
+        self.pages_done += 1
+        if self.low_memory:
+            page.close()
+            count("pages_released")
+        check_budget(self.memory_budget_mb, f" after page {page.page_number}")
+
+    def __getattr__(self, name):
+        return getattr(self._pdf, name)
@@ -0,0 +1,280 @@
+"""
+Duplicate and overlap detection across statements.
+
+Usage:
+    python -m parsers.duplicates check statements/*.pdf --index duplicates.sqlite --card 4375
+    python -m parsers.duplicates add statements/*.pdf --index duplicates.sqlite --card 4375
+
+Consecutive statement cycles overlap, and the same statement gets
+downloaded twice. Every transaction gets a fingerprint, a 64-bit hash of
+
+    bank, card id, ISO date, amount in paise, normalized description, n
+
+where the normalized description is the merchant from parsers/merchants.py
+(the canonical name for known merchants, the cleaned description without
+its trailing reference numbers otherwise) and n counts earlier rows of the
+same statement with the same other fields. Two identical coffees on the same
+day are two fingerprints, and a statement that repeats both matches both.
+
+Fingerprints of indexed statements live in a SQLite hash index, so checking
+a new statement is one indexed lookup per row, however long the history:
+
+    exact   the fingerprint is already indexed from another statement
+    near    same bank, card, date and amount as an unmatched indexed row whose
+            description is at least NEAR_DUPLICATE_RATIO similar
+            ("SWIGGY BANGALORE" vs "SWIGGY BANGALORE IN")
+
+`check` returns the statement's frame with Fingerprint, Duplicate ("exact",
+"near" or None), DuplicateOf (the earlier statement's source, or its key)
+and DuplicateKey (its key) columns. Each indexed row is matched at most once
+per check.
+"""
+import argparse
+import difflib
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+
+from parsers.merchants import clean_text, default_normalizer
+from parsers.spending import frame_key, iso_date
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS statements (
+    key TEXT PRIMARY KEY,
+    bank TEXT NOT NULL,
+    card_id TEXT NOT NULL,
+    source TEXT,
+    rows INTEGER NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS fingerprints (
+    fingerprint INTEGER NOT NULL,
+    statement TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    loose INTEGER NOT NULL,
+    description TEXT NOT NULL,
+    PRIMARY KEY (fingerprint, statement, row)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS fingerprints_loose ON fingerprints (loose);
+CREATE INDEX IF NOT EXISTS fingerprints_statement ON fingerprints (statement);
+"""
+
+DEFAULT_INDEX_PATH = os.environ.get(
+    "PDF_PARSER_DUPLICATE_INDEX", os.path.join(os.path.expanduser("~"), ".cache", "pdf-parser", "duplicates.sqlite")
+)
+# Minimum difflib ratio between cleaned descriptions for a near duplicate
+NEAR_DUPLICATE_RATIO = 0.8
+# Fingerprints per IN (...) lookup, under SQLite's host parameter limit
+LOOKUP_CHUNK = 500
+
+
+def _hash64(*fields):
+    """
+    Signed 64-bit hash of the fields, so it fits a SQLite INTEGER.
+    """
+    digest = hashlib.blake2b("\0".join(map(str, fields)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+def fingerprints(bank, transactions, card_id=None, normalizer=None):
+    """
+    (fingerprint, loose key, cleaned description) for each transaction (a
+    list of Date/Description/Amount dicts). The loose key leaves out the
+    description and the repeat count, for near-duplicate lookups.
+    """
+    normalizer = normalizer or default_normalizer()
+    card_id = card_id or ""
+    descriptions = [txn["Description"] for txn in transactions]
+    merchants = normalizer.classify(descriptions)
+    seen = {}
+    result = []
+    for txn, description, (merchant, _) in zip(transactions, descriptions, merchants):
+        date, paise = iso_date(txn["Date"]), int(txn["Amount"])
+        fields = (bank, card_id, date, paise, merchant)
+        repeat = seen[fields] = seen.get(fields, -1) + 1
+        result.append((_hash64(*fields, repeat), _hash64(bank, card_id, date, paise), clean_text(description)))
+    return result
+
+
+class DuplicateIndex:
+    """
+    The SQLite hash index of transaction fingerprints.
+    """
+    def __init__(self, path=DEFAULT_INDEX_PATH, near_ratio=NEAR_DUPLICATE_RATIO, normalizer=None):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.near_ratio = near_ratio
+        self.normalizer = normalizer
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def has(self, key):
+        return self.db.execute("SELECT 1 FROM statements WHERE key = ?", (key,)).fetchone() is not None
+
+    def _lookup(self, column, values, key):
+        """
+        {value: [(statement, row, description), ...]} for the indexed rows of
+        other statements whose `column` is one of `values`.
+        """
+        found = {}
+        values = list(dict.fromkeys(values))
+        for start in range(0, len(values), LOOKUP_CHUNK):
+            chunk = values[start:start + LOOKUP_CHUNK]
+            for row in self.db.execute(
+                f"SELECT {column}, statement, row, description FROM fingerprints "
+                f"WHERE {column} IN ({', '.join('?' * len(chunk))}) AND statement != ? ORDER BY statement, row",
+                (*chunk, key),
+            ):
+                found.setdefault(row[0], []).append((row[1], row[2], row[3]))
+        return found
+
+    def _sources(self, keys):
+        sources = {}
+        for key in keys:
+            row = self.db.execute("SELECT source FROM statements WHERE key = ?", (key,)).fetchone()
+            sources[key] = (row[0] if row else None) or key
+        return sources
+
+    def match(self, bank, transactions, card_id=None, key=None):
+        """
+        Matches a statement against the index. Returns (prints, matches):
+        the rows' fingerprints and, per row, None or (kind, statement key).
+        """
+        if hasattr(transactions, "to_dict"):
+            transactions = transactions.to_dict("records")
+        key = key or frame_key(bank, card_id or "", transactions)
+        prints = fingerprints(bank, transactions, card_id, self.normalizer)
+        matches = [None] * len(prints)
+        claimed = set()
+
+        exact = self._lookup("fingerprint", [fingerprint for fingerprint, _, _ in prints], key)
+        for i, (fingerprint, _, _) in enumerate(prints):
+            for statement, row, _ in exact.get(fingerprint, ()):
+                if (statement, row) not in claimed:
+                    claimed.add((statement, row))
+                    matches[i] = ("exact", statement)
+                    break
+
+        unmatched = [i for i, found in enumerate(matches) if found is None]
+        near = self._lookup("loose", [prints[i][1] for i in unmatched], key)
+        for i in unmatched:
+            _, loose, description = prints[i]
+            for statement, row, other in near.get(loose, ()):
+                if (statement, row) in claimed:
+                    continue
+                if difflib.SequenceMatcher(None, description, other).ratio() >= self.near_ratio:
+                    claimed.add((statement, row))
+                    matches[i] = ("near", statement)
+                    break
+        return prints, matches
+
+    def check(self, bank, df, card_id=None, key=None):
+        """
+        A copy of a parser's frame with Fingerprint, Duplicate, DuplicateOf
+        and DuplicateKey columns.
+        """
+        prints, matches = self.match(bank, df, card_id, key)
+        sources = self._sources({found[1] for found in matches if found})
+        df = df.copy()
+        df["Fingerprint"] = [f"{fingerprint & 0xFFFFFFFFFFFFFFFF:016x}" for fingerprint, _, _ in prints]
+        df["Duplicate"] = [found[0] if found else None for found in matches]
+        df["DuplicateOf"] = [sources[found[1]] if found else None for found in matches]
+        df["DuplicateKey"] = [found[1] if found else None for found in matches]
+        return df
+
+    def add_statement(self, bank, transactions, card_id=None, key=None, source=None):
+        """
+        Indexes a statement's fingerprints. Returns the number of rows added:
+        0 if a statement with the same key is already indexed.
+        """
+        if hasattr(transactions, "to_dict"):
+            transactions = transactions.to_dict("records")
+        card_id = card_id or ""
+        key = key or frame_key(bank, card_id, transactions)
+        if self.has(key):
+            return 0
+        prints = fingerprints(bank, transactions, card_id, self.normalizer)
+        with self.db:
+            self.db.execute(
+                "INSERT INTO statements (key, bank, card_id, source, rows, added_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, bank, card_id, source, len(prints), time.time()),
+            )
+            self.db.executemany(
+                "INSERT INTO fingerprints VALUES (?, ?, ?, ?, ?)",
+                [(fingerprint, key, row, loose, description)
+                 for row, (fingerprint, loose, description) in enumerate(prints)],
+            )
+        return len(prints)
+
+    def remove_statement(self, key):
+        with self.db:
+            removed = self.db.execute("DELETE FROM fingerprints WHERE statement = ?", (key,)).rowcount
+            self.db.execute("DELETE FROM statements WHERE key = ?", (key,))
+        return removed
+
+    def summary(self):
+        row = self.db.execute("SELECT COUNT(*) AS statements, COALESCE(SUM(rows), 0) AS txns FROM statements").fetchone()
+        return dict(row)
+
+
+def overlaps(df):
+    """
+    {earlier statement: (exact, near)} row counts for a checked frame.
+    """
+    counts = {}
+    for kind, statement in zip(df["Duplicate"].tolist(), df["DuplicateOf"].tolist()):
+        if isinstance(kind, str):
+            exact, near = counts.get(statement, (0, 0))
+            counts[statement] = (exact + 1, near) if kind == "exact" else (exact, near + 1)
+    return counts
+
+
+def main(argv=None):
+    from parsers.core import parse_pdf
+    from parsers.ingest import file_hash
+
+    parser = argparse.ArgumentParser(description="Find transactions already seen in earlier statements.")
+    parser.add_argument("command", choices=["check", "add"], help="check only reports; add also indexes each statement")
+    parser.add_argument("pdfs", nargs="+")
+    parser.add_argument("-i", "--index", default=DEFAULT_INDEX_PATH, help="SQLite index path (default: %(default)s)")
+    parser.add_argument("--card", default=None, help="Card id for these statements")
+    parser.add_argument("-o", "--output", default=None, help="check: write the checked rows of all files to this CSV")
+    args = parser.parse_args(argv)
+
+    index = DuplicateIndex(args.index)
+    frames = []
+    try:
+        for path in args.pdfs:
+            key = file_hash(path)
+            bank, df = parse_pdf(path)
+            if bank is None:
+                print(f"unknown_bank    {path}", file=sys.stderr)
+                continue
+            start = time.perf_counter()
+            checked = index.check(bank, df, args.card, key)
+            elapsed = time.perf_counter() - start
+            found = overlaps(checked)
+            print(f"{path}: {len(df)} transactions, {sum(sum(pair) for pair in found.values())} seen before "
+                  f"({elapsed * 1000:.1f} ms)")
+            for statement, (exact, near) in found.items():
+                print(f"    {exact:>5} exact, {near:>5} near    {statement}")
+            if args.command == "add":
+                index.add_statement(bank, df, args.card, key=key, source=path)
+            frames.append(checked.assign(File=path))
+    finally:
+        index.close()
+
+    if args.output and frames:
+        import pandas as pd
+
+        pd.concat(frames, ignore_index=True).to_csv(args.output, index=False)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,526 @@
+"""
+Declarative parser engine.
+
+Every bank is described as data in SPECS instead of a hand-written loop:
+one spec per extraction strategy, in order of preference. Text banks list
+the text strategy first, as the cheapest; ICICI_AMAZON, which prints its
+transactions as a table, lists the table first, since a text line loses
+the rest of a description that wraps onto the next line. HDFC is read from
+its tables only, as its hand-written parser was. Each page is parsed with
+the first strategy whose result passes validation; see parsers/strategy.py.
+
+    strategy            "text" (regex over the page's text lines) or "table"
+                        (rows from extract_tables)
+
+  text banks:
+    backend             where the lines come from: "pdfplumber" (the default,
+                        extract_text) or "pdfminer" (the same lines straight
+                        from pdfminer, without pdfplumber's char objects; see
+                        parsers/fastpath.py)
+    patterns            line regexes, tried in order; groups 1-3 are
+                        date, description and amount. A pattern can also be
+                        {"regex", "fields"}, with `fields` naming its groups
+                        in order, to also capture the bank's own category
+                        column as "BankCategory"
+    exclude             keywords that rule a line out before matching
+    skip_descriptions   matched rows whose description contains one of
+                        these are headers, not transactions
+
+  table banks:
+    table_settings      pdfplumber table settings for the full page
+    layouts             tried by row length: the first layout whose
+                        min_columns fits the row is used. `fields` maps
+                        Date/Description/Amount to column indexes; `date`
+                        is "strict" (the whole cell is a date) or "search"
+                        (a date anywhere in the cell). A layout with a
+                        `header` instead maps the fields to column names,
+                        looked up in each table's first row; tables without
+                        those columns are skipped
+    exclude, skip_descriptions   as above (exclude checks the description)
+
+Banks with a BankCategory field get one on every transaction (None for
+lines whose pattern has no category group). It is the raw text between the
+description and the amount; parsers/merchants.py maps it to a category.
+
+`compile_spec` turns a spec into one combined matcher per bank, built once:
+all of a bank's patterns become a single alternation (first pattern wins,
+as before), and only lines starting with a digit reach the matcher at all,
+since every transaction line starts with its DD/MM/YYYY date.
+
+The patterns match the same lines, with the same (stripped) groups, as the
+hand-written parsers' regexes, minus backtracking that can never succeed:
+amounts and reward points are possessive (`++`), a description followed
+by a single amount token is greedy (only one split fits), and Axis'
+category is the whole letters-and-spaces run before the amount.
+benchmarks/line_cost.py checks the output against the old loops.
+"""
+import logging
+import re
+import time
+from functools import partial
+
+from parsers.base_parser import normalize_transactions
+from parsers.fastpath import ENABLED as FAST_TEXT_ENABLED
+from parsers.fastpath import page_chars, page_lines
+from parsers.prefilter import transaction_pages
+from parsers.profiling import count, stage, timed_pages
+from parsers.strategy import Chooser, validate
+from parsers.templates import ENABLED as TEMPLATES_ENABLED
+from parsers.templates import TABLE_SETTINGS, dated_lines, registry, transaction_bbox, transaction_region, transaction_tables
+
+logger = logging.getLogger(__name__)
+
+TRANSACTION_FIELDS = ["Date", "Description", "Amount"]
+# A normalized transaction's fields (plus BankCategory for banks with one)
+FRAME_FIELDS = TRANSACTION_FIELDS + ["Invalid"]
+
+SPECS = {
+    "HDFC": {
+        "table": {
+            "strategy": "table",
+            "table_settings": TABLE_SETTINGS["HDFC"],
+            "layouts": [
+                {"min_columns": 3, "fields": {"Date": 0, "Description": 1, "Amount": 2}, "date": "strict"},
+            ],
+            "skip_descriptions": ["Transaction Description"],
+        },
+    },
+    "ICICI_CORAL": {
+        "text": {
+            "strategy": "text",
+            "backend": "pdfminer",
+            "patterns": [
+                # Date, Ref, Description, (Junk), Amount
+                r'(\d{2}/\d{2}/\d{4})\s+\S+\s+(.+?)\s.*\s([\d,\.]++\s*+CR|[\d,\.]++)$',
+            ],
+            "skip_descriptions": ["Transaction Details"],
+        },
+        "table": {
+            "strategy": "table",
+            "table_settings": None,
+            "layouts": [
+                {"header": {"Date": "Date", "Description": "Transaction Details", "Amount": "Amount (int)"},
+                 "date": "strict"},
+            ],
+        },
+    },
+    "ICICI_AMAZON": {
+        "table": {
+            "strategy": "table",
+            "table_settings": TABLE_SETTINGS["ICICI_AMAZON"],
+            "layouts": [
+                {"min_columns": 5, "fields": {"Date": 0, "Description": 2, "Amount": 4}, "date": "strict"},
+                {"min_columns": 3, "fields": {"Date": 0, "Description": 1, "Amount": 2}, "date": "search"},
+            ],
+            "skip_descriptions": ["Transaction Details"],
+        },
+        "text": {
+            "strategy": "text",
+            "backend": "pdfminer",
+            "patterns": [
+                # Date, Ref, Description, Reward points, Amount
+                r'(\d{2}/\d{2}/\d{4})\s+\S+\s+(.+?)\s+-?\d++\s+([\d,\.]++\s*+CR|[\d,\.]++)$',
+            ],
+            "skip_descriptions": ["Transaction Details"],
+        },
+    },
+    "AXIS": {
+        "text": {
+            "strategy": "text",
+            "backend": "pdfminer",
+            "patterns": [
+                # Date, Description, Category, Amount
+                {"regex": r'(\d{2}/\d{2}/\d{4})\s+(.+?)\s([A-Za-z\s]{2,}+)(?<=\s)([\d,\.]++\s*+(?:Cr|Dr))$',
+                 "fields": ["Date", "Description", "BankCategory", "Amount"]},
+                # Date, Description, Amount (no category, for "INTERNET PAYMENT")
+                r'(\d{2}/\d{2}/\d{4})\s+(INTERNET PAYMENT.+)\s([\d,\.]++\s*+(?:Cr|Dr))$',
+            ],
+        },
+        "table": {
+            "strategy": "table",
+            "table_settings": None,
+            "layouts": [
+                {"min_columns": 4, "fields": {"Date": 0, "Description": 1, "Amount": 3}, "date": "strict"},
+            ],
+        },
+    },
+    "IDFC": {
+        "text": {
+            "strategy": "text",
+            "backend": "pdfminer",
+            "patterns": [
+                # Date, Description, Amount
+                r'(\d{2}/\d{2}/\d{4})\s+(.+)\s([\d,\.]++\s*+CR|[\d,\.]++)$',
+            ],
+            # EMI amortization schedule and tax lines also start with a date
+            "exclude": ["Amortization", "IGST", "Interest charges"],
+        },
+        "table": {
+            "strategy": "table",
+            "table_settings": None,
+            "layouts": [
+                {"min_columns": 4, "fields": {"Date": 0, "Description": 1, "Amount": 3}, "date": "strict"},
+            ],
+            "exclude": ["Amortization", "IGST", "Interest charges"],
+        },
+    },
+}
+
+DATE_STRICT = re.compile(r'^\d{2}/\d{2}/\d{4}$')
+DATE_SEARCH = re.compile(r'(\d{2}/\d{2}/\d{4})')
+# An amount as the statements print it: digits and commas with two
+# decimals, maybe followed by Cr/Dr. A candidate line ends in one (a line
+# ending in a date or a page number doesn't), a table row has one in a cell.
+AMOUNT_TAIL = re.compile(r'\s[\d,]*\d\.\d\d\s*(?:cr|dr)?$', re.IGNORECASE)
+AMOUNT_CELL = re.compile(r'[\d,]*\d\.\d\d\s*(?:cr|dr)?', re.IGNORECASE)
+
+
+def _keywords(words):
+    """
+    A "contains any of these keywords" check, or None without any, for
+    `candidates`; the matching loops test the keyword tuples inline. Plain
+    substring tests: a regex alternation of the keywords costs several
+    times as much per line.
+    """
+    if not words:
+        return None
+    words = tuple(words)
+    if len(words) == 1:
+        word = words[0]
+        return lambda text: word in text
+
+    def contains(text):
+        for word in words:
+            if word in text:
+                return True
+        return False
+    return contains
+
+def compile_spec(spec):
+    """
+    Precompiles a bank spec. For text banks the patterns are joined into one
+    alternation; `branches` maps each group index that can end a match
+    (`match.lastindex`) to the (date, description, amount) group numbers
+    of the pattern it belongs to, plus a category group for banks that
+    capture one. A pattern without a category points at another pattern's
+    category group, which can't take part in its match and so reads None.
+    Keywords are kept as tuples, checked inline by the matching loops.
+    """
+    compiled = dict(spec)
+    compiled["skip_words"] = tuple(spec.get("skip_descriptions") or ())
+    compiled["exclude_words"] = tuple(spec.get("exclude") or ())
+    if spec["strategy"] == "text":
+        patterns = [p if isinstance(p, dict) else {"regex": p, "fields": TRANSACTION_FIELDS} for p in spec["patterns"]]
+        compiled["category"] = any("BankCategory" in p["fields"] for p in patterns)
+        parts, numbered, offset = [], [], 0
+        for pattern in patterns:
+            groups = re.compile(pattern["regex"]).groups
+            parts.append(f"(?:{pattern['regex']})" if len(patterns) > 1 else pattern["regex"])
+            numbered.append((offset, groups, {field: offset + i for i, field in enumerate(pattern["fields"], 1)}))
+            offset += groups
+        spare = next((numbers["BankCategory"] for _, _, numbers in numbered if "BankCategory" in numbers), None)
+        branches = {}
+        for offset, groups, numbers in numbered:
+            wanted = (numbers["Date"], numbers["Description"], numbers["Amount"])
+            if compiled["category"]:
+                wanted += (numbers.get("BankCategory", spare),)
+            for index in range(offset + 1, offset + groups + 1):
+                branches[index] = wanted
+        compiled["fast"] = FAST_TEXT_ENABLED and spec.get("backend", "pdfplumber") == "pdfminer"
+        compiled["matcher"] = re.compile("|".join(parts))
+        compiled["branches"] = branches
+        # m.groups() is the (date, description, amount) triple as-is
+        compiled["plain"] = len(patterns) == 1 and pattern["fields"] == TRANSACTION_FIELDS
+    else:
+        compiled["header"] = None
+        compiled["layouts"] = []
+        for layout in spec["layouts"]:
+            if "header" in layout:
+                # table_rows puts the named columns first, in field order
+                compiled["header"] = tuple(layout["header"][field] for field in TRANSACTION_FIELDS)
+                compiled["layouts"].append((3, 0, 1, 2, layout["date"] == "strict"))
+            else:
+                compiled["layouts"].append(
+                    (layout["min_columns"], layout["fields"]["Date"], layout["fields"]["Description"],
+                     layout["fields"]["Amount"], layout["date"] == "strict")
+                )
+        # Row width -> (date, description, amount, strict) of the first layout
+        # that fits, or None; rows wider than the last entry use the last one
+        widest = max(layout[0] for layout in compiled["layouts"])
+        compiled["by_width"] = tuple(
+            next((layout[1:] for layout in compiled["layouts"] if width >= layout[0]), None)
+            for width in range(widest + 1)
+        )
+        # Skipped and excluded rows are both decided by the description
+        compiled["description_words"] = compiled["skip_words"] + compiled["exclude_words"]
+    compiled["exclude"] = _keywords(spec.get("exclude"))
+    return compiled
+
+# bank id -> strategy name -> compiled spec, in order of preference
+COMPILED = {bank: {name: compile_spec(spec) for name, spec in strategies.items()} for bank, strategies in SPECS.items()}
+
+# One-character strings; an empty line's "" is not in it
+DIGITS = frozenset("0123456789")
+
+
+def match_lines(compiled, lines):
+    """
+    Runs a compiled text spec over text lines. Returns raw transactions
+    (Amount still a string).
+    """
+    match = compiled["matcher"].match
+    branches = compiled["branches"]
+    plain = compiled["plain"]
+    category = compiled["category"]
+    exclude = compiled["exclude_words"]
+    skip = compiled["skip_words"]
+    # Most specs have one keyword, checked without a loop
+    single = skip[0] if len(skip) == 1 else None
+
+    transactions = []
+    append = transactions.append
+    for line in lines:
+        # Every transaction line starts with its date
+        if line[:1] not in DIGITS:
+            continue
+        # Excluded lines are ruled out before the (dearer) match
+        if exclude:
+            for word in exclude:
+                if word in line:
+                    break
+            else:
+                word = None
+            if word is not None:
+                continue
+        m = match(line)
+        if m is None:
+            continue
+        if plain:
+            date, description, amount = m.groups()
+        elif category:
+            date, description, amount, bank_category = m.group(*branches[m.lastindex])
+        else:
+            date, description, amount = m.group(*branches[m.lastindex])
+        description = description.strip()
+        if single is not None:
+            if single in description:
+                continue
+        elif skip:
+            for word in skip:
+                if word in description:
+                    break
+            else:
+                word = None
+            if word is not None:
+                continue
+        if category:
+            if bank_category is not None:
+                bank_category = bank_category.strip()
+            append({"Date": date, "Description": description, "Amount": amount, "BankCategory": bank_category})
+        else:
+            append({"Date": date, "Description": description, "Amount": amount})
+    return transactions
+
+def match_rows(compiled, rows):
+    """
+    Runs a compiled table spec over table rows. Returns raw transactions.
+    """
+    by_width = compiled["by_width"]
+    widest = len(by_width) - 1
+    words = compiled["description_words"]
+    # Most specs have one keyword, checked without a loop
+    single = words[0] if len(words) == 1 else None
+    search = DATE_SEARCH.search
+
+    transactions = []
+    append = transactions.append
+    for row in rows:
+        if not row:
+            continue
+        width = len(row)
+        layout = by_width[width if width < widest else widest]
+        if layout is None:
+            continue
+        date_index, description_index, amount_index, is_strict = layout
+
+        if is_strict:
+            # DATE_STRICT without the regex call: DD/MM/YYYY, digits
+            # (isdecimal is \d) around the two slashes
+            date = str(row[date_index]).strip()
+            if not (len(date) == 10 and date[2] == date[5] == "/" and date.replace("/", "", 2).isdecimal()):
+                continue
+        else:
+            found = search(str(row[date_index]))
+            if found is None:
+                continue
+            date = found.group(1)
+
+        # A missing or empty cell is no transaction (the hand-written
+        # parsers dropped such rows); only a present amount that doesn't
+        # parse is kept and flagged Invalid
+        description = row[description_index]
+        amount = row[amount_index]
+        if description is None or amount is None:
+            continue
+        description = str(description)
+        amount = str(amount).strip()
+        if not description or not amount:
+            continue
+        if single is not None:
+            if single in description:
+                continue
+        elif words:
+            for word in words:
+                if word in description:
+                    break
+            else:
+                word = None
+            if word is not None:
+                continue
+        if "\n" in description:
+            description = description.replace("\n", " ")
+        append({"Date": date, "Description": description, "Amount": amount})
+    return transactions
+
+
+def table_rows(compiled, tables):
+    """
+    The rows of a page's tables. For a spec with a header layout, only tables
+    with the named columns are kept, their columns reordered to
+    Date/Description/Amount and the header row dropped.
+    """
+    header = compiled["header"]
+    for table in tables:
+        if not table:
+            continue
+        if header is None:
+            yield from table
+            continue
+        names = [str(name).strip() for name in table[0]]
+        if not all(name in names for name in header):
+            continue
+        indexes = [names.index(name) for name in header]
+        for row in table[1:]:
+            yield [row[i] for i in indexes]
+
+def candidates(compiled, items):
+    """
+    (dated, candidates) for one strategy's view of a page: how many text
+    lines or table rows start with a date, and how many of those also have
+    an amount (at the end of the line, or in a cell after the date) and
+    aren't excluded. Validation compares the matched rows against
+    `candidates`.
+    """
+    exclude = compiled["exclude"]
+    if compiled["strategy"] == "text":
+        dated = [line for line in items if line[:1] in DIGITS and DATE_STRICT.match(line[:10])]
+        amounts = [line for line in dated if AMOUNT_TAIL.search(line)]
+    else:
+        search = DATE_SEARCH.search
+        cell = AMOUNT_CELL.fullmatch
+        rows = [row for row in items if row and row[0] is not None and search(str(row[0])[:16])]
+        dated = rows
+        amounts = [" ".join(str(value) for value in row if value) for row in rows
+                   if any(value is not None and cell(str(value).strip()) for value in row[1:])]
+    if exclude is None:
+        return len(dated), len(amounts)
+    return len(dated), sum(1 for text in amounts if not exclude(text))
+
+def extract(page, bank, compiled):
+    """
+    Runs one strategy over a page. Returns (raw transactions, dated, candidates).
+    """
+    if compiled["strategy"] == "text":
+        if compiled["fast"]:
+            lines = page_lines(page, transaction_bbox(page, bank, page_chars))
+        else:
+            text = transaction_region(page, bank).extract_text() or ""
+            lines = text.split('\n')
+        count("lines_scanned", len(lines))
+        with stage("regex"):
+            transactions = match_lines(compiled, lines)
+        count("regex_hits", len(transactions))
+        return (transactions, *candidates(compiled, lines))
+    tables = transaction_tables(page, bank, compiled["table_settings"])
+    count("tables_found", len(tables))
+    rows = list(table_rows(compiled, tables))
+    return (match_rows(compiled, rows), *candidates(compiled, rows))
+
+def glyphs(strategies):
+    """
+    How the prefilter and template checks should read a page's chars:
+    parsers.fastpath.page_chars when the bank's first strategy reads lines
+    from pdfminer (so the page never needs pdfplumber's char objects), else
+    None for page.chars, which the first strategy builds anyway.
+    """
+    first = next(iter(strategies.values()))
+    return page_chars if first.get("fast") else None
+
+def parse_page(page, bank, strategies, chooser, chars=None):
+    """
+    One page's normalized batch, from the first strategy (in the chooser's
+    order) whose batch validates. If none does, the attempt with the most
+    rows is kept. `chars` is passed on to dated_lines.
+    """
+    attempts, fallbacks, seconds = [], [], {}
+    for name in chooser.order():
+        start = time.perf_counter()
+        raw, dated, seen = extract(page, bank, strategies[name])
+        batch = normalize_transactions(raw)
+        reason = validate(raw, batch, dated, seen, lambda: bool(dated_lines(page, chars)))
+        seconds[name] = time.perf_counter() - start
+        if reason is None:
+            chooser.record(name, fallbacks, seconds)
+            return batch
+        fallbacks.append((name, reason))
+        attempts.append((len(batch), name, batch))
+    _, name, batch = max(attempts, key=lambda attempt: attempt[0])
+    chooser.record(name, fallbacks, seconds)
+    return batch
+
+def iter_transactions(pdf, bank):
+    """
+    Yields one normalized batch of transactions per page for `bank`.
+    """
+    strategies = COMPILED[bank]
+    chooser = Chooser(bank, strategies, registry().get(bank) if TEMPLATES_ENABLED else None)
+    chars = glyphs(strategies)
+    # Documents release each page once its batch has been consumed
+    release = getattr(pdf, "release", None)
+    try:
+        for page in timed_pages(transaction_pages(pdf.pages, release, chars)):
+            yield parse_page(page, bank, strategies, chooser, chars)
+            if release is not None:
+                release(page)
+    finally:
+        chooser.finish()
+
+def transactions_frame(batches):
+    """
+    Collects a stream of per-page transaction batches into one DataFrame:
+    Date as datetime64[s] (NaT where Invalid), Amount as int64 paise.
+    Zero amounts are already dropped by the parsers.
+    """
+    import pandas as pd
+
+    transactions = [txn for batch in batches for txn in batch]
+    with stage("dataframe"):
+        frame = pd.DataFrame(transactions, columns=FRAME_FIELDS if not transactions else None)
+        frame["Date"] = pd.to_datetime(frame["Date"]).astype("datetime64[s]")
+        return frame.astype({"Amount": "int64", "Invalid": bool})
+
+def parse_transactions(pdf, bank):
+    """
+    Parses a whole statement for `bank` into a Date/Description/Amount/Invalid
+    frame (see transactions_frame).
+    An empty result is logged as a warning (the layout may be unexpected).
+    """
+    df = transactions_frame(iter_transactions(pdf, bank))
+    if df.empty:
+        logger.warning("Could not find any transactions in the %s statement", bank)
+    return df
+
+# bank id -> pdf -> DataFrame, and bank id -> pdf -> per-page batches.
+# functools.partial keeps them picklable for the process pools.
+PARSER_MAP = {bank: partial(parse_transactions, bank=bank) for bank in SPECS}
+STREAM_MAP = {bank: partial(iter_transactions, bank=bank) for bank in SPECS}
@@ -0,0 +1,223 @@
+"""
+Text lines straight from pdfminer, for the text strategies.
+
+`page.extract_text()` costs more than the regexes it feeds: pdfminer builds
+an LTChar per glyph (plus curves, rects and figures), pdfplumber turns each
+one into a dict of some twenty attributes, and the text layout then runs
+over those dicts. The text strategies only need the lines.
+
+`chars(page)` runs the page's content stream through pdfminer's interpreter
+with a device that keeps one small tuple per glyph
+
+    (text, x0, x1, top, bottom, upright)
+
+in pdfplumber's page coordinates, computed exactly as LTChar and
+pdfplumber do, and ignores paths and images. `text_lines(chars)` is
+pdfplumber's default extract_text() layout (word splitting and line
+clustering with x_tolerance=3 and y_tolerance=3, ligatures expanded) over
+those tuples, so `"\\n".join(text_lines(chars(page)))` is the page's
+extract_text(), character for character. `bbox` keeps only the chars
+fully inside it, like templates' page.filter region does.
+
+A text spec picks this backend with `"backend": "pdfminer"` (see SPECS in
+parsers/engine.py); the prefilter and template checks then read the same
+tuples, so a page of such a bank never builds pdfplumber char dicts. Set
+PDF_PARSER_FAST_TEXT=0 to use pdfplumber for every bank (e.g. to compare
+timings); `python -m benchmarks.fast_text` checks both give the same lines.
+"""
+import os
+import unicodedata
+from itertools import groupby
+from operator import itemgetter
+
+ENABLED = os.environ.get("PDF_PARSER_FAST_TEXT", "1") != "0"
+
+# pdfplumber's extract_text() defaults
+X_TOLERANCE = 3
+Y_TOLERANCE = 3
+LIGATURES = {
+    "ﬀ": "ff",
+    "ﬃ": "ffi",
+    "ﬄ": "ffl",
+    "ﬁ": "fi",
+    "ﬂ": "fl",
+    "ﬆ": "st",
+    "ﬅ": "st",
+}
+
+TEXT, X0, X1, TOP, BOTTOM, UPRIGHT = range(6)
+
+_collector = None
+
+
+def _collector_class():
+    """
+    The pdfminer device, defined on first use so importing this module
+    doesn't import pdfminer.
+    """
+    global _collector
+    if _collector is not None:
+        return _collector
+
+    from pdfminer.pdfdevice import PDFTextDevice
+    from pdfminer.pdffont import PDFUnicodeNotDefined
+    from pdfminer.utils import apply_matrix_rect
+
+    class CharCollector(PDFTextDevice):
+        """
+        Records each rendered glyph as a tuple, with LTChar's bounding box
+        arithmetic, and nothing else.
+        """
+        def __init__(self, rsrcmgr, height, mb_x0, mb_top, unicode_norm=None):
+            PDFTextDevice.__init__(self, rsrcmgr)
+            self.height = height
+            self.mb_x0 = mb_x0
+            self.mb_top = mb_top
+            self.unicode_norm = unicode_norm
+            self.chars = []
+
+        def render_char(self, matrix, font, fontsize, scaling, rise, cid, ncs, graphicstate):
+            try:
+                text = font.to_unichr(cid)
+            except PDFUnicodeNotDefined:
+                text = f"(cid:{cid})"
+            adv = font.char_width(cid) * fontsize * scaling
+            if font.is_vertical():
+                vx, vy = font.char_disp(cid)
+                vx = fontsize * 0.5 if vx is None else vx * fontsize * 0.001
+                vy = (1000 - vy) * fontsize * 0.001
+                bbox = (-vx, vy + rise + adv, -vx + fontsize, vy + rise)
+            else:
+                descent = font.get_descent() * fontsize
+                bbox = (0, descent + rise, adv, descent + rise + fontsize)
+            a, b, c, d, e, f = matrix
+            if b == 0 and c == 0:
+                # Unrotated, unskewed text: apply_matrix_rect's arithmetic
+                # without its four corner points
+                left, right = a * bbox[0] + e, a * bbox[2] + e
+                bottom, top = d * bbox[1] + f, d * bbox[3] + f
+                x0, x1 = (left, right) if left <= right else (right, left)
+                y0, y1 = (bottom, top) if bottom <= top else (top, bottom)
+            else:
+                x0, y0, x1, y1 = apply_matrix_rect(matrix, bbox)
+            if self.mb_x0 != 0:
+                x0, x1 = x0 + self.mb_x0, x1 + self.mb_x0
+            if self.unicode_norm is not None:
+                text = unicodedata.normalize(self.unicode_norm, text)
+            self.chars.append((
+                text, x0, x1,
+                (self.height - y1) + self.mb_top,
+                (self.height - y0) + self.mb_top,
+                a * d * scaling > 0 and b * c <= 0,
+            ))
+            return adv
+
+    _collector = CharCollector
+    return _collector
+
+def chars(page):
+    """
+    The page's glyphs as (text, x0, x1, top, bottom, upright) tuples, in
+    content-stream order (the order of page.chars). `page` is a pdfplumber
+    page, or anything passing its attributes through; for a derived
+    (cropped or filtered) page, the chars of the page it came from.
+    """
+    from pdfminer.pdfinterp import PDFPageInterpreter
+    from pdfplumber.utils.exceptions import PdfminerException
+
+    root = page.root_page
+    mb_x0, mb_top, _, mb_bottom = root.mediabox
+    device = _collector_class()(root.pdf.rsrcmgr, mb_bottom - mb_top, mb_x0, mb_top, root.pdf.unicode_norm)
+    try:
+        PDFPageInterpreter(root.pdf.rsrcmgr, device).process_page(root.page_obj)
+    except Exception as e:
+        raise PdfminerException(e)
+    return device.chars
+
+def page_chars(page):
+    """
+    chars(page), memoized when the page is a parsers.document.MemoPage.
+    """
+    memoized = getattr(page, "text_chars", None)
+    return memoized() if memoized is not None else chars(page)
+
+
+def _begins_new_word(prev, char, upright):
+    """
+    pdfplumber's WordExtractor.char_begins_new_word for left-to-right
+    (upright) and top-to-bottom (rotated) text.
+    """
+    if upright:
+        return char[X0] < prev[X0] or char[X0] > prev[X1] + X_TOLERANCE or abs(char[TOP] - prev[TOP]) > Y_TOLERANCE
+    return char[TOP] < prev[TOP] or char[TOP] > prev[BOTTOM] + Y_TOLERANCE or abs(char[X0] - prev[X0]) > X_TOLERANCE
+
+def _words(chars):
+    """
+    (text, top) per word, in pdfplumber's word order: runs of upright or
+    rotated chars, each clustered into lines and split into words.
+    """
+    from pdfplumber.utils import cluster_objects
+
+    def word(current):
+        return "".join(LIGATURES.get(c[TEXT], c[TEXT]) for c in current), min(c[TOP] for c in current)
+
+    words = []
+    for upright, run in groupby(chars, key=itemgetter(UPRIGHT)):
+        if upright:
+            lines = cluster_objects(list(run), itemgetter(TOP), Y_TOLERANCE)
+            order = itemgetter(X0)
+        else:
+            lines = cluster_objects(list(run), itemgetter(X0), X_TOLERANCE)
+            order = itemgetter(TOP, BOTTOM)
+        for line in lines:
+            line.sort(key=order)
+            current = []
+            for char in line:
+                text = char[TEXT]
+                if text.isspace():
+                    if current:
+                        words.append(word(current))
+                    current = []
+                elif text == "":
+                    # An empty glyph is a word of its own, as in pdfplumber
+                    if current:
+                        words.append(word(current))
+                    words.append(word([char]))
+                    current = []
+                elif current and _begins_new_word(current[-1], char, upright):
+                    words.append(word(current))
+                    current = [char]
+                else:
+                    current.append(char)
+            if current:
+                words.append(word(current))
+    return words
+
+def text_lines(chars, bbox=None):
+    """
+    The text lines pdfplumber's extract_text() gives for these chars (no
+    lines for no chars). With `bbox` (x0, top, x1, bottom), only chars
+    fully inside it are read.
+    """
+    if bbox is not None:
+        x0, top, x1, bottom = bbox
+        chars = [c for c in chars if c[X0] >= x0 and c[X1] <= x1 and c[TOP] >= top and c[BOTTOM] <= bottom]
+    if not chars:
+        return []
+    from pdfplumber.utils import cluster_objects
+
+    lines = []
+    for line in cluster_objects(_words(chars), itemgetter(1), Y_TOLERANCE, preserve_order=True):
+        # An empty word gets no space before the next one, as in pdfplumber
+        text = ""
+        for word, _ in line:
+            text = f"{text} {word}" if text else word
+        lines.append(text)
+    return lines
+
+def page_lines(page, bbox=None):
+    """
+    text_lines for a page, memoized when the page is a MemoPage.
+    """
+    memoized = getattr(page, "text_lines", None)
+    return memoized(bbox) if memoized is not None else text_lines(chars(page), bbox)
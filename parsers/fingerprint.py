@@ -0,0 +1,156 @@
+"""
+Cheap bank fingerprinting.
+
+Full `extract_text()` runs pdfplumber's layout analysis, which is the slow
+part of detection. This module tries cheaper signals first:
+
+1. Document metadata (title, author, producer, ...), which costs nothing.
+2. Literal strings pulled straight out of the first pages' content streams,
+   without running pdfminer's interpreter. Works for ordinary fonts;
+   subset/CID fonts just produce no matches.
+3. The character stream and font names of the first pages from
+   `page.chars`, one page at a time, with no line/word clustering. The char
+   objects are cached on the page, so the parser reuses them afterwards.
+
+All keyword signatures (bank names, product names and the card-number
+prefixes) are matched in one pass. Whitespace is stripped before matching,
+since the raw character stream does not reliably contain spaces.
+Each stage returns a bank and a confidence; `detect_bank` only falls back
+to full text extraction when the confidence is too low.
+"""
+import re
+
+
+def compile_keywords(keywords):
+    """
+    Compiles a list of keywords into one regex that finds all of them in a
+    single pass over the text. Matches may overlap (e.g. "icicibank" inside
+    "amazonpaycc@icicibank.com"); at any one position the longest keyword wins.
+    """
+    ordered = sorted(set(keywords), key=len, reverse=True)
+    return re.compile("(?=(" + "|".join(re.escape(k) for k in ordered) + "))")
+
+def find_keywords(matcher, text):
+    """
+    Returns the set of keywords from `compile_keywords` that occur in text.
+    """
+    return {m.group(1) for m in matcher.finditer(text)}
+
+# Bank name signatures (whitespace removed, lowercase)
+BANK_NAMES = {
+    "axisbank": "AXIS",
+    "icicibank": "ICICI",
+    "hdfcbank": "HDFC",
+    "idfcfirst": "IDFC",
+}
+
+# Product / card signatures that pick a specific parser
+AXIS_PRODUCTS = ["myzonecreditcard", "ambikashekhawat", "axisedge", "45145700"]
+ICICI_AMAZON_PRODUCTS = ["amazonpay", "amazonpaycc@icicibank.com"]
+ICICI_CORAL_PRODUCTS = ["coral", "4375"]
+
+SIGNATURES = compile_keywords(
+    list(BANK_NAMES) + AXIS_PRODUCTS + ICICI_AMAZON_PRODUCTS + ICICI_CORAL_PRODUCTS
+)
+
+# detect_bank trusts a fingerprint at or above this confidence
+CONFIDENCE_THRESHOLD = 0.9
+
+METADATA_FIELDS = ["Title", "Subject", "Author", "Creator", "Producer", "Keywords"]
+
+_whitespace = re.compile(r"\s+")
+# (string) operands in a content stream, allowing escaped characters
+_literal = re.compile(rb"\(((?:\\.|[^\\)])*)\)", re.DOTALL)
+_escape = re.compile(rb"\\(.)", re.DOTALL)
+
+
+def classify(found):
+    """
+    Applies detect_bank's rules to a set of matched signatures.
+    Returns (bank, confidence).
+
+    Confidence is high when exactly one bank is named and the product is
+    pinned down; it drops when several banks are named (e.g. a payment from
+    another bank's account) or when ICICI has to fall back to its default.
+    """
+    banks_named = {BANK_NAMES[k] for k in found if k in BANK_NAMES}
+    if not banks_named:
+        return None, 0.0
+
+    confidence = 0.95 if len(banks_named) == 1 else 0.6
+
+    if "AXIS" in banks_named and any(k in found for k in AXIS_PRODUCTS):
+        return "AXIS", confidence
+
+    if "ICICI" in banks_named:
+        if any(k in found for k in ICICI_AMAZON_PRODUCTS):
+            return "ICICI_AMAZON", confidence
+        if any(k in found for k in ICICI_CORAL_PRODUCTS):
+            return "ICICI_CORAL", confidence
+        return "ICICI_CORAL", min(confidence, 0.6) # Default ICICI
+
+    if "HDFC" in banks_named:
+        return "HDFC", confidence
+
+    if "IDFC" in banks_named:
+        return "IDFC", confidence
+
+    # Only "axis bank" without a known Axis product: detect_bank says None
+    return None, 0.5
+
+def signatures_in(text):
+    """
+    Matches every signature against text in one pass.
+    """
+    return find_keywords(SIGNATURES, _whitespace.sub("", text.lower()))
+
+def metadata_text(pdf):
+    metadata = getattr(pdf, "metadata", None) or {}
+    return " ".join(str(metadata.get(field, "")) for field in METADATA_FIELDS)
+
+def content_stream_text(page):
+    """
+    Text operands of a page's raw content streams, decoded as Latin-1.
+    """
+    from pdfminer.pdftypes import resolve1
+
+    page_obj = getattr(page, "page_obj", None)
+    if page_obj is None:
+        return ""
+    parts = []
+    try:
+        for stream in page_obj.contents:
+            data = resolve1(stream).get_data()
+            parts.extend(_escape.sub(rb"\1", m.group(1)) for m in _literal.finditer(data))
+    except Exception:
+        # Unusual or broken streams: leave it to the later stages
+        return ""
+    return b" ".join(parts).decode("latin-1")
+
+def char_stream_text(page):
+    """
+    Raw characters and font names of one page, in content-stream order.
+    """
+    chars = page.chars
+    fonts = " ".join({c.get("fontname", "") for c in chars})
+    return "".join(c["text"] for c in chars) + " " + fonts
+
+def fingerprint_bank(pdf, num_pages=2):
+    """
+    Tries the cheap signals in order of cost and stops as soon as one is
+    confident. Returns (bank, confidence); later stages also see everything
+    earlier stages matched.
+    """
+    pages = pdf.pages[:num_pages]
+    stages = [lambda: metadata_text(pdf)]
+    stages += [lambda: " ".join(content_stream_text(page) for page in pages)]
+    stages += [lambda page=page: char_stream_text(page) for page in pages]
+
+    found = set()
+    bank, confidence = None, 0.0
+    for stage in stages:
+        found |= signatures_in(stage())
+        bank, confidence = classify(found)
+        if confidence >= CONFIDENCE_THRESHOLD:
+            break
+    return bank, confidence
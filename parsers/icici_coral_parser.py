@@ -1,36 +1,15 @@
-import pandas as pd
-from parsers.base_parser import clean_amount
+from parsers.engine import iter_transactions, parse_transactions
 
-def parse(pdf):
+# The ICICI Coral Credit Card parser is declared in parsers/engine.py (SPECS["ICICI_CORAL"]).
+
+def iter_rows(pdf):
     """
-    Parses the ICICI Coral Credit Card statement.
+    Parses the ICICI Coral Credit Card statement, one batch of transactions per page.
     """
-    transactions = []
-    
-    for page in pdf.pages:
-        tables = page.extract_tables()
-        for table in tables:
-            # Assume first row is header
-            if not table:
-                continue
-                
-            df = pd.DataFrame(table[1:], columns=table[0])
-            
-            # Check if this is the transaction table
-            if 'Transaction Details' in df.columns and 'Amount (int)' in df.columns:
-                
-                df = df[['Date', 'Transaction Details', 'Amount (int)']].dropna()
-
-                for _, row in df.iterrows():
-                    # The "Amount (int)" column has 'CR' for credits
-                    amount = clean_amount(row['Amount (int)'])
-                    
-                    transactions.append({
-                        "Date": row['Date'],
-                        "Description": row['Transaction Details'],
-                        "Amount": amount
-                    })
+    return iter_transactions(pdf, "ICICI_CORAL")
 
-    final_df = pd.DataFrame(transactions)
-    final_df = final_df[final_df['Amount'] != 0.0].reset_index(drop=True)
-    return final_df
\ No newline at end of file
+def parse(pdf):
+    """
+    Collects iter_rows into a DataFrame.
+    """
+    return parse_transactions(pdf, "ICICI_CORAL")
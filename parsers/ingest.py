@@ -0,0 +1,315 @@
+"""
+Incremental archive ingestion.
+
+Usage:
+    python -m parsers.ingest archive/ --manifest archive.sqlite --workers 8
+    python -m parsers.ingest inbox/ --manifest archive.sqlite --watch --interval 30
+
+A SQLite manifest records every statement that has been ingested: its path,
+size, mtime, content hash, detected bank, PARSER_VERSION, status, page and
+row counts and parse time. The parsed transactions are stored alongside in
+the same database.
+
+A rerun only parses files that are new, whose content changed, or that were
+parsed by an older PARSER_VERSION:
+
+- same path, size and mtime as the manifest: skipped without reading it
+- size or mtime changed but the hash is the same: mtime updated, skipped
+- same content already ingested under another path: transactions copied
+- same content as another new file in this run: parsed once, then copied
+- failed with this PARSER_VERSION and unchanged: skipped (--retry-errors
+  parses such files again)
+
+so a nightly run costs time proportional to the new files, not the archive.
+With --watch the folder is polled and new drops are ingested as they
+arrive; a file is only picked up once it hasn't been modified for
+--settle seconds, so half-copied files are left for the next poll.
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from parsers import PARSER_VERSION
+from parsers.base_parser import iso_day
+from parsers.batch import find_pdfs, process_file
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    sha256 TEXT NOT NULL,
+    bank TEXT,
+    parser_version TEXT NOT NULL,
+    status TEXT NOT NULL,
+    pages INTEGER,
+    rows INTEGER,
+    seconds REAL,
+    error TEXT,
+    ingested_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS files_sha256 ON files (sha256, parser_version);
+CREATE TABLE IF NOT EXISTS transactions (
+    path TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    bank TEXT,
+    date TEXT,
+    description TEXT,
+    amount INTEGER,  -- paise
+    invalid INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (path, row)
+);
+"""
+
+FILE_FIELDS = ["path", "size", "mtime", "sha256", "bank", "parser_version", "status",
+               "pages", "rows", "seconds", "error", "ingested_at"]
+
+
+def file_hash(path):
+    """
+    sha256 of a file's contents, read in chunks.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Manifest:
+    """
+    The SQLite manifest of ingested files and their transactions.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+        columns = [row["name"] for row in self.db.execute("PRAGMA table_info(transactions)")]
+        if "invalid" not in columns:
+            # Manifests from before the flag was stored: flag the rows the
+            # parser couldn't have emitted valid (no date or a zero amount)
+            with self.db:
+                self.db.execute("ALTER TABLE transactions ADD COLUMN invalid INTEGER NOT NULL DEFAULT 0")
+                self.db.execute("UPDATE transactions SET invalid = date IS NULL OR amount = 0")
+
+    def get(self, path):
+        row = self.db.execute("SELECT * FROM files WHERE path = ?", (path,)).fetchone()
+        return dict(row) if row else None
+
+    def find_hash(self, sha256, version):
+        """
+        An ok entry with this content and parser version, under any path.
+        """
+        row = self.db.execute(
+            "SELECT * FROM files WHERE sha256 = ? AND parser_version = ? AND status != 'error' LIMIT 1",
+            (sha256, version),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def paths(self):
+        return [row[0] for row in self.db.execute("SELECT path FROM files")]
+
+    def transactions(self, path):
+        """
+        A file's transactions in the parsers' Date/Description/Amount/Invalid
+        layout, Date as YYYY-MM-DD and Invalid as the parser flagged it.
+        """
+        return [dict(row, Invalid=bool(row["Invalid"])) for row in self.db.execute(
+            "SELECT date AS Date, description AS Description, CAST(amount AS INTEGER) AS Amount, "
+            "invalid AS Invalid FROM transactions WHERE path = ? ORDER BY row", (path,)
+        )]
+
+    def record(self, entry, transactions):
+        """
+        Replaces a file's manifest row and transactions in one transaction.
+        """
+        with self.db:
+            self.db.execute("DELETE FROM transactions WHERE path = ?", (entry["path"],))
+            self.db.executemany(
+                "INSERT INTO transactions (path, row, bank, date, description, amount, invalid) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(entry["path"], i, entry["bank"], iso_day(txn["Date"]), txn["Description"], txn["Amount"],
+                  bool(txn["Invalid"])) for i, txn in enumerate(transactions)],
+            )
+            self.db.execute(
+                f"INSERT OR REPLACE INTO files ({', '.join(FILE_FIELDS)}) VALUES ({', '.join('?' * len(FILE_FIELDS))})",
+                [entry.get(field) for field in FILE_FIELDS],
+            )
+
+    def touch(self, path, size, mtime):
+        with self.db:
+            self.db.execute("UPDATE files SET size = ?, mtime = ? WHERE path = ?", (size, mtime, path))
+
+    def remove(self, path):
+        with self.db:
+            self.db.execute("DELETE FROM transactions WHERE path = ?", (path,))
+            self.db.execute("DELETE FROM files WHERE path = ?", (path,))
+
+    def close(self):
+        self.db.close()
+
+
+def plan(manifest, paths, version=PARSER_VERSION, settle=0.0, retry_errors=False):
+    """
+    Splits the paths into work to do. Returns (todo, copies, counts):
+    `todo` is a list of (path, size, mtime, sha256) to parse, `copies` a list
+    of (path, size, mtime, sha256, source path) whose content is already in
+    the manifest, or first in `todo`, under another path. Files that failed
+    with this version are skipped like ok ones unless `retry_errors`.
+    """
+    todo, copies = [], []
+    counts = {"unchanged": 0, "touched": 0, "settling": 0, "errors": 0}
+    # sha256 -> path of the file in `todo` with that content
+    first = {}
+    now = time.time()
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            continue
+        if now - stat.st_mtime < settle:
+            counts["settling"] += 1
+            continue
+
+        entry = manifest.get(path)
+        current = entry is not None and entry["parser_version"] == version and (
+            entry["status"] != "error" or not retry_errors)
+        if current and entry["size"] == stat.st_size and entry["mtime"] == stat.st_mtime:
+            counts["errors" if entry["status"] == "error" else "unchanged"] += 1
+            continue
+
+        sha256 = file_hash(path)
+        if current and entry["sha256"] == sha256:
+            manifest.touch(path, stat.st_size, stat.st_mtime)
+            counts["errors" if entry["status"] == "error" else "touched"] += 1
+            continue
+
+        existing = manifest.find_hash(sha256, version)
+        if existing is not None and existing["path"] != path:
+            copies.append((path, stat.st_size, stat.st_mtime, sha256, existing["path"]))
+        elif sha256 in first:
+            copies.append((path, stat.st_size, stat.st_mtime, sha256, first[sha256]))
+        else:
+            first[sha256] = path
+            todo.append((path, stat.st_size, stat.st_mtime, sha256))
+    return todo, copies, counts
+
+def _entry(path, size, mtime, sha256, version, status):
+    return {
+        "path": path, "size": size, "mtime": mtime, "sha256": sha256,
+        "bank": status["Bank"], "parser_version": version, "status": status["Status"],
+        "pages": status["Pages"], "rows": status["Rows"], "seconds": status["Seconds"],
+        "error": status["Error"], "ingested_at": time.time(),
+    }
+
+def ingest(folder, manifest, workers=None, version=PARSER_VERSION, settle=0.0, prune=False, retry_errors=False, log=None):
+    """
+    Ingests the new and changed statements under `folder` into the manifest.
+    Returns a summary dict.
+    """
+    log = log or (lambda message: print(message, file=sys.stderr))
+    start = time.perf_counter()
+    paths = find_pdfs(folder)
+    todo, copies, counts = plan(manifest, paths, version, settle, retry_errors)
+    summary = dict(counts, scanned=len(paths), parsed=0, copied=0, failed=0, rows=0, removed=0)
+
+    def done(item, status, transactions):
+        manifest.record(_entry(*item, version, status), transactions)
+        summary["parsed"] += 1
+        summary["rows"] += status["Rows"]
+        if status["Status"] == "error":
+            summary["failed"] += 1
+        log(f"{status['Status']:<16}{item[0]}")
+
+    if workers == 1 or len(todo) <= 1:
+        for item in todo:
+            done(item, *process_file(item[0]))
+    elif todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(process_file, item[0]): item for item in todo}
+            for future in as_completed(futures):
+                done(futures[future], *future.result())
+
+    # After parsing, so a copy of a file parsed in this run finds its entry
+    for path, size, mtime, sha256, source in copies:
+        existing = manifest.get(source)
+        transactions = manifest.transactions(source)
+        status = {"Bank": existing["bank"], "Status": existing["status"], "Pages": existing["pages"],
+                  "Rows": len(transactions), "Seconds": 0.0, "Error": existing["error"]}
+        manifest.record(_entry(path, size, mtime, sha256, version, status), transactions)
+        summary["copied"] += 1
+        summary["rows"] += len(transactions)
+        if status["Status"] == "error":
+            summary["failed"] += 1
+        log(f"copied          {path} (same content as {source})")
+
+    if prune:
+        present = set(paths)
+        for path in manifest.paths():
+            if path not in present and path.startswith(os.path.join(folder, "")) and not os.path.exists(path):
+                manifest.remove(path)
+                summary["removed"] += 1
+
+    summary["seconds"] = round(time.perf_counter() - start, 3)
+    return summary
+
+def watch(folder, manifest, workers=None, interval=10.0, settle=5.0, prune=False, retry_errors=False):
+    """
+    Polls the folder every `interval` seconds, ingesting new drops, until
+    interrupted. `retry_errors` applies to the first poll only, so a file
+    that keeps failing isn't parsed on every poll.
+    """
+    print(f"Watching {folder} every {interval}s (Ctrl+C to stop)", file=sys.stderr)
+    while True:
+        summary = ingest(folder, manifest, workers, settle=settle, prune=prune, retry_errors=retry_errors)
+        retry_errors = False
+        if summary["parsed"] or summary["copied"] or summary["removed"]:
+            print(_describe(summary), file=sys.stderr)
+        time.sleep(interval)
+
+def _describe(summary):
+    return (
+        f"Scanned {summary['scanned']} files: {summary['parsed']} parsed, {summary['copied']} copied, "
+        f"{summary['unchanged'] + summary['touched']} unchanged, {summary['failed']} failed, "
+        f"{summary['errors']} failed before (skipped), "
+        f"{summary['removed']} removed, {summary['rows']} transactions in {summary['seconds']}s"
+    )
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest new or changed statements into a SQLite manifest.")
+    parser.add_argument("folder", help="Archive folder to scan (recursively) for PDF statements")
+    parser.add_argument("-m", "--manifest", default="manifest.sqlite", help="SQLite manifest path")
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="Number of worker processes (default: all cores)")
+    parser.add_argument("--watch", action="store_true", help="Keep polling the folder for new files")
+    parser.add_argument("--interval", type=float, default=10.0, help="Seconds between polls in watch mode")
+    parser.add_argument("--settle", type=float, default=None,
+                        help="Skip files modified less than this many seconds ago (default: 5 in watch mode, else 0)")
+    parser.add_argument("--prune", action="store_true",
+                        help="Drop manifest entries for files that no longer exist under the folder")
+    parser.add_argument("--retry-errors", action="store_true",
+                        help="Parse files that failed with this parser version again (skipped by default)")
+    args = parser.parse_args(argv)
+
+    folder = os.path.abspath(args.folder)
+    manifest = Manifest(args.manifest)
+    try:
+        if args.watch:
+            settle = 5.0 if args.settle is None else args.settle
+            watch(folder, manifest, args.workers, args.interval, settle, args.prune, args.retry_errors)
+        else:
+            print(_describe(ingest(folder, manifest, args.workers, settle=args.settle or 0.0, prune=args.prune,
+                                   retry_errors=args.retry_errors)), file=sys.stderr)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        manifest.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
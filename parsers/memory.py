@@ -0,0 +1,92 @@
+"""
+Low-memory mode for very large statements.
+
+pdfplumber keeps every page's parsed objects (chars, rects, layout) alive
+until the PDF is closed, so RSS grows with the page count: about 2.4 MB per
+synthetic page, ~600 MB for a 200-page statement. In low-memory mode
+
+- a Document releases each page's extraction memo and pdfplumber caches as
+  soon as the parser is done with it (the page is re-read if asked for
+  again), so peak RSS stays roughly flat as the page count grows;
+- file-backed input is memory-mapped instead of read into a bytes copy;
+- RSS is checked against a budget after every page, and a statement that
+  goes over it fails with MemoryBudgetExceeded instead of taking the worker
+  (or the machine) down with it.
+
+    PDF_PARSER_LOW_MEMORY=1           turn low-memory mode on
+    PDF_PARSER_MEMORY_BUDGET_MB=512   peak RSS budget (checked with or without
+                                      low-memory mode)
+"""
+import gc
+import mmap
+import os
+import resource
+import sys
+from contextlib import contextmanager
+
+LOW_MEMORY = os.environ.get("PDF_PARSER_LOW_MEMORY", "0") == "1"
+MEMORY_BUDGET_MB = float(os.environ.get("PDF_PARSER_MEMORY_BUDGET_MB", "0")) or None
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """
+    The process went over its memory budget while parsing a statement.
+    """
+
+
+def rss_mb():
+    """
+    Current resident set size of this process in MB. Falls back to the peak
+    RSS where /proc is not available.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident = int(f.read().split()[1])
+        return resident * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux reports KB, macOS reports bytes
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def check_budget(budget_mb, where=""):
+    """
+    Raises MemoryBudgetExceeded if RSS is over `budget_mb` (None: no budget),
+    after one garbage collection to give released pages a chance to go.
+    """
+    if not budget_mb:
+        return
+    if rss_mb() <= budget_mb:
+        return
+    gc.collect()
+    current = rss_mb()
+    if current > budget_mb:
+        raise MemoryBudgetExceeded(f"RSS {current:.0f} MB is over the {budget_mb:.0f} MB budget{where}")
+
+def map_file(path):
+    """
+    A read-only memory map of a file, or None for an empty file (which
+    cannot be mapped). The map is file-like (read/seek/tell) and supports
+    the buffer protocol, so it can be hashed and handed to pdfplumber.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        # The map keeps its own reference to the file; f can be closed
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+@contextmanager
+def read_input(path, low_memory=None):
+    """
+    The contents of a statement file: a memory map in low-memory mode,
+    otherwise (or for an empty file) the bytes.
+    """
+    low_memory = LOW_MEMORY if low_memory is None else low_memory
+    data = map_file(path) if low_memory else None
+    if data is None:
+        with open(path, "rb") as f:
+            yield f.read()
+        return
+    try:
+        yield data
+    finally:
+        data.close()
@@ -0,0 +1,280 @@
+"""
+Merchant normalization and categorization.
+
+Usage:
+    python -m parsers.merchants "AMAZON PAY INDIA PRIVATE L BANGALORE" "INTERNET PAYMENT 3769"
+    python -m parsers.merchants --csv transactions.csv --output categorized.csv
+
+Raw descriptions ("AMAZON PAY INDIA PRIVATE L BANGALORE", "SWIGGY
+BANGALORE", "INTERNET PAYMENT 3769") are mapped to a canonical merchant and
+a category using the keyword dictionaries below.
+
+All keywords are compiled into one regex built from a trie of the keywords,
+so keywords that share a prefix share the work. It gives an Aho-Corasick
+style single pass over each description that runs in the C regex engine,
+instead of one test per keyword. The leftmost keyword wins, and the longest
+one at that position ("AMAZON PAY" over "AMAZON").
+
+Descriptions repeat heavily across statements, so results are memoized per
+(description, bank category). `classify` works on a whole column at once
+and only matches each distinct string once.
+
+A bank's own category column (BankCategory, see parsers/engine.py) takes
+precedence when it maps to a known category. Otherwise the merchant's
+category is used, and unknown merchants are DEFAULT_CATEGORY.
+"""
+import argparse
+import re
+import sys
+
+DEFAULT_CATEGORY = "Uncategorized"
+
+# Canonical merchant -> (category, keywords found in raw descriptions)
+MERCHANTS = {
+    "Amazon": ("Shopping", ["AMAZON", "AMZN", "AMAZON RETAIL", "AMAZON SELLER SERVICES"]),
+    "Amazon Pay": ("Shopping", ["AMAZON PAY", "AMAZONPAY", "AMAZON PAY INDIA"]),
+    "Amazon Prime": ("Entertainment", ["AMAZON PRIME", "PRIME VIDEO"]),
+    "Flipkart": ("Shopping", ["FLIPKART", "FKRT"]),
+    "Myntra": ("Shopping", ["MYNTRA"]),
+    "Ajio": ("Shopping", ["AJIO"]),
+    "Nykaa": ("Shopping", ["NYKAA"]),
+    "Meesho": ("Shopping", ["MEESHO"]),
+    "Reliance Trends": ("Shopping", ["RELIANCE TRENDS"]),
+    "Croma": ("Shopping", ["CROMA"]),
+    "Swiggy": ("Food & Dining", ["SWIGGY", "BUNDL TECHNOLOGIES"]),
+    "Zomato": ("Food & Dining", ["ZOMATO"]),
+    "Dominos": ("Food & Dining", ["DOMINOS", "JUBILANT FOODWORKS"]),
+    "McDonald's": ("Food & Dining", ["MCDONALDS", "HARDCASTLE RESTAURANTS"]),
+    "Starbucks": ("Food & Dining", ["STARBUCKS", "TATA STARBUCKS"]),
+    "BigBasket": ("Groceries", ["BIGBASKET", "BIG BASKET", "SUPERMARKET GROCERY SUPPLIES"]),
+    "Blinkit": ("Groceries", ["BLINKIT", "GROFERS"]),
+    "Zepto": ("Groceries", ["ZEPTO", "KIRANAKART"]),
+    "DMart": ("Groceries", ["DMART", "AVENUE SUPERMARTS"]),
+    "More": ("Groceries", ["MORE RETAIL"]),
+    "Uber": ("Travel", ["UBER", "UBER INDIA SYSTEMS"]),
+    "Ola": ("Travel", ["OLA", "OLACABS", "ANI TECHNOLOGIES"]),
+    "Rapido": ("Travel", ["RAPIDO", "ROPPEN TRANSPORTATION"]),
+    "IRCTC": ("Travel", ["IRCTC"]),
+    "MakeMyTrip": ("Travel", ["MAKEMYTRIP", "MAKE MY TRIP", "MMT"]),
+    "Goibibo": ("Travel", ["GOIBIBO", "IBIBO"]),
+    "IndiGo": ("Travel", ["INDIGO", "INTERGLOBE AVIATION"]),
+    "Air India": ("Travel", ["AIR INDIA"]),
+    "Indian Oil": ("Fuel", ["INDIAN OIL", "IOCL"]),
+    "Bharat Petroleum": ("Fuel", ["BHARAT PETROLEUM", "BPCL"]),
+    "Hindustan Petroleum": ("Fuel", ["HINDUSTAN PETROLEUM", "HPCL"]),
+    "Shell": ("Fuel", ["SHELL"]),
+    "Netflix": ("Entertainment", ["NETFLIX"]),
+    "Spotify": ("Entertainment", ["SPOTIFY"]),
+    "BookMyShow": ("Entertainment", ["BOOKMYSHOW", "BIGTREE ENTERTAINMENT"]),
+    "PVR INOX": ("Entertainment", ["PVR", "INOX"]),
+    "Disney+ Hotstar": ("Entertainment", ["HOTSTAR", "NOVI DIGITAL"]),
+    "Apple": ("Entertainment", ["APPLE COM BILL", "APPLE SERVICES", "ITUNES"]),
+    "Google": ("Entertainment", ["GOOGLE PLAY", "GOOGLE SERVICES", "YOUTUBE"]),
+    "Jio": ("Bills & Utilities", ["JIO", "RELIANCE JIO"]),
+    "Airtel": ("Bills & Utilities", ["AIRTEL", "BHARTI AIRTEL"]),
+    "Vodafone Idea": ("Bills & Utilities", ["VODAFONE", "VI PREPAID", "VODAFONE IDEA"]),
+    "Tata Power": ("Bills & Utilities", ["TATA POWER"]),
+    "BESCOM": ("Bills & Utilities", ["BESCOM"]),
+    "Apollo Pharmacy": ("Health", ["APOLLO PHARMACY", "APOLLO"]),
+    "PharmEasy": ("Health", ["PHARMEASY"]),
+    "1mg": ("Health", ["1MG", "TATA 1MG"]),
+    "LIC": ("Insurance", ["LIC OF INDIA", "LIFE INSURANCE CORPORATION"]),
+    "Card Payment": ("Payments", ["INTERNET PAYMENT", "PAYMENT RECEIVED", "BBPS PAYMENT", "NEFT PAYMENT",
+                                  "IMPS PAYMENT", "UPI PAYMENT", "AUTOPAY", "AUTO DEBIT"]),
+    "Cashback": ("Refunds & Cashback", ["CASHBACK", "CASH BACK"]),
+    "Refund": ("Refunds & Cashback", ["REFUND", "REVERSAL"]),
+    "Bank Charges": ("Fees & Charges", ["IGST", "CGST", "SGST", "FINANCE CHARGES", "LATE PAYMENT FEE",
+                                        "ANNUAL FEE", "MARKUP FEE", "INTEREST CHARGES"]),
+}
+
+# Phrases in a bank's category column -> category
+BANK_CATEGORIES = {
+    "Shopping": ["SHOPPING", "DEPT STORES", "DEPARTMENT STORES", "APPAREL", "CLOTHING", "ELECTRONICS",
+                 "JEWELLERY", "RETAIL"],
+    "Food & Dining": ["FOOD", "DINING", "RESTAURANTS", "RESTAURANT", "FOOD AND BEVERAGES"],
+    "Groceries": ["GROCERY", "GROCERIES", "SUPERMARKETS"],
+    "Travel": ["TRAVEL", "AIRLINES", "HOTELS", "HOTEL", "RAILWAYS", "TAXI"],
+    "Fuel": ["FUEL", "PETROL"],
+    "Bills & Utilities": ["UTILITIES", "UTILITY", "TELECOM", "BILL PAYMENT"],
+    "Entertainment": ["ENTERTAINMENT", "MOVIES"],
+    "Health": ["MEDICAL", "HEALTH", "PHARMACY", "HOSPITAL"],
+    "Education": ["EDUCATION"],
+    "Insurance": ["INSURANCE"],
+    "Payments": ["PAYMENT", "PAYMENTS"],
+}
+
+# Memoized descriptions kept before the memo is cleared
+MEMO_SIZE = 200_000
+
+_NON_WORD = re.compile(r"[^A-Z0-9&+]+")
+# Trailing tokens with digits are reference/card numbers, not the merchant
+_REFERENCE = re.compile(r"(?: \S*\d\S*)+$")
+
+
+def clean_text(text):
+    """
+    Upper-cases and replaces punctuation runs with one space, so keywords
+    match "Amazon.in", "AMAZON  IN" and "amazon-in" alike.
+    """
+    return _NON_WORD.sub(" ", str(text).upper()).strip()
+
+def trie_regex(keywords):
+    """
+    A regex matching any of the keywords, built from their trie so common
+    prefixes are matched once: ["UBER", "UBER EATS", "UPI"] becomes
+    U(?:BER(?: EATS)?|PI). Optional tails are greedy, so the longest
+    keyword at a position wins.
+    """
+    trie = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return f"(?:{body})?"
+        return body
+
+    return build(trie)
+
+def compile_dictionary(entries):
+    """
+    {value: [keywords]} -> (search, {cleaned keyword: value}). `search` finds
+    the leftmost, longest whole-word keyword in cleaned text.
+    """
+    lookup = {}
+    for value, keywords in entries.items():
+        for keyword in keywords:
+            lookup.setdefault(clean_text(keyword), value)
+    search = re.compile(r"(?<![A-Z0-9])(?:" + trie_regex(lookup) + r")(?![A-Z0-9])").search
+    return search, lookup
+
+
+class Normalizer:
+    """
+    Compiled merchant and bank-category dictionaries plus the memo.
+    `hits` and `misses` count memo lookups.
+    """
+    def __init__(self, merchants=MERCHANTS, bank_categories=BANK_CATEGORIES, memo_size=MEMO_SIZE):
+        self._merchant_search, merchant_of = compile_dictionary({name: kw for name, (_, kw) in merchants.items()})
+        self._merchant_of = {keyword: (name, merchants[name][0]) for keyword, name in merchant_of.items()}
+        self._category_search, self._category_of = compile_dictionary(bank_categories)
+        self.memo_size = memo_size
+        self.memo = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _classify(self, description, bank_category):
+        text = clean_text(description)
+        found = self._merchant_search(text)
+        if found is not None:
+            merchant, category = self._merchant_of[found.group()]
+        else:
+            merchant, category = _REFERENCE.sub("", text) or "UNKNOWN", DEFAULT_CATEGORY
+        if bank_category:
+            # The raw column can carry the tail of the description, so the
+            # last category phrase in it is the bank's category
+            phrases = list(self._bank_categories(clean_text(bank_category)))
+            if phrases:
+                category = phrases[-1]
+        return merchant, category
+
+    def _bank_categories(self, text):
+        position = 0
+        while True:
+            found = self._category_search(text, position)
+            if found is None:
+                return
+            yield self._category_of[found.group()]
+            position = found.end()
+
+    def classify_one(self, description, bank_category=None):
+        """
+        (merchant, category) for one description.
+        """
+        key = (description, bank_category)
+        result = self.memo.get(key)
+        if result is not None:
+            self.hits += 1
+            return result
+        self.misses += 1
+        if len(self.memo) >= self.memo_size:
+            self.memo.clear()
+        result = self.memo[key] = self._classify(description, bank_category)
+        return result
+
+    def classify(self, descriptions, bank_categories=None):
+        """
+        Classifies a whole description column (and the matching bank
+        categories, if any). Returns a list of (merchant, category).
+        """
+        if bank_categories is None:
+            bank_categories = [None] * len(descriptions)
+        classify_one = self.classify_one
+        return [classify_one(description, bank_category)
+                for description, bank_category in zip(descriptions, bank_categories)]
+
+    def categorize(self, df):
+        """
+        A copy of a parser's frame with Merchant and Category columns added.
+        """
+        categories = None
+        if "BankCategory" in df:
+            # Missing categories come back as NaN from the frame
+            categories = [value if isinstance(value, str) else None for value in df["BankCategory"].tolist()]
+        classified = self.classify(df["Description"].tolist(), categories)
+        df = df.copy()
+        df["Merchant"] = [merchant for merchant, _ in classified]
+        df["Category"] = [category for _, category in classified]
+        return df
+
+
+_default = None
+
+def default_normalizer():
+    """
+    The shared Normalizer, compiled on first use.
+    """
+    global _default
+    if _default is None:
+        _default = Normalizer()
+    return _default
+
+def classify(descriptions, bank_categories=None):
+    return default_normalizer().classify(descriptions, bank_categories)
+
+def categorize(df):
+    return default_normalizer().categorize(df)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Map raw transaction descriptions to merchants and categories.")
+    parser.add_argument("descriptions", nargs="*", help="Descriptions to classify")
+    parser.add_argument("--csv", default=None, help="Classify the Description column of this CSV (e.g. batch output)")
+    parser.add_argument("-o", "--output", default=None, help="With --csv: write the CSV with Merchant/Category here")
+    args = parser.parse_args(argv)
+
+    if args.csv:
+        import pandas as pd
+
+        df = categorize(pd.read_csv(args.csv, dtype={"Description": str}, keep_default_na=False))
+        if args.output:
+            df.to_csv(args.output, index=False)
+        else:
+            # Batch output amounts are paise
+            rupees = df.assign(Amount=df["Amount"] / 100)
+            print(rupees.groupby("Category")["Amount"].agg(["count", "sum"]).sort_values("sum", ascending=False))
+        return 0
+
+    for description, (merchant, category) in zip(args.descriptions, classify(args.descriptions)):
+        print(f"{description!r:<45} {merchant:<20} {category}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Cheap page pre-filter.
+
+Statements carry terms-and-conditions, rewards and marketing pages that can
+never produce a transaction, yet the parsers used to run table finding or
+text layout on all of them. This pass looks only at the page's character
+objects (already parsed by pdfminer, no layout analysis) and keeps a page
+when it contains a DD/MM/YYYY token or a known transaction-table header.
+
+Every parser requires a DD/MM/YYYY date on a transaction row, so a page
+without one cannot contribute rows and skipping it never changes the output.
+Set PDF_PARSER_PREFILTER=0 to disable the filter (e.g. to compare timings).
+"""
+import os
+import re
+
+from parsers.profiling import count, stage
+
+ENABLED = os.environ.get("PDF_PARSER_PREFILTER", "1") != "0"
+
+DATE_TOKEN = re.compile(r"\d{2}/\d{2}/\d{4}")
+
+# Transaction-table headers, lowercase with whitespace removed
+HEADER_STRINGS = [
+    "transactiondescription",
+    "transactionaldetails",
+    "transactiondetails",
+    "transactiondate",
+]
+
+_whitespace = re.compile(r"\s+")
+
+
+def page_char_text(page, chars=None):
+    """
+    The page's characters in rough reading order (by line, then left to
+    right). `chars(page)` can stand in for page.chars with the
+    (text, x0, x1, top, ...) tuples of parsers/fastpath.py.
+    """
+    if chars is not None:
+        return "".join(c[0] for c in sorted(chars(page), key=lambda c: (round(c[3]), c[1])))
+    chars = sorted(page.chars, key=lambda c: (round(c["top"]), c["x0"]))
+    return "".join(c["text"] for c in chars)
+
+def classify_page(page, chars=None):
+    """
+    Returns {"transactions": bool, "date_tokens": int, "headers": [...]}.
+    """
+    text = page_char_text(page, chars)
+    date_tokens = len(DATE_TOKEN.findall(text))
+    compact = _whitespace.sub("", text).lower()
+    headers = [header for header in HEADER_STRINGS if header in compact]
+    return {
+        "transactions": date_tokens > 0 or bool(headers),
+        "date_tokens": date_tokens,
+        "headers": headers,
+    }
+
+def is_transaction_page(page, chars=None):
+    return classify_page(page, chars)["transactions"]
+
+def transaction_pages(pages, release=None, chars=None):
+    """
+    Yields only the pages that may hold transactions, counting kept and
+    skipped pages on the active trace. Skipped pages are handed to
+    `release` (see Document.release), if given, and `chars` is passed on to
+    page_char_text.
+    """
+    for page in pages:
+        if not ENABLED:
+            yield page
+            continue
+        with stage("prefilter"):
+            keep = is_transaction_page(page, chars)
+        if keep:
+            count("pages_kept")
+            yield page
+        else:
+            count("pages_skipped")
+            if release is not None:
+                release(page)
@@ -0,0 +1,174 @@
+"""
+Per-stage timing and counters for the parsing pipeline.
+
+A `Trace` collects:
+- stage timings (open, detect_bank, extract_text, extract_tables, regex, dataframe, ...)
+- per-page timings
+- counters (pages_touched, tables_found, lines_scanned, regex_hits, rows_rejected, ...)
+- optionally, cProfile output for the whole document
+
+Code deep in the parsers doesn't get a trace passed in. It calls the
+module-level `stage()` / `count()` helpers, which report to whichever trace
+is active in the current context and do nothing when none is. Streamlit
+runs each session in its own thread, so the active trace is a ContextVar.
+
+Usage:
+    python -m parsers.profiling statement.pdf [--profile]
+"""
+import contextvars
+import cProfile
+import io
+import json
+import pstats
+import time
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+
+_active = contextvars.ContextVar("active_trace", default=None)
+
+
+class Trace:
+    """
+    Timings and counters for one document.
+    """
+    def __init__(self, name=None):
+        self.name = name
+        self.stages = {}
+        self.counters = Counter()
+        self.pages = []
+        self.profile = None
+        self.started = time.perf_counter()
+        self.total_seconds = None
+
+    @contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] = self.stages.get(name, 0.0) + time.perf_counter() - start
+
+    def count(self, name, n=1):
+        self.counters[name] += n
+
+    def timed_pages(self, pages):
+        """
+        Yields pages while recording how long the caller spent on each one
+        (the time between handing a page out and being asked for the next).
+        """
+        for number, page in enumerate(pages, 1):
+            start = time.perf_counter()
+            self.count("pages_touched")
+            yield page
+            self.pages.append({"page": number, "seconds": round(time.perf_counter() - start, 6)})
+
+    def finish(self):
+        self.total_seconds = time.perf_counter() - self.started
+        return self
+
+    def to_dict(self):
+        total = self.total_seconds if self.total_seconds is not None else time.perf_counter() - self.started
+        trace = {
+            "name": self.name,
+            "total_seconds": round(total, 6),
+            "stages": {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            "counters": dict(self.counters),
+            "pages": self.pages,
+        }
+        if self.profile is not None:
+            trace["profile"] = self.profile
+        return trace
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+
+@contextmanager
+def activate(trace, profile=False):
+    """
+    Makes `trace` the active trace for the block. With profile=True the
+    block also runs under cProfile and the top functions are attached to
+    the trace as text.
+    """
+    token = _active.set(trace)
+    profiler = cProfile.Profile() if profile else None
+    try:
+        if profiler:
+            profiler.enable()
+        yield trace
+    finally:
+        if profiler:
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(40)
+            trace.profile = out.getvalue()
+        _active.reset(token)
+        trace.finish()
+
+def current():
+    return _active.get()
+
+def stage(name):
+    """
+    Times a block against the active trace (no-op without one).
+    """
+    trace = _active.get()
+    return trace.stage(name) if trace is not None else nullcontext()
+
+def count(name, n=1):
+    """
+    Bumps a counter on the active trace (no-op without one).
+    """
+    trace = _active.get()
+    if trace is not None:
+        trace.count(name, n)
+
+def timed_pages(pages):
+    """
+    Iterates pages, recording per-page timings on the active trace.
+    """
+    trace = _active.get()
+    return trace.timed_pages(pages) if trace is not None else iter(pages)
+
+
+def trace_document(path, profile=False):
+    """
+    Opens, detects and parses one statement under a trace. Returns the trace.
+    """
+    from parsers.core import PARSER_MAP, detect_bank, open_pdf
+    from parsers.document import Document
+
+    trace = Trace(path)
+    with activate(trace, profile=profile):
+        with trace.stage("open"):
+            pdf = open_pdf(path)
+        try:
+            pdf = Document(pdf)
+            with trace.stage("detect_bank"):
+                bank = detect_bank(pdf)
+            trace.name = f"{path} [{bank}]"
+            if bank:
+                with trace.stage("parse"):
+                    df = PARSER_MAP[bank](pdf)
+                trace.count("rows", len(df))
+        finally:
+            pdf.close()
+    return trace
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Print a JSON timing trace for one statement.")
+    parser.add_argument("path")
+    parser.add_argument("--profile", action="store_true", help="Attach cProfile output")
+    args = parser.parse_args(argv)
+
+    # Under `python -m` this file is __main__; the parsers report to the
+    # ContextVar in the importable parsers.profiling module, so use that one.
+    from parsers import profiling
+
+    print(json.dumps(profiling.trace_document(args.path, args.profile).to_dict(), indent=2))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,138 @@
+"""
+Background, page-by-page parsing for interactive front ends.
+
+`ParseJob(data).start()` opens, detects and parses a statement in a daemon
+thread, consuming STREAM_MAP[bank] one page at a time. The caller (the
+Streamlit app) polls the job and can render what is there so far:
+
+    batches             the per-page transaction batches parsed so far
+    debits, credits     running totals, in paise (Invalid rows left out)
+    pages_done          pages finished (kept or skipped), of total_pages
+    eta()               seconds left, from the average time per page so far
+    first_row_seconds   time from start to the first transaction
+
+The first rows are available after detection plus one page of work,
+however long the statement is. `cancel()` sets a threading.Event that the
+worker checks before asking for each page, so cancelling stops further page
+work within one page; the rows parsed until then stay on the job.
+
+The worker never touches a UI. Errors end up in `error`, and `done` is set
+when the worker exits for any reason.
+"""
+import threading
+import time
+from contextlib import nullcontext
+
+from parsers.core import STREAM_MAP, detect_bank, open_pdf
+from parsers.document import Document
+from parsers.profiling import activate, stage
+
+
+class ParseJob:
+    """
+    One statement parsed in a background thread. `trace` (a
+    parsers.profiling.Trace) is activated in the worker, with cProfile if
+    `profile` is set.
+    """
+    def __init__(self, data, bank=None, key=None, trace=None, profile=False):
+        self.data = data
+        self.bank = bank
+        self.key = key
+        self.trace = trace
+        self.profile = profile
+        self.batches = []
+        self.rows = 0
+        self.debits = 0
+        self.credits = 0
+        self.total_pages = None
+        self.document = None
+        self.error = None
+        self.started = None
+        self.first_row_seconds = None
+        self.seconds = None
+        self.cancelled = threading.Event()
+        self.done = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="parse-job", daemon=True)
+
+    def start(self):
+        self.started = time.perf_counter()
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def wait(self, timeout=None):
+        """
+        Waits until the job is done (or the timeout passes). Returns done.
+        """
+        return self.done.wait(timeout)
+
+    @property
+    def pages_done(self):
+        return self.document.pages_done if self.document is not None else 0
+
+    def progress(self):
+        """
+        Fraction of the pages done, 0.0 until the PDF is open.
+        """
+        if not self.total_pages:
+            return 1.0 if self.done.is_set() else 0.0
+        return min(1.0, self.pages_done / self.total_pages)
+
+    def eta(self):
+        """
+        Estimated seconds left, or None before the first page is done.
+        """
+        done = self.pages_done
+        if not done or not self.total_pages:
+            return None
+        elapsed = time.perf_counter() - self.started
+        return elapsed / done * (self.total_pages - done)
+
+    def transactions(self):
+        """
+        The transactions parsed so far, as one list.
+        """
+        return [txn for batch in list(self.batches) for txn in batch]
+
+    def _add(self, batch):
+        for txn in batch:
+            if txn["Invalid"]:
+                continue
+            if txn["Amount"] > 0:
+                self.debits += txn["Amount"]
+            else:
+                self.credits += txn["Amount"]
+        self.rows += len(batch)
+        self.batches.append(batch)
+        if batch and self.first_row_seconds is None:
+            self.first_row_seconds = time.perf_counter() - self.started
+
+    def _run(self):
+        activated = activate(self.trace, profile=self.profile) if self.trace is not None else nullcontext()
+        try:
+            with activated, open_pdf(self.data) as pdf:
+                document = Document(pdf)
+                self.total_pages = len(document.pages)
+                self.document = document
+                if self.bank is None:
+                    with stage("detect_bank"):
+                        self.bank = detect_bank(document)
+                if self.bank is None:
+                    return
+                stream = STREAM_MAP[self.bank](document)
+                try:
+                    with stage("parse"):
+                        while not self.cancelled.is_set():
+                            batch = next(stream, None)
+                            if batch is None:
+                                break
+                            self._add(batch)
+                finally:
+                    stream.close()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.seconds = time.perf_counter() - self.started
+            self.done.set()
@@ -0,0 +1,218 @@
+"""
+Compact columnar transaction schema.
+
+The hand-written parsers returned frames of Python objects: DD/MM/YYYY date
+strings, object descriptions and float amounts. For holding many
+statements at once, every bank in PARSER_MAP can also produce this compact
+layout directly (`COLUMNAR_MAP[bank](pdf)` / `parse_columnar`):
+
+    date          datetime64 (day precision; date32 in Arrow/Parquet),
+                  NaT where the parser couldn't read the date
+    description   categorical (dictionary-encoded)
+    amount_paise  int64 (minor units, debits positive, credits negative)
+    invalid       bool (the parser's Invalid flag: amount or date unreadable)
+    bank          categorical
+    card_id       categorical
+
+The columns are built straight from the parser's per-page batches, without
+an intermediate frame of objects. pandas only stores datetimes at second
+resolution or finer, so `date` is datetime64[s] in memory. The batch
+runner's Parquet sink (parsers/sinks.py) writes the same types.
+
+Export to Arrow IPC and Parquet hands the amount_paise and invalid buffers
+to Arrow without copying and keeps the dictionary encoding of the
+categorical columns; `date` is cast to date32, which copies that column.
+"""
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from parsers.core import PARSER_MAP, STREAM_MAP, transactions_frame
+
+COLUMNAR_COLUMNS = ["date", "description", "amount_paise", "invalid", "bank", "card_id"]
+
+
+def to_columnar(df, bank, card_id=None):
+    """
+    Converts a parser's Date/Description/Amount/Invalid frame to the compact
+    schema.
+    """
+    return pd.DataFrame({
+        "date": df["Date"].to_numpy(dtype="datetime64[s]"),
+        "description": pd.Categorical(df["Description"].astype(str) if len(df) else []),
+        "amount_paise": df["Amount"].to_numpy(dtype="int64"),
+        "invalid": df["Invalid"].to_numpy(dtype=bool),
+        "bank": pd.Categorical([bank] * len(df)),
+        "card_id": pd.Categorical([card_id] * len(df)),
+    })
+
+def columnar_frame(batches, bank, card_id=None):
+    """
+    Collects a stream of per-page transaction batches (see STREAM_MAP)
+    straight into the compact schema.
+    """
+    dates, descriptions, amounts, invalid = [], [], [], []
+    for batch in batches:
+        for txn in batch:
+            dates.append(txn["Date"])
+            descriptions.append(txn["Description"])
+            amounts.append(txn["Amount"])
+            invalid.append(txn["Invalid"])
+    return pd.DataFrame({
+        # datetime.date (or None -> NaT) converts without parsing
+        "date": np.array(dates, dtype="datetime64[D]").astype("datetime64[s]"),
+        "description": pd.Categorical(descriptions),
+        "amount_paise": np.array(amounts, dtype="int64"),
+        "invalid": np.array(invalid, dtype=bool),
+        "bank": pd.Categorical([bank] * len(dates)),
+        "card_id": pd.Categorical([card_id] * len(dates)),
+    })
+
+def parse_columnar(pdf, bank, card_id=None):
+    """
+    Runs the bank's parser and returns the compact frame. Works for every
+    bank in PARSER_MAP, since they all stream the same batches.
+    """
+    return columnar_frame(STREAM_MAP[bank](pdf), bank, card_id)
+
+# bank id -> pdf -> compact frame, next to PARSER_MAP and STREAM_MAP
+COLUMNAR_MAP = {bank: partial(parse_columnar, bank=bank) for bank in PARSER_MAP}
+
+def from_columnar(frame):
+    """
+    Back to the parsers' Date/Description/Amount/Invalid layout.
+    """
+    return pd.DataFrame({
+        "Date": frame["date"],
+        "Description": frame["description"].astype(str),
+        "Amount": frame["amount_paise"].to_numpy(),
+        "Invalid": frame["invalid"].to_numpy(),
+    })
+
+def concat_columnar(frames):
+    """
+    Stacks compact frames from several statements. Categories are unioned so
+    the columns stay dictionary-encoded instead of falling back to objects.
+    """
+    frames = [f for f in frames if len(f)]
+    if not frames:
+        return to_columnar(transactions_frame([]), None)
+    combined = pd.concat(frames, ignore_index=True)
+    for column in ("description", "bank", "card_id"):
+        # concat turns categoricals with different categories into objects
+        combined[column] = pd.Categorical(combined[column])
+    return combined
+
+def to_arrow(frame):
+    """
+    Arrow table for a compact frame: the int64 and bool buffers are shared,
+    categoricals become dictionary arrays, and date is cast (copied) to
+    date32.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(frame[COLUMNAR_COLUMNS], preserve_index=False)
+    index = table.schema.get_field_index("date")
+    return table.set_column(index, "date", table.column("date").cast(pa.date32()))
+
+def write_ipc(frame, path):
+    """
+    Writes a compact frame as an Arrow IPC (Feather v2) file.
+    """
+    import pyarrow as pa
+
+    table = to_arrow(frame)
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+def write_parquet(frame, path):
+    """
+    Writes a compact frame to Parquet (dictionary encoding kept).
+    """
+    import pyarrow.parquet as pq
+
+    pq.write_table(to_arrow(frame), str(path))
+
+def read_columnar(path):
+    """
+    Reads a compact frame back from Parquet or Arrow IPC.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    if str(path).lower().endswith(".parquet"):
+        table = pq.read_table(str(path))
+    else:
+        with pa.memory_map(str(path), "r") as source:
+            table = pa.ipc.open_file(source).read_all()
+    frame = table.to_pandas()
+    frame["date"] = pd.to_datetime(frame["date"]).astype("datetime64[s]")
+    for column in ("description", "bank", "card_id"):
+        frame[column] = frame[column].astype("category")
+    return frame
+
+def baseline_frame(df):
+    """
+    A parser frame as the hand-written parsers returned it: DD/MM/YYYY date
+    strings, description strings and float rupee amounts, all Python
+    objects except Amount. Only for measuring what the compact schema saves.
+    """
+    dates = df["Date"].dt.strftime("%d/%m/%Y")
+    return pd.DataFrame({
+        "Date": pd.Series(dates.where(dates.notna(), None), dtype=object),
+        "Description": pd.Series(df["Description"].tolist(), dtype=object),
+        "Amount": df["Amount"].to_numpy(dtype="float64") / 100,
+    })
+
+def memory_comparison(parsed_df, compact_df):
+    """
+    Deep memory use, in bytes, of the hand-written parsers' object frame
+    (rebuilt from `parsed_df` by baseline_frame), of the engine's frame and
+    of the compact frame. `ratio` is baseline over compact.
+    """
+    baseline = int(baseline_frame(parsed_df).memory_usage(deep=True).sum())
+    parsed = int(parsed_df.memory_usage(deep=True).sum())
+    compact = int(compact_df.memory_usage(deep=True).sum())
+    return {
+        "rows": len(parsed_df),
+        "baseline_bytes": baseline,
+        "parsed_bytes": parsed,
+        "compact_bytes": compact,
+        "ratio": round(baseline / compact, 2) if compact else 0.0,
+    }
+
+def main(argv=None):
+    """
+    python -m parsers.schema statement.pdf [...]
+    Parses the statements and prints the memory used by the hand-written
+    parsers' object frames, the engine's frames and the compact frames.
+    """
+    import sys
+
+    from parsers.core import detect_bank, open_pdf
+    from parsers.document import Document
+
+    parsed_frames, compact_frames = [], []
+    for path in (argv if argv is not None else sys.argv[1:]):
+        with open_pdf(path) as pdf:
+            pdf = Document(pdf)
+            bank = detect_bank(pdf)
+            if bank is None:
+                print(f"{path}: could not detect bank", file=sys.stderr)
+                continue
+            compact = COLUMNAR_MAP[bank](pdf)
+        parsed_frames.append(from_columnar(compact))
+        compact_frames.append(compact)
+
+    if not parsed_frames:
+        return 1
+    report = memory_comparison(pd.concat(parsed_frames, ignore_index=True), concat_columnar(compact_frames))
+    print(f"{report['rows']} rows: {report['baseline_bytes']:,} bytes as objects (hand-written parsers), "
+          f"{report['parsed_bytes']:,} bytes as parsed, {report['compact_bytes']:,} bytes compact "
+          f"({report['ratio']}x smaller than the objects)")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
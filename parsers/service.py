@@ -0,0 +1,311 @@
+"""
+Local parsing service.
+
+Usage:
+    python -m parsers.service --port 8765 --workers 4 --queue-size 32
+
+A small asyncio HTTP server (standard library only) for other programs that
+need to submit statements without going through the Streamlit UI. The event
+loop only does I/O; detect_bank and the PARSER_MAP parser run in a process
+pool.
+
+    POST /parse              body: the PDF bytes. Queues the statement and
+                             waits for the result (200).
+    POST /parse?async=1      queues the statement and returns {"job_id"} (202).
+    GET  /jobs/<job_id>      job state, and the result once it is done.
+    GET  /metrics            queue depth, in-flight jobs, counts and
+                             latency percentiles.
+    GET  /health
+
+Jobs wait in a bounded queue in front of the pool. When the queue is full a
+submission is refused with 429 (and Retry-After) instead of piling up; while
+the service is shutting down submissions get 503.
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_QUEUE_SIZE = 32
+MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+# Finished jobs kept for polling, oldest dropped first
+MAX_FINISHED_JOBS = 1000
+# Recent job latencies used for the percentiles
+LATENCY_WINDOW = 1000
+
+REASONS = {
+    200: "OK", 202: "Accepted", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 411: "Length Required", 413: "Payload Too Large",
+    429: "Too Many Requests", 500: "Internal Server Error", 503: "Service Unavailable",
+}
+
+
+def parse_statement(data):
+    """
+    Detects the bank and parses one statement from its bytes. Runs inside a
+    worker process and returns a plain dict so it pickles cheaply.
+    """
+    from parsers.base_parser import iso_day
+    from parsers.core import PARSER_MAP, detect_bank, open_pdf
+    from parsers.document import Document
+
+    start = time.perf_counter()
+    with open_pdf(data) as pdf:
+        pdf = Document(pdf)
+        pages = len(pdf.pages)
+        bank = detect_bank(pdf)
+        transactions = PARSER_MAP[bank](pdf).to_dict("records") if bank else []
+    # Dates as YYYY-MM-DD (null where Invalid); amounts stay integer paise
+    transactions = [dict(txn, Date=iso_day(txn["Date"])) for txn in transactions]
+    return {
+        "bank": bank,
+        "status": "ok" if transactions else ("unknown_bank" if bank is None else "no_transactions"),
+        "pages": pages,
+        "rows": len(transactions),
+        "seconds": round(time.perf_counter() - start, 4),
+        "transactions": transactions,
+    }
+
+def percentile(sorted_values, fraction):
+    """
+    Nearest-rank percentile of an already sorted list (None when empty).
+    """
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class ParseService:
+    """
+    Job queue, worker dispatch and bookkeeping for the HTTP handlers.
+    `workers` dispatcher tasks each keep one job running in the pool.
+    """
+    def __init__(self, workers=None, queue_size=DEFAULT_QUEUE_SIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.jobs = OrderedDict()
+        self.in_flight = 0
+        self.counts = {"submitted": 0, "completed": 0, "failed": 0, "rejected": 0}
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.accepting = True
+        self._pool = None
+        self._dispatchers = []
+
+    async def start(self):
+        self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        self._dispatchers = [asyncio.create_task(self._dispatch()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """
+        Refuses new jobs (503), lets queued and running jobs finish, then
+        shuts the pool down.
+        """
+        self.accepting = False
+        await self.queue.join()
+        for task in self._dispatchers:
+            task.cancel()
+        await asyncio.gather(*self._dispatchers, return_exceptions=True)
+        self._pool.shutdown()
+
+    def submit(self, data, name=None):
+        """
+        Queues a statement. Returns the job dict, or None if the queue is full.
+        """
+        job = {
+            "id": uuid.uuid4().hex,
+            "name": name,
+            "state": "queued",
+            "submitted": time.time(),
+            "result": None,
+            "error": None,
+            "done": asyncio.get_running_loop().create_future(),
+        }
+        try:
+            self.queue.put_nowait((job, data))
+        except asyncio.QueueFull:
+            self.counts["rejected"] += 1
+            return None
+        self.counts["submitted"] += 1
+        self.jobs[job["id"]] = job
+        return job
+
+    async def _dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job, data = await self.queue.get()
+            job["state"] = "running"
+            self.in_flight += 1
+            try:
+                job["result"] = await loop.run_in_executor(self._pool, parse_statement, data)
+                job["state"] = "done"
+                self.counts["completed"] += 1
+            except Exception as e:
+                job["state"] = "error"
+                job["error"] = f"{type(e).__name__}: {e}"
+                self.counts["failed"] += 1
+            finally:
+                self.in_flight -= 1
+                self.latencies.append(time.time() - job["submitted"])
+                job["done"].set_result(None)
+                self.queue.task_done()
+                self._forget_finished()
+
+    def _forget_finished(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job["state"] in ("done", "error")]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.jobs[job_id]
+
+    def job_view(self, job, transactions=True):
+        view = {key: job[key] for key in ("id", "name", "state", "error")}
+        view["job_id"] = view.pop("id")
+        if job["result"] is not None:
+            result = dict(job["result"])
+            if not transactions:
+                result.pop("transactions")
+            view["result"] = result
+        return view
+
+    def metrics(self):
+        latencies = sorted(self.latencies)
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_capacity": self.queue.maxsize,
+            "in_flight": self.in_flight,
+            "workers": self.workers,
+            "accepting": self.accepting,
+            **self.counts,
+            "latency_seconds": {
+                "samples": len(latencies),
+                "p50": percentile(latencies, 0.50),
+                "p90": percentile(latencies, 0.90),
+                "p99": percentile(latencies, 0.99),
+                "max": latencies[-1] if latencies else None,
+            },
+        }
+
+    # --- HTTP ---
+
+    async def handle(self, reader, writer):
+        """
+        Serves one request per connection.
+        """
+        try:
+            status, body, headers = await self._route(reader)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+            return
+        except ValueError as e:
+            status, body, headers = 400, {"error": str(e)}, {}
+        except Exception as e:
+            status, body, headers = 500, {"error": f"{type(e).__name__}: {e}"}, {}
+
+        payload = json.dumps(body, default=str).encode()
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+                "Content-Type: application/json",
+                f"Content-Length: {len(payload)}",
+                "Connection: close"]
+        head += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode() + payload)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _route(self, reader):
+        request_line = (await reader.readline()).decode("latin-1").strip()
+        if not request_line:
+            raise ConnectionError("empty request")
+        try:
+            method, target, _ = request_line.split(" ", 2)
+        except ValueError:
+            raise ValueError(f"malformed request line: {request_line!r}")
+
+        headers = {}
+        while True:
+            line = (await reader.readline()).decode("latin-1").strip()
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        path = url.path.rstrip("/") or "/"
+
+        if path == "/health":
+            return 200, {"ok": True}, {}
+        if path == "/metrics":
+            return 200, self.metrics(), {}
+        if path.startswith("/jobs/"):
+            job = self.jobs.get(path[len("/jobs/"):])
+            if job is None:
+                return 404, {"error": "unknown job"}, {}
+            return 200, self.job_view(job), {}
+        if path != "/parse":
+            return 404, {"error": f"no route for {path}"}, {}
+        if method != "POST":
+            return 405, {"error": "use POST"}, {"Allow": "POST"}
+
+        if "content-length" not in headers:
+            return 411, {"error": "Content-Length required"}, {}
+        length = int(headers["content-length"])
+        if length > MAX_UPLOAD_BYTES:
+            return 413, {"error": f"upload larger than {MAX_UPLOAD_BYTES} bytes"}, {}
+        data = await reader.readexactly(length)
+
+        if not self.accepting:
+            return 503, {"error": "service is shutting down"}, {"Retry-After": "5"}
+        job = self.submit(data, query.get("name"))
+        if job is None:
+            return 429, {"error": "job queue is full"}, {"Retry-After": "1"}
+
+        if query.get("async", "0") not in ("0", "false", ""):
+            return 202, {"job_id": job["id"], "state": job["state"]}, {"Location": f"/jobs/{job['id']}"}
+        await job["done"]
+        return (200 if job["state"] == "done" else 500), self.job_view(job), {}
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, workers=None, queue_size=DEFAULT_QUEUE_SIZE):
+    service = ParseService(workers, queue_size)
+    await service.start()
+    server = await asyncio.start_server(service.handle, host, port)
+    print(f"Parsing service on http://{host}:{port} ({service.workers} workers, queue of {queue_size})", file=sys.stderr)
+    try:
+        await server.serve_forever()
+    finally:
+        # Refuse first, so connections already open get 503 rather than
+        # being cut off, then stop listening and let the queued and running
+        # jobs finish (their connections get their results)
+        service.accepting = False
+        server.close()
+        await service.stop()
+        await server.wait_closed()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve statement parsing over HTTP on localhost.")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-w", "--workers", type=int, default=os.cpu_count(),
+                        help="Number of worker processes (default: all cores)")
+    parser.add_argument("--queue-size", type=int, default=DEFAULT_QUEUE_SIZE,
+                        help="Jobs allowed to wait for a worker before submissions get 429")
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.workers, args.queue_size))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
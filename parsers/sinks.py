@@ -0,0 +1,201 @@
+import csv
+import datetime
+import json
+import os
+import tempfile
+
+from parsers.base_parser import iso_day
+
+# Column types understood by the sinks. Parquet needs real types up front,
+# CSV and JSONL just use the column order; dates are written as YYYY-MM-DD.
+# "category" columns are dictionary-encoded strings in Parquet, as in the
+# compact schema (parsers/schema.py), and plain strings elsewhere.
+TRANSACTION_COLUMNS = [
+    ("File", "category"),
+    ("Bank", "category"),
+    ("Date", "date"),
+    ("Description", "category"),
+    # Integer paise: debits positive, credits negative
+    ("Amount", "int"),
+    ("Invalid", "bool"),
+]
+
+STATUS_COLUMNS = [
+    ("File", "string"),
+    ("Bank", "string"),
+    ("Status", "string"),
+    ("Pages", "int"),
+    ("PagesSkipped", "int"),
+    ("Rows", "int"),
+    ("Seconds", "float"),
+    ("Cache", "string"),
+    ("Error", "string"),
+]
+
+
+def _rows(records, columns, dates):
+    """
+    The records cut down to `columns`, with the `dates` columns (parsed
+    dates, Timestamps or None) as YYYY-MM-DD strings.
+    """
+    rows = []
+    for record in records:
+        row = {name: record.get(name) for name in columns}
+        for name in dates:
+            row[name] = iso_day(row[name])
+        rows.append(row)
+    return rows
+
+
+class TextSink:
+    """
+    Base for the sinks writing a text file. Between begin() and commit(),
+    rollback() truncates the file back to where begin() left it, dropping
+    the records written since (e.g. those of a statement that failed
+    halfway).
+    """
+    def __init__(self, path, columns, **options):
+        self.columns = [name for name, _ in columns]
+        self.dates = [name for name, kind in columns if kind == "date"]
+        self._file = open(path, "w", encoding="utf-8", **options)
+        self._mark = None
+
+    def begin(self):
+        self._mark = self._file.tell()
+
+    def commit(self):
+        self._mark = None
+
+    def rollback(self):
+        self._file.seek(self._mark)
+        self._file.truncate()
+        self._mark = None
+
+    def close(self):
+        self._file.close()
+
+
+class CsvSink(TextSink):
+    """
+    Writes records to a CSV file as they arrive.
+    """
+    def __init__(self, path, columns):
+        TextSink.__init__(self, path, columns, newline="")
+        self._writer = csv.DictWriter(self._file, fieldnames=self.columns)
+        self._writer.writeheader()
+
+    def write(self, records):
+        self._writer.writerows(_rows(records, self.columns, self.dates))
+        self._file.flush()
+
+
+class JsonlSink(TextSink):
+    """
+    Writes one JSON object per line.
+    """
+    def write(self, records):
+        for row in _rows(records, self.columns, self.dates):
+            self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+
+class ParquetSink:
+    """
+    Writes each batch of records as one Parquet row group.
+    Needs pyarrow, which is only imported when a Parquet file is requested.
+    Row groups can't be taken back, so between begin() and commit() the
+    batches go, one row group each, to a temporary file next to the output;
+    commit() copies its row groups over one at a time and rollback() just
+    deletes it. Either way only one batch is in memory at a time.
+    """
+    def __init__(self, path, columns):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {"string": pa.string(), "category": pa.dictionary(pa.int32(), pa.string()), "float": pa.float64(),
+                 "int": pa.int64(), "bool": pa.bool_(), "date": pa.date32()}
+        self._pa = pa
+        self._pq = pq
+        self.path = path
+        self.columns = [name for name, _ in columns]
+        self.dates = [name for name, kind in columns if kind == "date"]
+        self.schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self._writer = pq.ParquetWriter(path, self.schema)
+        self._staged = None
+        self._staged_path = None
+
+    def write(self, records):
+        if not records:
+            return
+        rows = _rows(records, self.columns, self.dates)
+        for row in rows:
+            for name in self.dates:
+                if row[name] is not None:
+                    row[name] = datetime.date.fromisoformat(row[name])
+        table = self._pa.Table.from_pylist(rows, schema=self.schema)
+        (self._staged or self._writer).write_table(table)
+
+    def begin(self):
+        fd, self._staged_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(self.path)), suffix=".tmp")
+        os.close(fd)
+        self._staged = self._pq.ParquetWriter(self._staged_path, self.schema)
+
+    def commit(self):
+        self._staged.close()
+        self._staged = None
+        try:
+            staged = self._pq.ParquetFile(self._staged_path)
+            for index in range(staged.num_row_groups):
+                self._writer.write_table(staged.read_row_group(index))
+        finally:
+            self._discard()
+
+    def rollback(self):
+        self._staged.close()
+        self._staged = None
+        self._discard()
+
+    def _discard(self):
+        os.remove(self._staged_path)
+        self._staged_path = None
+
+    def close(self):
+        self._writer.close()
+
+
+SINKS = {
+    ".csv": CsvSink,
+    ".jsonl": JsonlSink,
+    ".parquet": ParquetSink,
+}
+
+def open_sink(path, columns):
+    """
+    Picks a sink from the file extension (.csv, .jsonl or .parquet).
+    """
+    for ext, sink_class in SINKS.items():
+        if str(path).lower().endswith(ext):
+            return sink_class(path, columns)
+    raise ValueError(f"Unsupported output format for '{path}'. Use one of: {', '.join(SINKS)}")
+
+def write_batches(batches, sink, **fields):
+    """
+    Writes a stream of transaction batches (e.g. from a STREAM_MAP parser)
+    to a sink as they arrive, adding `fields` (File, Bank, ...) to every
+    record. Only one batch is held in memory at a time. If the stream
+    raises, what it already wrote is rolled back, so a statement that fails
+    halfway leaves no rows behind. Returns the number of records written.
+    """
+    count = 0
+    sink.begin()
+    try:
+        for batch in batches:
+            if fields:
+                batch = [dict(record, **fields) for record in batch]
+            sink.write(batch)
+            count += len(batch)
+    except BaseException:
+        sink.rollback()
+        raise
+    sink.commit()
+    return count
@@ -0,0 +1,424 @@
+"""
+Multi-statement spending index.
+
+Usage:
+    python -m parsers.spending add statements/*.pdf --index spending.sqlite --card 4375
+    python -m parsers.spending add --manifest archive.sqlite --index spending.sqlite
+    python -m parsers.spending months --index spending.sqlite
+    python -m parsers.spending merchants --top 10 --from 2024-01 --to 2024-06
+    python -m parsers.spending categories
+    python -m parsers.spending range 2024-03-01 2024-03-31 --bank HDFC
+
+Months of parsed statements across banks and cards go into one SQLite store:
+
+    transactions      one row per transaction, clustered by (bank, card_id,
+                      month, date): each bank/card/month is a contiguous,
+                      date-sorted range, with a second index on date alone
+                      for date ranges across cards
+    statements        what has been added (by content key), so adding the
+                      same statement again is a no-op
+    merchant_months   debits, credits and count per bank, card, month,
+                      merchant and category
+    days              debits, credits and count per bank, card and day
+
+The two rollup tables are updated incrementally with an upsert of the new
+statement's own totals when it is added (and subtracted when it is removed),
+never recomputed from the raw rows. Spend by month, merchant and category
+and top-N merchants read only merchant_months, and date-range totals read
+only days, so they take milliseconds however many statements are indexed.
+
+Amounts are stored in paise, as the parsers emit them: debits positive, credits
+negative. Merchants and categories come from the index's `classify`
+function (parsers/merchants.py by default), applied to a whole description
+column at once.
+"""
+import argparse
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+
+from parsers.merchants import classify
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS statements (
+    key TEXT PRIMARY KEY,
+    bank TEXT NOT NULL,
+    card_id TEXT NOT NULL,
+    source TEXT,
+    rows INTEGER NOT NULL,
+    added_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS transactions (
+    bank TEXT NOT NULL,
+    card_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    date TEXT NOT NULL,
+    statement TEXT NOT NULL,
+    row INTEGER NOT NULL,
+    description TEXT,
+    merchant TEXT NOT NULL,
+    category TEXT NOT NULL,
+    amount_paise INTEGER NOT NULL,
+    PRIMARY KEY (bank, card_id, month, date, statement, row)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions (date);
+CREATE INDEX IF NOT EXISTS transactions_statement ON transactions (statement);
+CREATE TABLE IF NOT EXISTS merchant_months (
+    bank TEXT NOT NULL,
+    card_id TEXT NOT NULL,
+    month TEXT NOT NULL,
+    merchant TEXT NOT NULL,
+    category TEXT NOT NULL,
+    debit_paise INTEGER NOT NULL,
+    credit_paise INTEGER NOT NULL,
+    txns INTEGER NOT NULL,
+    PRIMARY KEY (bank, card_id, month, merchant, category)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS days (
+    bank TEXT NOT NULL,
+    card_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    debit_paise INTEGER NOT NULL,
+    credit_paise INTEGER NOT NULL,
+    txns INTEGER NOT NULL,
+    PRIMARY KEY (bank, card_id, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS days_date ON days (date);
+"""
+
+DEFAULT_INDEX_PATH = os.environ.get(
+    "PDF_PARSER_SPENDING_INDEX", os.path.join(os.path.expanduser("~"), ".cache", "pdf-parser", "spending.sqlite")
+)
+
+
+def iso_date(date):
+    """
+    'DD/MM/YYYY' -> 'YYYY-MM-DD' (ISO strings sort by date). ISO dates and
+    datetime-like values are accepted too; a missing date (None, NaT) gives
+    None.
+    """
+    if date is None or date != date:
+        return None
+    if hasattr(date, "strftime"):
+        return date.strftime("%Y-%m-%d")
+    date = str(date)
+    if len(date) == 10 and date[2] == "/" and date[5] == "/":
+        return f"{date[6:]}-{date[3:5]}-{date[:2]}"
+    return date[:10]
+
+def frame_key(bank, card_id, transactions):
+    """
+    Content key for a statement given as rows rather than file bytes.
+    """
+    digest = hashlib.sha256(f"{bank}\0{card_id}".encode())
+    for txn in transactions:
+        digest.update(f"\0{iso_date(txn['Date'])}\0{txn['Description']}\0{txn['Amount']}".encode())
+    return digest.hexdigest()
+
+
+class SpendingIndex:
+    """
+    The SQLite spending store and its rollups. `classify` maps a list of
+    descriptions (and the bank's own categories, or None) to a list of
+    (merchant, category).
+    """
+    def __init__(self, path=DEFAULT_INDEX_PATH, classify=classify):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.classify = classify
+        self.db = sqlite3.connect(path)
+        self.db.row_factory = sqlite3.Row
+        self.db.executescript(SCHEMA)
+
+    def close(self):
+        self.db.close()
+
+    def has(self, key):
+        return self.db.execute("SELECT 1 FROM statements WHERE key = ?", (key,)).fetchone() is not None
+
+    def add_statement(self, bank, transactions, card_id=None, key=None, source=None):
+        """
+        Adds one parsed statement (a Date/Description/Amount frame or list of
+        dicts, Amount in paise) and folds its totals into the rollups. Returns
+        the number of rows added: 0 if a statement with the same key is
+        already indexed. Rows the parser flagged Invalid have no usable date
+        or amount and are left out, as are rows parsers/duplicates.py matched
+        (a Duplicate value) in a statement that is in this index too
+        (DuplicateKey), which are already counted. A match in a statement
+        only the duplicate index has is kept.
+        """
+        if hasattr(transactions, "to_dict"):
+            transactions = transactions.to_dict("records")
+        earlier = {txn.get("DuplicateKey") for txn in transactions if isinstance(txn.get("Duplicate"), str)}
+        indexed = {key for key in earlier if isinstance(key, str) and self.has(key)}
+        transactions = [txn for txn in transactions if not txn.get("Invalid") and not (
+            isinstance(txn.get("Duplicate"), str) and txn.get("DuplicateKey") in indexed)]
+        card_id = card_id or ""
+        key = key or frame_key(bank, card_id, transactions)
+        if self.has(key):
+            return 0
+
+        bank_categories = [txn.get("BankCategory") for txn in transactions]
+        classified = self.classify([txn["Description"] for txn in transactions],
+                                   bank_categories if any(bank_categories) else None)
+        rows = []
+        for index, (txn, (merchant, category)) in enumerate(zip(transactions, classified)):
+            date = iso_date(txn["Date"])
+            rows.append((bank, card_id, date[:7], date, key, index, txn["Description"],
+                         merchant, category, int(txn["Amount"])))
+
+        with self.db:
+            self.db.execute(
+                "INSERT INTO statements (key, bank, card_id, source, rows, added_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, bank, card_id, source, len(rows), time.time()),
+            )
+            self.db.executemany("INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._fold(rows, 1)
+        return len(rows)
+
+    def remove_statement(self, key):
+        """
+        Takes a statement's rows out again, subtracting them from the rollups.
+        Returns the number of rows removed.
+        """
+        rows = [tuple(row) for row in self.db.execute(
+            "SELECT bank, card_id, month, date, statement, row, description, merchant, category, amount_paise "
+            "FROM transactions WHERE statement = ?", (key,)
+        )]
+        with self.db:
+            self._fold(rows, -1)
+            self.db.execute("DELETE FROM transactions WHERE statement = ?", (key,))
+            self.db.execute("DELETE FROM statements WHERE key = ?", (key,))
+            self.db.execute("DELETE FROM merchant_months WHERE txns <= 0")
+            self.db.execute("DELETE FROM days WHERE txns <= 0")
+        return len(rows)
+
+    def _fold(self, rows, sign):
+        """
+        Adds (sign 1) or subtracts (sign -1) rows' totals to the rollups,
+        grouping them in Python first so each rollup row is upserted once.
+        """
+        by_merchant, by_day = {}, {}
+        for bank, card_id, month, date, _, _, _, merchant, category, paise in rows:
+            debit, credit = (paise, 0) if paise > 0 else (0, -paise)
+            for totals, group in ((by_merchant, (bank, card_id, month, merchant, category)),
+                                  (by_day, (bank, card_id, date))):
+                current = totals.get(group)
+                totals[group] = (debit, credit, 1) if current is None else \
+                    (current[0] + debit, current[1] + credit, current[2] + 1)
+
+        self.db.executemany(
+            "INSERT INTO merchant_months VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT DO UPDATE SET debit_paise = debit_paise + excluded.debit_paise, "
+            "credit_paise = credit_paise + excluded.credit_paise, txns = txns + excluded.txns",
+            [(*group, sign * debit, sign * credit, sign * txns) for group, (debit, credit, txns) in by_merchant.items()],
+        )
+        self.db.executemany(
+            "INSERT INTO days VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT DO UPDATE SET debit_paise = debit_paise + excluded.debit_paise, "
+            "credit_paise = credit_paise + excluded.credit_paise, txns = txns + excluded.txns",
+            [(*group, sign * debit, sign * credit, sign * txns) for group, (debit, credit, txns) in by_day.items()],
+        )
+
+    # --- Queries ---
+
+    def _where(self, bank=None, card_id=None, start=None, end=None, column="month"):
+        clauses, params = [], []
+        for name, value in (("bank", bank), ("card_id", card_id)):
+            if value is not None:
+                clauses.append(f"{name} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append(f"{column} >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append(f"{column} <= ?")
+            params.append(end)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _query(self, sql, params):
+        return [dict(row) for row in self.db.execute(sql, params)]
+
+    def spend_by_month(self, bank=None, card_id=None, start=None, end=None):
+        """
+        Debits, credits and count per month ('YYYY-MM'), oldest first.
+        """
+        where, params = self._where(bank, card_id, start, end)
+        return self._query(
+            "SELECT month, SUM(debit_paise) / 100.0 AS spend, SUM(credit_paise) / 100.0 AS credits, "
+            f"SUM(txns) AS txns FROM merchant_months{where} GROUP BY month ORDER BY month", params)
+
+    def spend_by_merchant(self, bank=None, card_id=None, start=None, end=None, top=None):
+        """
+        Spend per merchant, largest first; `top` keeps the first N.
+        """
+        where, params = self._where(bank, card_id, start, end)
+        limit = f" LIMIT {int(top)}" if top else ""
+        return self._query(
+            "SELECT merchant, SUM(debit_paise) / 100.0 AS spend, SUM(credit_paise) / 100.0 AS credits, "
+            f"SUM(txns) AS txns FROM merchant_months{where} GROUP BY merchant "
+            f"ORDER BY SUM(debit_paise) DESC, merchant{limit}", params)
+
+    def top_merchants(self, top=10, **filters):
+        return self.spend_by_merchant(top=top, **filters)
+
+    def spend_by_category(self, bank=None, card_id=None, start=None, end=None):
+        """
+        Spend per category, largest first.
+        """
+        where, params = self._where(bank, card_id, start, end)
+        return self._query(
+            "SELECT category, SUM(debit_paise) / 100.0 AS spend, SUM(credit_paise) / 100.0 AS credits, "
+            f"SUM(txns) AS txns FROM merchant_months{where} GROUP BY category "
+            "ORDER BY SUM(debit_paise) DESC, category", params)
+
+    def range_totals(self, start, end, bank=None, card_id=None):
+        """
+        Spend, credits and count between two ISO dates (inclusive), from the
+        daily rollup.
+        """
+        where, params = self._where(bank, card_id, start, end, column="date")
+        row = self.db.execute(
+            "SELECT COALESCE(SUM(debit_paise), 0) / 100.0 AS spend, COALESCE(SUM(credit_paise), 0) / 100.0 AS credits, "
+            f"COALESCE(SUM(txns), 0) AS txns FROM days{where}", params).fetchone()
+        return dict(row)
+
+    def transactions(self, start=None, end=None, bank=None, card_id=None, limit=None):
+        """
+        Raw transactions between two ISO dates (inclusive), in date order.
+        """
+        where, params = self._where(bank, card_id, start, end, column="date")
+        limit = f" LIMIT {int(limit)}" if limit else ""
+        return self._query(
+            "SELECT date, bank, card_id, description, merchant, category, amount_paise / 100.0 AS amount "
+            f"FROM transactions{where} ORDER BY date, statement, row{limit}", params)
+
+    def banks(self):
+        return [row[0] for row in self.db.execute("SELECT DISTINCT bank FROM statements ORDER BY bank")]
+
+    def cards(self, bank=None):
+        where, params = self._where(bank)
+        return [row[0] for row in self.db.execute(f"SELECT DISTINCT card_id FROM statements{where} ORDER BY card_id", params)]
+
+    def months(self):
+        return [row[0] for row in self.db.execute("SELECT DISTINCT month FROM merchant_months ORDER BY month")]
+
+    def summary(self):
+        row = self.db.execute(
+            "SELECT COUNT(*) AS statements, COALESCE(SUM(rows), 0) AS txns, "
+            "COUNT(DISTINCT bank || '/' || card_id) AS cards FROM statements").fetchone()
+        months = self.db.execute("SELECT MIN(month), MAX(month) FROM merchant_months").fetchone()
+        return dict(row, first_month=months[0], last_month=months[1])
+
+
+def add_pdfs(index, paths, card_id=None, log=None):
+    """
+    Parses statements and adds them; the file's content hash is the key, so
+    statements that are already indexed are not parsed again.
+    """
+    from parsers.core import parse_pdf
+    from parsers.ingest import file_hash
+
+    log = log or (lambda message: print(message, file=sys.stderr))
+    added = 0
+    for path in paths:
+        key = file_hash(path)
+        if index.has(key):
+            log(f"indexed         {path}")
+            continue
+        bank, df = parse_pdf(path)
+        if bank is None:
+            log(f"unknown_bank    {path}")
+            continue
+        rows = index.add_statement(bank, df, card_id, key=key, source=path)
+        added += rows
+        log(f"added {rows:>6}    {path}")
+    return added
+
+def add_manifest(index, manifest_path, log=None):
+    """
+    Adds every ok statement from an ingest manifest (parsers/ingest.py)
+    that is not indexed yet, keyed by its content hash. Entries from another
+    PARSER_VERSION are left for the next ingest run to parse again.
+    """
+    from parsers import PARSER_VERSION
+    from parsers.ingest import Manifest
+
+    log = log or (lambda message: print(message, file=sys.stderr))
+    manifest = Manifest(manifest_path)
+    added = 0
+    try:
+        for path in manifest.paths():
+            entry = manifest.get(path)
+            if entry["status"] != "ok" or entry["parser_version"] != PARSER_VERSION or index.has(entry["sha256"]):
+                continue
+            rows = index.add_statement(entry["bank"], manifest.transactions(path), key=entry["sha256"], source=path)
+            added += rows
+            log(f"added {rows:>6}    {path}")
+    finally:
+        manifest.close()
+    return added
+
+def _print_rows(rows):
+    if not rows:
+        print("(no rows)")
+        return
+    columns = list(rows[0])
+    widths = [max(len(str(column)), *(len(_cell(row[column])) for row in rows)) for column in columns]
+    print("  ".join(str(column).ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  ".join(_cell(row[column]).rjust(width) if isinstance(row[column], (int, float))
+                        else _cell(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+def _cell(value):
+    return f"{value:,.2f}" if isinstance(value, float) else str(value)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index parsed statements and query spending across them.")
+    parser.add_argument("command", choices=["add", "months", "merchants", "categories", "range", "summary"])
+    parser.add_argument("args", nargs="*", help="add: PDF files; range: START END (YYYY-MM-DD)")
+    parser.add_argument("-i", "--index", default=DEFAULT_INDEX_PATH, help="SQLite index path (default: %(default)s)")
+    parser.add_argument("--manifest", default=None, help="add: take statements from this ingest manifest")
+    parser.add_argument("--card", default=None, help="add: card id for these statements; queries: filter")
+    parser.add_argument("--bank", default=None, help="Filter queries to one bank")
+    parser.add_argument("--from", dest="start", default=None, help="First month (YYYY-MM)")
+    parser.add_argument("--to", dest="end", default=None, help="Last month (YYYY-MM)")
+    parser.add_argument("--top", type=int, default=10, help="merchants: how many")
+    args = parser.parse_args(argv)
+
+    index = SpendingIndex(args.index)
+    try:
+        if args.command == "add":
+            if args.manifest:
+                added = add_manifest(index, args.manifest)
+            else:
+                added = add_pdfs(index, args.args, args.card)
+            print(f"Added {added} transactions; index: {index.summary()}", file=sys.stderr)
+            return 0
+
+        start = time.perf_counter()
+        filters = {"bank": args.bank, "card_id": args.card}
+        if args.command == "months":
+            rows = index.spend_by_month(start=args.start, end=args.end, **filters)
+        elif args.command == "merchants":
+            rows = index.spend_by_merchant(start=args.start, end=args.end, top=args.top, **filters)
+        elif args.command == "categories":
+            rows = index.spend_by_category(start=args.start, end=args.end, **filters)
+        elif args.command == "range":
+            if len(args.args) != 2:
+                parser.error("range needs START and END dates")
+            rows = [index.range_totals(*args.args, **filters)]
+        else:
+            rows = [index.summary()]
+        elapsed = time.perf_counter() - start
+        _print_rows(rows)
+        print(f"({elapsed * 1000:.1f} ms)", file=sys.stderr)
+    finally:
+        index.close()
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
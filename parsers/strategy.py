@@ -0,0 +1,312 @@
+"""
+Cost-aware extraction strategy selection.
+
+Usage:
+    PDF_PARSER_LEARN_STRATEGIES=1 python -m parsers.batch statements/ -o out.csv
+    python -m parsers.strategy              # winners, pages and fallbacks per bank template
+    python -m parsers.strategy --reset
+
+A bank can be parsed more than one way (SPECS in parsers/engine.py lists
+its strategies in order of preference): regex over extract_text() lines
+costs a fraction of extract_tables(), but the table banks keep their tables
+first. Each page is parsed with the first strategy and the batch is
+validated:
+
+    coverage    every candidate row (a text line or table row that starts
+                with a date and ends in an amount, minus excluded ones)
+                matched (MIN_COVERAGE)
+    dates       rows with a plausible DD/MM/YYYY date >= MIN_PARSE_RATE
+    amounts     rows whose amount parsed >= MIN_PARSE_RATE
+    no_rows     no rows at all, although the page has dated lines
+
+A page that fails is parsed again with the next strategy.
+
+By default strategies are tried in the spec's order and nothing is
+written to disk, so a page's rows depend only on the PDF and the parser
+version. With PDF_PARSER_LEARN_STRATEGIES=1, each bank template (the bank,
+plus a hash of its learned template, if any; see parsers/templates.py)
+keeps statistics in a JSON file, `~/.cache/pdf-parser/strategies.json` by
+default (or PDF_PARSER_STRATEGIES): the last winner, pages won and seconds
+spent per strategy, and fallbacks per reason. Once every strategy has been
+tried on MIN_ATTEMPTS pages, they are tried in order of expected seconds
+per validated page (seconds per attempt over the share of attempts that
+validated), so a bank whose preferred strategy keeps failing validation
+goes straight to the one that keeps winning. The statistics are saved once
+per statement, under a file lock. Fallbacks are also counted in the
+profiling trace as `strategy_fallbacks` and `fallback_<reason>`.
+"""
+import argparse
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+from parsers.profiling import count
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STRATEGY_PATH = os.environ.get(
+    "PDF_PARSER_STRATEGIES",
+    os.path.join(os.path.expanduser("~"), ".cache", "pdf-parser", "strategies.json"),
+)
+LEARN = os.environ.get("PDF_PARSER_LEARN_STRATEGIES", "0") == "1"
+
+# Share of the candidate rows that must match: all of them, so a strategy
+# never wins by silently dropping a transaction line. Dated lines without
+# an amount at the end (due dates, statement periods) aren't candidates.
+MIN_COVERAGE = 1.0
+MIN_PARSE_RATE = 0.95
+# Pages each strategy must have been tried on before the order adapts
+MIN_ATTEMPTS = 20
+
+
+def plausible_date(date):
+    """
+    Cheap check that a DD/MM/YYYY string is a real day and month.
+    """
+    return date[2:3] == "/" and 1 <= int(date[:2]) <= 31 and 1 <= int(date[3:5]) <= 12
+
+def validate(raw, cleaned, dated, candidates, has_dated_lines):
+    """
+    Sanity checks for one page's batch. `raw` are the matched rows (amounts
+    still strings) and `cleaned` what normalization kept (zero amounts
+    dropped, unparseable rows flagged Invalid). `dated` is how
+    many text lines or table rows the strategy saw starting with a date, and
+    `candidates` how many of those aren't excluded. `has_dated_lines()`
+    says whether the page itself has lines starting with a date (only asked
+    when the strategy saw none). Returns None if the batch is fine, else the
+    failed check's name.
+    """
+    if len(raw) < MIN_COVERAGE * candidates:
+        return "coverage"
+    if not raw:
+        return "no_rows" if not dated and has_dated_lines() else None
+    if sum(1 for txn in raw if plausible_date(txn["Date"])) < MIN_PARSE_RATE * len(raw):
+        return "dates"
+    if sum(1 for txn in cleaned if not txn["Invalid"]) < MIN_PARSE_RATE * len(raw):
+        return "amounts"
+    return None
+
+def template_key(bank, template):
+    """
+    The key strategy statistics are kept under: the bank, plus a short hash of
+    its template when it has one.
+    """
+    if not template:
+        return bank
+    digest = hashlib.sha1(json.dumps(template, sort_keys=True).encode()).hexdigest()
+    return f"{bank}:{digest[:8]}"
+
+
+@contextmanager
+def _locked(path):
+    """
+    Holds an exclusive lock on `path`.lock, so only one process at a time
+    reads, updates and replaces the file.
+    """
+    with open(path + ".lock", "a+") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class StrategyStore:
+    """
+    Last winners and counters by template key, stored as one JSON
+    file. Counts are kept as deltas and added to the file's current values
+    on save, under a lock, so processes sharing the file don't overwrite
+    each other's.
+    """
+    def __init__(self, path=DEFAULT_STRATEGY_PATH):
+        self.path = path
+        self.entries = self._load()
+        self.deltas = {}
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _bump(self, entries, key, group, name, n=1):
+        entry = entries.setdefault(key, {})
+        counts = entry.setdefault(group, {})
+        counts[name] = counts.get(name, 0) + n
+
+    def record(self, key, winner, fallbacks, seconds):
+        """
+        One page: the strategy that produced it, the (strategy, reason)
+        of each attempt that failed before it and the seconds spent per
+        strategy tried.
+        """
+        for entries in (self.entries, self.deltas):
+            entries.setdefault(key, {})["winner"] = winner
+            self._bump(entries, key, "pages", winner)
+            for name, reason in fallbacks:
+                self._bump(entries, key, "fallbacks", f"{name}:{reason}")
+            for name, spent in seconds.items():
+                self._bump(entries, key, "seconds", name, spent)
+
+    def stats(self, key):
+        """
+        {strategy: (attempts, pages won, seconds)} for a template key.
+        """
+        entry = self.entries.get(key, {})
+        stats = {}
+        for name, n in entry.get("pages", {}).items():
+            attempts, won, seconds = stats.get(name, (0, 0, 0.0))
+            stats[name] = (attempts + n, won + n, seconds)
+        for fallback, n in entry.get("fallbacks", {}).items():
+            name = fallback.split(":", 1)[0]
+            attempts, won, seconds = stats.get(name, (0, 0, 0.0))
+            stats[name] = (attempts + n, won, seconds)
+        for name, spent in entry.get("seconds", {}).items():
+            attempts, won, seconds = stats.get(name, (0, 0, 0.0))
+            stats[name] = (attempts, won, seconds + spent)
+        return stats
+
+    def save(self):
+        """
+        Adds this process's counts to the file and writes it atomically.
+        The statistics are best-effort: if the file can't be written (e.g. a
+        read-only home directory) this is logged and counted as
+        `strategy_save_errors`, and the counts are kept for the next save.
+        """
+        if not self.deltas:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp = None
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with _locked(self.path):
+                entries = self._load()
+                for key, delta in self.deltas.items():
+                    entry = entries.setdefault(key, {})
+                    entry["winner"] = delta["winner"]
+                    for group in ("pages", "fallbacks", "seconds"):
+                        for name, n in delta.get(group, {}).items():
+                            self._bump(entries, key, group, name, n)
+                fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+                with os.fdopen(fd, "w", encoding="utf-8") as f:
+                    json.dump(entries, f, indent=2, sort_keys=True)
+                os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Could not save strategy statistics to %s: %s", self.path, e)
+            count("strategy_save_errors")
+            if tmp is not None and os.path.exists(tmp):
+                os.remove(tmp)
+            return
+        self.entries = entries
+        self.deltas = {}
+
+
+_store = None
+
+def store():
+    """
+    The process-wide store, loaded from DEFAULT_STRATEGY_PATH on first use,
+    or None unless PDF_PARSER_LEARN_STRATEGIES=1 (or use_store) turned
+    learning on.
+    """
+    global _store
+    if _store is None and LEARN:
+        _store = StrategyStore()
+    return _store
+
+def use_store(strategies):
+    """
+    Replaces the process-wide store (e.g. with one at another path), or
+    turns learning off with None.
+    """
+    global _store
+    _store = strategies
+
+
+class Chooser:
+    """
+    Strategy order and bookkeeping for one statement of one bank. Without
+    a store (learning off) the order is always the spec's.
+    """
+    def __init__(self, bank, names, template=None, strategies=None):
+        self.names = list(names)
+        self.store = strategies if strategies is not None else store()
+        self.key = template_key(bank, template)
+        if self.store is not None:
+            self.names = self._ranked()
+
+    def _ranked(self):
+        """
+        The strategies by expected seconds per validated page, once each has
+        MIN_ATTEMPTS attempts (with one that never validated last), else in
+        the spec's order. Ties keep the spec's order.
+        """
+        stats = self.store.stats(self.key)
+        if any(stats.get(name, (0, 0, 0.0))[0] < MIN_ATTEMPTS for name in self.names):
+            return self.names
+
+        def expected(name):
+            attempts, won, seconds = stats[name]
+            return seconds / won if won else float("inf")
+        return sorted(self.names, key=expected)
+
+    def order(self):
+        """
+        The strategies to try, in order; fixed for the whole statement.
+        """
+        return self.names
+
+    def record(self, winner, fallbacks, seconds=None):
+        count(f"strategy_{winner}")
+        for _, reason in fallbacks:
+            count("strategy_fallbacks")
+            count(f"fallback_{reason}")
+        if self.store is not None:
+            self.store.record(self.key, winner, fallbacks, seconds or {})
+
+    def finish(self):
+        if self.store is not None:
+            self.store.save()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Show or reset the extraction strategy statistics.")
+    parser.add_argument("--path", default=DEFAULT_STRATEGY_PATH, help="Strategy store (default: %(default)s)")
+    parser.add_argument("--reset", action="store_true", help="Forget all winners and counts")
+    args = parser.parse_args(argv)
+
+    if args.reset:
+        if os.path.exists(args.path):
+            os.remove(args.path)
+        return 0
+    entries = StrategyStore(args.path).entries
+    if not entries:
+        print("(no statements parsed yet)")
+    for key, entry in sorted(entries.items()):
+        pages = ", ".join(f"{name} {n}" for name, n in sorted(entry.get("pages", {}).items()))
+        print(f"{key:<24} winner {entry.get('winner')}    pages: {pages}")
+        for name, n in sorted(entry.get("fallbacks", {}).items()):
+            print(f"    fell back from {name}: {n}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,357 @@
+"""
+Per-bank template regions.
+
+Each bank prints its transactions in the same band of the page on every
+statement, so the parsers don't need to lay out the whole page. A template
+records, for one bank id in PARSER_MAP:
+
+    page_size   [width, height] of the sample statement's pages
+    bbox        transaction region [x0, top, x1, bottom], as fractions of the page
+    columns     column x-boundaries as fractions of the page width
+                (table banks only; the text banks only crop vertically)
+    rows        how table rows are found inside the region ("lines" or "text")
+
+Templates are learned from a sample statement (`learn_template`, or
+`python -m parsers.templates learn statement.pdf`) and kept in a JSON file.
+With a template, `transaction_region` hands the parser the page filtered
+to the region (a `page.filter(...)` keeping only the objects fully inside
+it, not a `page.crop(...)`), and table banks use the stored column
+boundaries as explicit vertical lines instead of running column detection.
+
+Before using a template on a page, every line that starts with a
+DD/MM/YYYY date (i.e. every candidate transaction row) must fall inside
+the region, and for table banks its date must sit in the first column.
+Otherwise the layout has drifted and the full page is parsed as before, so
+a stale template costs speed but never rows.
+"""
+import bisect
+import json
+import os
+import re
+import tempfile
+
+from parsers.document import MemoPage
+from parsers.profiling import count, stage
+
+DEFAULT_TEMPLATE_PATH = os.environ.get(
+    "PDF_PARSER_TEMPLATES",
+    os.path.join(os.path.expanduser("~"), ".cache", "pdf-parser", "templates.json"),
+)
+ENABLED = os.environ.get("PDF_PARSER_USE_TEMPLATES", "1") != "0"
+
+# Banks whose parser reads tables, with the settings used on the full page.
+# The other banks parse the page text line by line.
+TABLE_SETTINGS = {
+    "HDFC": None,
+    "ICICI_AMAZON": {
+        "vertical_strategy": "text",
+        "horizontal_strategy": "text",
+    },
+}
+
+# Points added around the learned region, and allowed page-size difference
+MARGIN = 2.0
+SIZE_TOLERANCE = 0.01
+
+DATE_TOKEN = re.compile(r"^\d{2}/\d{2}/\d{4}")
+
+
+def dated_lines(page, chars=None):
+    """
+    Bounding boxes (x0, top, x1, bottom, date_x0) of the page's text lines
+    that start with a DD/MM/YYYY date, built from the char objects only, or
+    from the (text, x0, x1, top, bottom, ...) tuples `chars(page)` returns
+    (parsers/fastpath.py).
+    """
+    if chars is None:
+        glyphs = ((c["text"], c["x0"], c["x1"], c["top"], c["bottom"]) for c in page.chars)
+    else:
+        glyphs = chars(page)
+    lines = {}
+    for glyph in glyphs:
+        if not glyph[0].isspace():
+            lines.setdefault(round(glyph[3]), []).append(glyph)
+
+    boxes = []
+    for line in lines.values():
+        line.sort(key=lambda g: g[1])
+        if DATE_TOKEN.match("".join(g[0] for g in line[:10])):
+            boxes.append((
+                line[0][1],
+                min(g[3] for g in line),
+                max(g[2] for g in line),
+                max(g[4] for g in line),
+                line[0][1],
+            ))
+    return boxes
+
+def _union(boxes):
+    return [
+        min(b[0] for b in boxes),
+        min(b[1] for b in boxes),
+        max(b[2] for b in boxes),
+        max(b[3] for b in boxes),
+    ]
+
+def learn_template(pdf, bank, source=None):
+    """
+    Learns the transaction region (and, for table banks, the column
+    boundaries) from a statement whose bank is known. Returns the template
+    dict, or None when no transaction rows were found.
+    """
+    pages = [page for page in pdf.pages if dated_lines(page)]
+    if not pages:
+        return None
+    width, height = float(pages[0].width), float(pages[0].height)
+
+    columns = None
+    if bank in TABLE_SETTINGS:
+        settings = TABLE_SETTINGS[bank]
+        tables, edges = [], set()
+        for page in pages:
+            for table in page.find_tables(settings):
+                # Keep only tables that hold transaction rows
+                if any(cell and DATE_TOKEN.match(str(cell).strip()) for row in table.extract() for cell in row[:1]):
+                    tables.append(table.bbox)
+                    edges.update(round(x, 1) for cell in table.cells for x in (cell[0], cell[2]))
+        if not tables:
+            return None
+        bbox = _union(tables)
+        columns = [x / width for x in sorted(edges)]
+        rows = (settings or {}).get("horizontal_strategy", "lines")
+    else:
+        # Text parsers: crop vertically only, so long descriptions can't be cut
+        boxes = [box for page in pages for box in dated_lines(page)]
+        bbox = [0.0, min(b[1] for b in boxes), width, max(b[3] for b in boxes)]
+        rows = None
+
+    x0, top, x1, bottom = bbox
+    return {
+        "bank": bank,
+        "page_size": [width, height],
+        "bbox": [
+            max(0.0, x0 - MARGIN) / width,
+            max(0.0, top - MARGIN) / height,
+            min(width, x1 + MARGIN) / width,
+            min(height, bottom + MARGIN) / height,
+        ],
+        "columns": columns,
+        "rows": rows,
+        "source": source,
+    }
+
+
+class TemplateRegistry:
+    """
+    Templates by bank id, stored as one JSON file.
+    """
+    def __init__(self, path=DEFAULT_TEMPLATE_PATH):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.templates = json.load(f)
+        except (OSError, ValueError):
+            self.templates = {}
+
+    def get(self, bank):
+        return self.templates.get(bank)
+
+    def put(self, bank, template):
+        self.templates[bank] = template
+
+    def save(self):
+        """
+        Writes the registry atomically (temp file, then rename).
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(self.templates, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+_registry = None
+
+def registry():
+    """
+    The process-wide registry, loaded from DEFAULT_TEMPLATE_PATH on first use.
+    """
+    global _registry
+    if _registry is None:
+        _registry = TemplateRegistry()
+    return _registry
+
+def use_registry(templates):
+    """
+    Replaces the process-wide registry (e.g. with one loaded from another path).
+    """
+    global _registry
+    _registry = templates
+
+
+def region_bbox(page, template):
+    """
+    The template's region in page coordinates, or None if the page size
+    doesn't match the sample's.
+    """
+    width, height = float(page.width), float(page.height)
+    sample_width, sample_height = template["page_size"]
+    if abs(width - sample_width) > SIZE_TOLERANCE * sample_width or abs(height - sample_height) > SIZE_TOLERANCE * sample_height:
+        return None
+    x0, top, x1, bottom = template["bbox"]
+    return (x0 * width, top * height, x1 * width, bottom * height)
+
+def fits(lines, template, bbox, width):
+    """
+    Drift check: every dated line lies inside bbox and, for table banks,
+    starts in the first column.
+    """
+    first_column = None
+    if template["columns"]:
+        first_column = (template["columns"][0] * width - MARGIN, template["columns"][1] * width)
+    for x0, top, x1, bottom, date_x0 in lines:
+        if x0 < bbox[0] or top < bbox[1] or x1 > bbox[2] or bottom > bbox[3]:
+            return False
+        if first_column and not first_column[0] <= date_x0 < first_column[1]:
+            return False
+    return True
+
+def _within(bbox):
+    x0, top, x1, bottom = bbox
+    return lambda obj: obj["x0"] >= x0 and obj["x1"] <= x1 and obj["top"] >= top and obj["bottom"] <= bottom
+
+def _fitted(page, bank, chars=None):
+    """
+    (template, bbox, dated line count) when the bank has a template that
+    fits the page, else None. `chars` is passed on to dated_lines.
+    """
+    template = registry().get(bank) if ENABLED else None
+    if template is None:
+        return None
+
+    with stage("template"):
+        bbox = region_bbox(page, template)
+        lines = dated_lines(page, chars) if bbox is not None else None
+        if bbox is None or not fits(lines, template, bbox, float(page.width)):
+            count("template_drift")
+            return None
+    count("template_pages")
+    return template, bbox, len(lines)
+
+def _region(page, bbox):
+    """
+    The page filtered to bbox; unlike page.crop it doesn't clip every
+    object, which costs more than the layout work it would save.
+    """
+    return MemoPage(page.filter(_within(bbox)))
+
+def transaction_region(page, bank):
+    """
+    The part of the page the text parsers should read: the template region
+    when the bank's template fits, otherwise the whole page.
+    """
+    fitted = _fitted(page, bank)
+    return _region(page, fitted[1]) if fitted else page
+
+def transaction_bbox(page, bank, chars=None):
+    """
+    transaction_region's bbox, or None for the whole page, for readers that
+    filter chars themselves (parsers/fastpath.py).
+    """
+    fitted = _fitted(page, bank, chars)
+    return fitted[1] if fitted else None
+
+def _cell_text(words):
+    """
+    Words in one cell, joined like pdfplumber joins a table cell's text.
+    """
+    lines = {}
+    for word in words:
+        lines.setdefault(round(word["top"]), []).append(word)
+    return "\n".join(" ".join(w["text"] for w in sorted(line, key=lambda w: w["x0"])) for _, line in sorted(lines.items()))
+
+def column_rows(region, template, width):
+    """
+    Splits the region into a table using the template's column boundaries
+    and either the region's horizontal rules ("lines") or its text lines
+    ("text") as row boundaries, without running table detection.
+    """
+    from pdfplumber.utils import cluster_objects
+
+    columns = [x * width for x in template["columns"]]
+    words = region.extract_words()
+
+    if template["rows"] == "lines":
+        rules = sorted({round(edge["top"], 1) for edge in region.horizontal_edges})
+        bands = [[] for _ in rules]
+        for word in words:
+            index = bisect.bisect_right(rules, (word["top"] + word["bottom"]) / 2) - 1
+            if 0 <= index < len(rules) - 1:
+                bands[index].append(word)
+        rows = [band for band in bands if band]
+    else:
+        rows = cluster_objects(words, "top", 3)
+
+    table = []
+    for row_words in rows:
+        cells = [[] for _ in columns[1:]]
+        for word in row_words:
+            index = bisect.bisect_right(columns, (word["x0"] + word["x1"]) / 2) - 1
+            if 0 <= index < len(cells):
+                cells[index].append(word)
+        table.append([_cell_text(cell) for cell in cells])
+    return table
+
+def transaction_tables(page, bank, table_settings=None):
+    """
+    Tables for the table parsers. With a fitting template this is one table
+    cut along the learned columns; if it doesn't hold a row for every dated
+    line on the page, or there is no template, the page's own
+    extract_tables(table_settings) is used instead.
+    """
+    fitted = _fitted(page, bank)
+    # A text bank's template has no columns to cut along
+    if fitted and fitted[0]["columns"]:
+        template, bbox, expected = fitted
+        with stage("extract_columns"):
+            table = column_rows(_region(page, bbox), template, float(page.width))
+        dated = sum(1 for row in table if row and DATE_TOKEN.match(row[0].strip()))
+        if dated == expected:
+            return [table]
+        count("template_drift")
+    return page.extract_tables(table_settings)
+
+
+def main(argv=None):
+    """
+    python -m parsers.templates learn statement.pdf [...]
+    python -m parsers.templates show
+    """
+    import argparse
+
+    from parsers.core import detect_bank, open_pdf
+
+    parser = argparse.ArgumentParser(description="Learn or show per-bank template regions.")
+    parser.add_argument("command", choices=["learn", "show"])
+    parser.add_argument("paths", nargs="*", help="Sample statements to learn from")
+    parser.add_argument("--templates", default=DEFAULT_TEMPLATE_PATH, help="Template file")
+    args = parser.parse_args(argv)
+
+    templates = TemplateRegistry(args.templates)
+    if args.command == "learn":
+        for path in args.paths:
+            with open_pdf(path) as pdf:
+                bank = detect_bank(pdf)
+                template = learn_template(pdf, bank, source=os.path.basename(path)) if bank else None
+            if template is None:
+                print(f"{path}: no template learned (bank: {bank})")
+                continue
+            templates.put(bank, template)
+            print(f"{path}: learned {bank} template")
+        templates.save()
+    print(json.dumps(templates.templates, indent=2, sort_keys=True))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,27 @@
+import os
+
+import pandas as pd
+
+from parsers.cache import ResultCache, make_key
+
+
+def test_evict_leaves_other_files_alone(tmp_path):
+    # The templates and strategy statistics share ~/.cache/pdf-parser when
+    # the cache is pointed at it
+    others = {"templates.json": "{}" * 4000, "strategies.json": "{}" * 4000, "notes.parquet": "x" * 4000}
+    for name, text in others.items():
+        (tmp_path / name).write_text(text)
+
+    cache = ResultCache(str(tmp_path), max_bytes=10_000)
+    df = pd.DataFrame({"Description": ["SWIGGY " * 50] * 200, "Amount": range(200)})
+    keys = [make_key(str(i).encode()) for i in range(5)]
+    for key in keys:
+        cache.put(key, "HDFC", df)
+
+    for name, text in others.items():
+        assert (tmp_path / name).read_text() == text
+    # Entries were still evicted down to the cap, newest kept
+    assert cache.get(keys[-1]) is not None
+    assert cache.get(keys[0]) is None
+    entries = [name for name in os.listdir(tmp_path) if name not in others]
+    assert sum(os.path.getsize(tmp_path / name) for name in entries) <= 10_000
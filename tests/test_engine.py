@@ -0,0 +1,45 @@
+import random
+import re
+
+import pytest
+
+from benchmarks.line_cost import legacy_axis, legacy_icici_coral, legacy_idfc
+from parsers.engine import COMPILED, match_lines
+
+# Tokens the statement lines are made of, plus the ones that make the
+# patterns backtrack: extra spaces and tabs, stray digits, Cr/Dr and CR
+TOKENS = [" ", "  ", "\t", "FOO", "Ba", "x", "7", "12", "3,4.5", "1,234.00", ".", ",", "-", "/",
+          " CR", "CR", " Cr", " Dr", "Cr", "Dr", "INTERNET PAYMENT", "INTERNET PAYMENT ", " IGST",
+          " Transaction Details", "12/03/2024"]
+
+
+def random_lines(seed, count=100_000):
+    rng = random.Random(seed)
+    return [rng.choice(["12/03/2024", "12/03/2024 ", "12/03/2024  ", ""])
+            + "".join(rng.choice(TOKENS) for _ in range(rng.randint(0, 9)))
+            for _ in range(count)]
+
+
+@pytest.mark.parametrize("bank, legacy", [
+    ("ICICI_CORAL", legacy_icici_coral),
+    ("AXIS", legacy_axis),
+    ("IDFC", legacy_idfc),
+])
+def test_text_patterns_match_the_old_regexes(bank, legacy):
+    lines = random_lines(bank)
+    expected = legacy(lines)
+    actual = match_lines(COMPILED[bank]["text"], lines)
+    assert expected
+    assert expected == [{field: txn[field] for field in ("Date", "Description", "Amount")} for txn in actual]
+
+
+def test_amazon_text_pattern_matches_the_old_regex():
+    old = re.compile(r'(\d{2}/\d{2}/\d{4})\s+\S+\s+(.+?)\s+-?\d+\s+([\d,\.]+\s*CR|[\d,\.]+)$').match
+    new = COMPILED["ICICI_AMAZON"]["text"]["matcher"].match
+
+    def groups(m):
+        return None if m is None else (m.group(1), m.group(2).strip(), m.group(3))
+
+    lines = random_lines("ICICI_AMAZON")
+    assert any(old(line) for line in lines)
+    assert [groups(old(line)) for line in lines] == [groups(new(line)) for line in lines]
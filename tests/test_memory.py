@@ -0,0 +1,39 @@
+import pandas as pd
+import pytest
+
+from benchmarks.memory import measure
+from benchmarks.synth import generate
+from parsers.memory import MemoryBudgetExceeded
+
+
+# Allowed low-memory peak growth from 5 to 80 pages; without low-memory
+# mode the 80-page statement peaks about 17% higher
+PEAK_GROWTH = 0.1
+
+
+def statement(tmp_path, pages, bank="IDFC"):
+    path = str(tmp_path / f"{bank.lower()}_{pages}p.pdf")
+    return path, generate(bank, path, pages=pages)
+
+
+@pytest.mark.parametrize("bank", ["IDFC", "HDFC"])
+def test_low_memory_parses_the_same_frame(tmp_path, bank):
+    path, _ = statement(tmp_path, 20, bank)
+    default_df, _ = measure(path, False)
+    low_df, _ = measure(path, True)
+    assert len(low_df)
+    pd.testing.assert_frame_equal(default_df, low_df)
+
+def test_low_memory_peak_stays_within_budget(tmp_path):
+    # The budget is the small statement's peak plus PEAK_GROWTH; the parser
+    # itself raises if the long one goes over it
+    _, small_mb = measure(statement(tmp_path, 5)[0], True)
+    budget_mb = small_mb * (1 + PEAK_GROWTH)
+    path, txns = statement(tmp_path, 80)
+    df, large_mb = measure(path, True, budget_mb)
+    assert len(df) == txns
+    assert large_mb <= budget_mb
+
+def test_budget_exceeded_fails_the_statement(tmp_path):
+    with pytest.raises(MemoryBudgetExceeded):
+        measure(statement(tmp_path, 5)[0], True, 10)
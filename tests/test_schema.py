@@ -0,0 +1,52 @@
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+from benchmarks.synth import generate
+from parsers.core import PARSER_MAP, STREAM_MAP, open_pdf
+from parsers.schema import COLUMNAR_MAP, baseline_frame, memory_comparison, to_columnar
+from parsers.sinks import TRANSACTION_COLUMNS, open_sink, write_batches
+
+
+@pytest.mark.parametrize("bank", ["AXIS", "HDFC"])
+def test_parsers_produce_the_compact_frame(tmp_path, bank):
+    path = str(tmp_path / f"{bank.lower()}.pdf")
+    generate(bank, path, pages=3)
+    with open_pdf(path) as pdf:
+        df = PARSER_MAP[bank](pdf)
+    with open_pdf(path) as pdf:
+        compact = COLUMNAR_MAP[bank](pdf, card_id="4321")
+    assert len(compact)
+    assert isinstance(compact["description"].dtype, pd.CategoricalDtype)
+    pd.testing.assert_frame_equal(compact, to_columnar(df, bank, "4321"))
+
+def test_memory_comparison_is_against_the_object_frame(tmp_path):
+    path = str(tmp_path / "idfc.pdf")
+    generate("IDFC", path, pages=3)
+    with open_pdf(path) as pdf:
+        compact = COLUMNAR_MAP["IDFC"](pdf)
+    with open_pdf(path) as pdf:
+        df = PARSER_MAP["IDFC"](pdf)
+
+    baseline = baseline_frame(df)
+    assert baseline["Date"].dtype == object and baseline["Description"].dtype == object
+    assert baseline["Date"][0] == df["Date"][0].strftime("%d/%m/%Y")
+    assert baseline["Amount"][0] == df["Amount"][0] / 100
+    report = memory_comparison(df, compact)
+    assert report["baseline_bytes"] == baseline.memory_usage(deep=True).sum()
+    assert report["baseline_bytes"] > report["parsed_bytes"] > report["compact_bytes"]
+
+def test_parquet_sink_writes_the_compact_types(tmp_path):
+    path = str(tmp_path / "hdfc.pdf")
+    generate("HDFC", path, pages=2)
+    output = str(tmp_path / "out.parquet")
+    sink = open_sink(output, TRANSACTION_COLUMNS)
+    with open_pdf(path) as pdf:
+        write_batches(STREAM_MAP["HDFC"](pdf), sink, File=path, Bank="HDFC")
+    sink.close()
+
+    frame = pd.read_parquet(output)
+    for column in ("File", "Bank", "Description"):
+        assert isinstance(frame[column].dtype, pd.CategoricalDtype)
+    assert str(pq.read_schema(output).field("Date").type) == "date32[day]"
+    assert frame["Amount"].dtype == "int64"